@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+hourBucket 속성이 없는 과거 클릭 로그 보정 스크립트 (병렬 세그먼트 Scan)
+보정이 끝나면 trend의 TREND_FETCH_MODE=query 조회에 과거 로그도 포함됩니다.
+
+사용법:
+  python3 scripts/backfill_hour_bucket.py --table <SurlClickLogsTable 이름> --segments 16 [--shards 1] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_SRC = os.path.join(_PROJECT_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+import boto3
+
+from common.buckets import hour_bucket
+from common.parallel_scan import parallel_scan
+from common.write_behind import batch_put
+
+
+def main():
+    parser = argparse.ArgumentParser(description="클릭 로그 hourBucket 보정")
+    parser.add_argument("--table", required=True, help="클릭 로그 테이블 이름")
+    parser.add_argument("--segments", type=int, default=16, help="병렬 Scan 세그먼트 수")
+    parser.add_argument("--shards", type=int, default=1, help="CLICK_BUCKET_SHARDS 값")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 대상 건수만 집계")
+    args = parser.parse_args()
+
+    scan_kwargs = {"FilterExpression": "attribute_not_exists(hourBucket)"}
+
+    def make_table():
+        return boto3.session.Session().resource("dynamodb").Table(args.table)
+
+    def backfill_segment(pages):
+        dynamo = boto3.session.Session().resource("dynamodb")
+        found, failed = 0, 0
+        for page in pages:
+            found += len(page)
+            if args.dry_run or not page:
+                continue
+            for item in page:
+                item["hourBucket"] = hour_bucket(item["timestamp"], item["shortCode"], args.shards)
+            failed += len(batch_put(dynamo, args.table, page))
+        return found, failed
+
+    results = parallel_scan(make_table, args.segments, scan_kwargs, backfill_segment)
+    found = sum(r[0] for r in results)
+    failed = sum(r[1] for r in results)
+    print(f"대상 {found}건, 실패 {failed}건{' (dry-run)' if args.dry_run else ''}")
+
+
+if __name__ == "__main__":
+    main()
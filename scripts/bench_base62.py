@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Base62 코덱 마이크로 벤치마크
+
+기존 구현(ALPHABET.index 선형 탐색 decode, 호출마다 문자표를 만드는 create의 encode)과
+공통 코덱(역조회 테이블)을 비교하고, encode_many/decode_many의 Python/NumPy 경로를 측정합니다.
+
+사용법:
+  python3 scripts/bench_base62.py --count 1000000
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_SRC = os.path.join(_PROJECT_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from common import base62  # noqa: E402
+
+
+def _legacy_encode(num):
+    """기존 create/app.py encode (호출마다 문자표 생성)"""
+    chars = string.digits + string.ascii_letters
+    if num == 0:
+        return chars[0]
+    arr = []
+    base = len(chars)
+    while num:
+        num, rem = divmod(num, base)
+        arr.append(chars[rem])
+    arr.reverse()
+    return ''.join(arr)
+
+
+def _legacy_decode(s):
+    """기존 common/base62.decode (문자마다 ALPHABET.index 선형 탐색)"""
+    num = 0
+    for char in s:
+        num = num * base62.BASE + base62.ALPHABET.index(char)
+    return num
+
+
+def _timed(label, fn, baseline=None):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    ratio = f"  (x{baseline / elapsed:.1f})" if baseline else ""
+    print(f"{label:<34} {elapsed:8.3f}s{ratio}")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Base62 코덱 마이크로 벤치마크")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # 카운터 ID(작은 값)와 snowflake ID(큰 값) 혼합
+    nums = [rng.randrange(1, 10 ** 7) if i % 2 else rng.randrange(2 ** 55, 2 ** 58) for i in range(args.count)]
+    print(f"count={args.count} numpy={'yes' if base62.HAS_NUMPY else 'no'}")
+
+    legacy_codes, t_enc = _timed("encode   legacy (create/app.py)", lambda: [_legacy_encode(n) for n in nums])
+    codes, _ = _timed("encode   common.base62", lambda: [base62.encode(n) for n in nums], t_enc)
+    _timed("encode_many python", lambda: base62.encode_many(nums, vectorize=False), t_enc)
+    if base62.HAS_NUMPY:
+        vec_codes, _ = _timed("encode_many numpy", lambda: base62.encode_many(nums, vectorize=True), t_enc)
+        assert vec_codes == codes
+        _timed("encode_range numpy (연속 ID)", lambda: base62.encode_range(10 ** 6, args.count), t_enc)
+    assert legacy_codes == codes
+
+    legacy_nums, t_dec = _timed("decode   legacy (ALPHABET.index)", lambda: [_legacy_decode(c) for c in codes])
+    _timed("decode   common.base62", lambda: [base62.decode(c) for c in codes], t_dec)
+    _timed("decode_many python", lambda: base62.decode_many(codes, vectorize=False), t_dec)
+    if base62.HAS_NUMPY:
+        vec_nums, _ = _timed("decode_many numpy", lambda: base62.decode_many(codes, vectorize=True), t_dec)
+        assert vec_nums == nums
+    assert legacy_nums == nums
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Create 파이프라인 단계 병렬화 벤치마크 (AWS 없이 카운터/Bedrock 지연을 sleep으로 대체)
+
+사용법:
+  python3 scripts/bench_create.py --counter-ms 30 --bedrock-ms 400 -n 20
+
+카운터와 Bedrock이 동시에 실행되면 total ≈ max(counter, bedrock) + save 이어야 합니다.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_SRC = os.path.join(_PROJECT_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+os.environ.setdefault("ID_BLOCK_SIZE", "1")
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+
+
+def _slow_storage(save_ms):
+    """매핑 저장에 save_ms 지연을 더한 메모리 저장소"""
+    from common.storage.memory import MemoryStorage
+
+    class _SlowStorage(MemoryStorage):
+        def put_mapping(self, item):
+            time.sleep(save_ms / 1000)
+            super().put_mapping(item)
+
+    return _SlowStorage()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create 단계별 지연 벤치마크")
+    parser.add_argument("-n", type=int, default=20, help="요청 수")
+    parser.add_argument("--counter-ms", type=float, default=30, help="카운터 update_item 지연(ms)")
+    parser.add_argument("--bedrock-ms", type=float, default=400, help="Bedrock invoke_model 지연(ms)")
+    parser.add_argument("--save-ms", type=float, default=10, help="매핑 put_item 지연(ms)")
+    args = parser.parse_args()
+
+    from create import app
+
+    last_id = [0]
+
+    def fake_reserve(count):
+        time.sleep(args.counter_ms / 1000)
+        last_id[0] += count
+        return last_id[0]
+
+    def fake_invoke(prompt, max_tokens):
+        time.sleep(args.bedrock_ms / 1000)
+        return '{"category": "IT", "summary": "벤치마크"}'
+
+    app.STORAGE = _slow_storage(args.save_ms)
+    app._ID_ALLOCATOR._reserve_fn = fake_reserve
+    app._invoke_model = fake_invoke
+    app._CATEGORY_CACHE.get = lambda url: (None, "miss")
+
+    samples = {}
+    for i in range(args.n):
+        event = {"body": json.dumps({"url": f"https://bench.example.com/{i}"}), "headers": {}}
+        with contextlib.redirect_stdout(io.StringIO()):
+            resp = app.handler(event, None)
+        for part in resp["headers"]["Server-Timing"].split(", "):
+            name, dur = part.split(";dur=")
+            samples.setdefault(name, []).append(float(dur))
+
+    for name, values in samples.items():
+        print(f"{name:>6}: mean {statistics.mean(values):8.2f} ms  p50 {statistics.median(values):8.2f} ms")
+    sequential = args.counter_ms + args.bedrock_ms + args.save_ms
+    overlapped = max(args.counter_ms, args.bedrock_ms) + args.save_ms
+    print(f"순차 실행 예상 {sequential:.0f} ms / 동시 실행 예상 {overlapped:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
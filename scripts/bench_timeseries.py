@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Trend 시계열/히트맵 집계 벤치마크 (순수 Python 루프 vs NumPy 벡터화)
+
+가짜 클릭 행을 만들어 같은 입력으로 두 경로의 소요 시간을 비교하고 결과 일치 여부를 확인합니다.
+NumPy가 설치되지 않은 환경에서는 Python 경로만 측정합니다.
+
+사용법:
+  python3 scripts/bench_timeseries.py --rows 1000000 --bucket 15
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_SRC = os.path.join(_PROJECT_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from common import timeseries  # noqa: E402
+
+_CATEGORIES = ["IT", "Shopping", "Food", "Finance", "뉴스", "기타"]
+
+
+def _rows(count: int, minutes: int, until: datetime) -> list:
+    """윈도우 안에 고르게 퍼진 클릭 행 (timestamp, 카테고리, 1)"""
+    step = minutes * 60 / count
+    return [
+        ((until - timedelta(seconds=i * step)).isoformat(), _CATEGORIES[i % len(_CATEGORIES)], 1)
+        for i in range(count)
+    ]
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trend 시계열/히트맵 집계 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--minutes", type=int, default=10080)
+    parser.add_argument("--bucket", type=int, default=15, help="버킷 크기(분)")
+    args = parser.parse_args()
+
+    until = datetime.now(timezone.utc)
+    rows = _rows(args.rows, args.minutes, until)
+    since_epoch = int(until.timestamp()) - args.minutes * 60
+    params = (since_epoch, int(until.timestamp()) + 1, args.bucket * 60, 9)
+
+    py_result, py_time = _timed(timeseries.analyze_python, rows, *params)
+    print(f"rows={args.rows} bucket={args.bucket}분 buckets={len(py_result['series'])}")
+    print(f"python : {py_time:8.3f}s")
+    if not timeseries.HAS_NUMPY:
+        print("numpy  : 설치되지 않음 (pip install numpy 후 다시 실행)")
+        return
+    np_result, np_time = _timed(timeseries.analyze_numpy, rows, *params)
+    same = {k: v for k, v in np_result.items() if k != "engine"} == {k: v for k, v in py_result.items() if k != "engine"}
+    print(f"numpy  : {np_time:8.3f}s  (x{py_time / np_time:.1f}, 결과 일치: {same})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Trend 집계 메모리 벤치마크 (AWS 없이 가짜 로그 테이블 사용)
+
+전체 항목을 리스트로 모은 뒤 집계하는 기존 방식과, 페이지 단위 스트리밍 집계의
+최대 메모리 사용량(tracemalloc peak)을 클릭 수별로 비교합니다.
+
+사용법:
+  python3 scripts/bench_trend_memory.py --clicks 10000 100000 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_SRC = os.path.join(_PROJECT_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+os.environ["TREND_FETCH_MODE"] = "scan"
+os.environ["TREND_SCAN_SEGMENTS"] = "1"
+
+_CATEGORIES = ["IT", "Shopping", "Food", "Finance", "기타"]
+_PAGE_SIZE = 2000  # 1MB Scan 페이지에 해당하는 대략적인 항목 수
+
+
+class _FakeDynamo:
+    def __init__(self, table):
+        self.table = table
+
+    def Table(self, name):  # noqa: N802
+        return self.table
+
+
+class _FakeLogTable:
+    """요청 시점에 페이지를 생성하는 Scan 대역 (ProjectionExpression 유무에 따라 속성 수 변경)"""
+
+    def __init__(self, clicks):
+        self.clicks = clicks
+        self.timestamp = datetime.now(timezone.utc).isoformat()
+
+    def scan(self, **params):
+        start = params.get("ExclusiveStartKey", 0)
+        end = min(start + _PAGE_SIZE, self.clicks)
+        projected = "ProjectionExpression" in params
+        items = []
+        for n in range(start, end):
+            item = {"category": _CATEGORIES[n % len(_CATEGORIES)], "timestamp": self.timestamp}
+            if not projected:
+                item.update({
+                    "shortCode": f"c{n % 5000}",
+                    "ip": f"10.0.{n % 256}.{n % 251}",
+                    "hourBucket": "2026-10-17T05#0",
+                })
+            items.append(item)
+        resp = {"Items": items}
+        if end < self.clicks:
+            resp["LastEvaluatedKey"] = end
+        return resp
+
+
+def _aggregate_by_category(items: list) -> dict:
+    """기존 방식의 카테고리별 클릭 횟수 집계 (리스트 전체 순회)"""
+    stats = {}
+    for item in items:
+        cat = item.get("category", "기타")
+        stats[cat] = stats.get(cat, 0) + 1
+    return stats
+
+
+def _materialized(table):
+    """기존 방식: 모든 항목(전체 속성)을 리스트에 모은 뒤 집계"""
+    items = []
+    params = {"FilterExpression": "#ts > :since"}
+    while True:
+        resp = table.scan(**params)
+        items.extend(resp.get("Items", []))
+        if "LastEvaluatedKey" not in resp:
+            break
+        params["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    return _aggregate_by_category(items), len(items)
+
+
+def _measure(fn):
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trend 집계 메모리 벤치마크")
+    parser.add_argument("--clicks", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    from common.storage.dynamo import DynamoStorage
+    from trend import app
+
+    print(f"{'clicks':>10} | {'materialized MB':>16} | {'streaming MB':>13}")
+    for clicks in args.clicks:
+        table = _FakeLogTable(clicks)
+        app._STORAGE = DynamoStorage(_FakeDynamo(table), "m", "c", "u", "logs", "r")
+        (old_stats, old_count), old_peak = _measure(lambda: _materialized(table))
+        with contextlib.redirect_stdout(io.StringIO()):
+            (new_stats, new_count), new_peak = _measure(lambda: app._collect_stats(60))
+        assert old_stats == new_stats and old_count == new_count == clicks
+        print(f"{clicks:>10} | {old_peak:>16.1f} | {new_peak:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
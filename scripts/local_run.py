@@ -2,98 +2,97 @@
 """
 로컬 URL 단축 확인용 스크립트 (AWS 없이 SQLite + Python만 사용)
 
+배포와 같은 핸들러 코드(create / redirect / stats / trend)를 SQLite 저장소(STORAGE_BACKEND=sqlite)로 실행합니다.
+Bedrock 호출은 고정 응답 대역(AI_BACKEND=stub)으로 대체합니다.
+
 사용법:
   python3 scripts/local_run.py create "https://긴주소.com"
-  python3 scripts/local_run.py get <short_code>
+  python3 scripts/local_run.py get <short_code>          # 원본 URL 출력 + 클릭 로그 기록
+  python3 scripts/local_run.py stats <short_code> --minutes 60 --bucket 10
+  python3 scripts/local_run.py trend --minutes 60 [--bucket 10]
 """
 
 import argparse
+import contextlib
+import io
+import json
 import os
-import sqlite3
 import sys
-from typing import Optional
 
-# 프로젝트 루트의 src 폴더를 경로에 추가 (base62 임포트용)
+# 프로젝트 루트의 src 폴더를 경로에 추가 (핸들러 임포트용)
 _PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 _SRC = os.path.join(_PROJECT_ROOT, "src")
 if _SRC not in sys.path:
     sys.path.insert(0, _SRC)
 
-from common.base62 import encode, decode
-
 # SQLite DB 파일 위치 (프로젝트 루트에 생성됨)
 DB_PATH = os.path.join(_PROJECT_ROOT, "local_links.db")
 
+def _configure(db_path: str) -> None:
+    """핸들러 import 전에 로컬 실행용 환경 변수 설정"""
+    os.environ["STORAGE_BACKEND"] = "sqlite"
+    os.environ["STORAGE_SQLITE_PATH"] = db_path
+    os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+    os.environ.setdefault("AI_BACKEND", "stub")
+    # 프로세스가 곧 종료되므로 클릭 로그는 요청마다 바로 저장
+    os.environ["CLICK_LOG_MODE"] = "sync"
 
-def get_connection():
-    """DB 연결 반환"""
-    return sqlite3.connect(DB_PATH)
 
+def _invoke(handler, event: dict) -> dict:
+    """핸들러 디버그 출력은 숨기고 응답만 반환"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return handler(event, None)
 
-def init_db(conn):
-    """처음 실행 시 테이블 생성"""
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS links (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            original_url TEXT NOT NULL
-        )
-        """
-    )
-    conn.commit()
-
-
-def create_short_url(url: str) -> str:
-    """
-    URL을 DB에 저장하고 짧은 코드(short_code)를 만들어 반환합니다.
-    """
-    url = (url or "").strip()
-    if not url:
-        raise ValueError("URL을 입력해 주세요.")
-
-    conn = get_connection()
-    try:
-        init_db(conn)
-        cursor = conn.execute("INSERT INTO links (original_url) VALUES (?)", (url,))
-        conn.commit()
-        row_id = cursor.lastrowid
-        short_code = encode(row_id)
-        print(f"  [Base62 인코딩] DB ID {row_id} → short_code \"{short_code}\"")
-        return short_code
-    finally:
-        conn.close()
-
-
-def get_original_url(short_code: str) -> Optional[str]:
-    """
-    short_code로 DB를 조회해 원본 URL을 반환합니다.
-    없으면 None을 반환합니다.
-    """
-    short_code = (short_code or "").strip()
-    if not short_code:
-        return None
 
-    try:
-        row_id = decode(short_code)
-        print(f"  [Base62 디코딩] short_code \"{short_code}\" → DB ID {row_id}")
-    except (ValueError, KeyError):
+def _body(resp: dict) -> dict:
+    return json.loads(resp.get("body") or "{}")
+
+
+def create_short_url(url: str) -> dict:
+    from create import app
+
+    resp = _invoke(app.handler, {"body": json.dumps({"url": url}), "headers": {"Host": "localhost"}})
+    if resp["statusCode"] >= 400:
+        raise ValueError(_body(resp).get("error"))
+    return _body(resp)
+
+
+def get_original_url(short_code: str):
+    """원본 URL 반환 (없으면 None), redirect 핸들러가 클릭 로그도 기록"""
+    from redirect import app
+
+    resp = _invoke(app.handler, {
+        "pathParameters": {"shortCode": short_code},
+        "requestContext": {"identity": {"sourceIp": "127.0.0.1"}},
+    })
+    if resp["statusCode"] != 302:
         return None
+    return resp["headers"]["Location"]
 
-    conn = get_connection()
-    try:
-        init_db(conn)
-        row = conn.execute(
-            "SELECT original_url FROM links WHERE id = ?", (row_id,)
-        ).fetchone()
-        return row[0] if row else None
-    finally:
-        conn.close()
+
+def link_stats(short_code: str, minutes: int, bucket: int) -> dict:
+    from stats import app
+
+    return _body(_invoke(app.handler, {
+        "pathParameters": {"shortCode": short_code},
+        "queryStringParameters": {"minutes": str(minutes), "bucket": str(bucket)},
+    }))
+
+
+def trend_report(minutes: int, bucket: int = None) -> dict:
+    from trend import app
+
+    query = {"minutes": str(minutes), "fresh": "true"}
+    if bucket:
+        query["bucket"] = str(bucket)
+    return _body(_invoke(app.handler, {"queryStringParameters": query}))
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="로컬 URL 단축: create(저장) / get(조회)"
+        description="로컬 URL 단축: create(저장) / get(조회) / stats(링크 통계) / trend(트렌드)"
     )
+    parser.add_argument("--db", default=DB_PATH, help="SQLite DB 파일 경로")
     sub = parser.add_subparsers(dest="command", required=True)
 
     # create: URL 저장 후 short_code 출력
@@ -101,15 +100,25 @@ def main():
     p_create.add_argument("url", help="단축할 원본 URL (따옴표로 감싸서 입력)")
 
     # get: short_code로 원본 URL 조회
-    p_get = sub.add_parser("get", help="short_code로 원본 URL을 조회합니다")
+    p_get = sub.add_parser("get", help="short_code로 원본 URL을 조회합니다 (클릭 로그 기록)")
     p_get.add_argument("short_code", help="단축 코드 (예: 1, 2, 1Z)")
 
+    p_stats = sub.add_parser("stats", help="short_code의 클릭 통계를 조회합니다")
+    p_stats.add_argument("short_code")
+    p_stats.add_argument("--minutes", type=int, default=1440)
+    p_stats.add_argument("--bucket", type=int, default=60)
+
+    p_trend = sub.add_parser("trend", help="카테고리 트렌드 리포트를 계산합니다")
+    p_trend.add_argument("--minutes", type=int, default=1440)
+    p_trend.add_argument("--bucket", type=int, help="지정하면 시계열/히트맵 분석")
+
     args = parser.parse_args()
+    _configure(args.db)
 
     if args.command == "create":
         try:
-            code = create_short_url(args.url)
-            print(f"short_code: {code}")
+            result = create_short_url(args.url)
+            print(f"short_code: {result['shortCode']}")
         except ValueError as e:
             print(f"오류: {e}", file=sys.stderr)
             sys.exit(1)
@@ -121,6 +130,12 @@ def main():
             sys.exit(1)
         print(url)
 
+    elif args.command == "stats":
+        print(json.dumps(link_stats(args.short_code, args.minutes, args.bucket), ensure_ascii=False, indent=2))
+
+    elif args.command == "trend":
+        print(json.dumps(trend_report(args.minutes, args.bucket), ensure_ascii=False, indent=2))
+
 
 if __name__ == "__main__":
     main()
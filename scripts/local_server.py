@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+로컬 HTTP 서버 (부하 테스트용, AWS 없이 create / redirect / trend / stats 핸들러를 그대로 실행)
+
+HTTP 요청을 API Gateway 프록시 이벤트로 바꿔 배포와 같은 핸들러를 호출합니다.
+  - 저장소: SQLite 파일(기본) 또는 메모리 (STORAGE_BACKEND)
+  - AI: 고정 응답 대역(AI_BACKEND=stub, 기본) 또는 실제 Bedrock
+  - 워커: CPU 코어 수만큼 프로세스, 프로세스마다 asyncio 이벤트 루프 하나
+    Linux는 fork + SO_REUSEPORT로 워커마다 소켓을 열어 커널이 연결을 분산
+    그 외 POSIX(macOS 등)는 spawn으로 워커를 띄우고 부모가 연 소켓을 넘겨 공유
+    (macOS는 fork 후 시스템 프레임워크 사용이 안전하지 않음, Windows는 지원하지 않음)
+  - 모든 핸들러는 스레드 풀에서 실행 (SQLite 조회 / write-behind flush / AI 호출이 이벤트 루프를 막지 않도록)
+
+사용법:
+  python3 scripts/local_server.py --seed 100000                  # SQLite + 워커 = 코어 수, :8000
+  python3 scripts/local_server.py --backend memory --workers 1 --seed 100000
+  wrk -t4 -c256 -d30s http://127.0.0.1:8000/1Z                   # redirect 부하
+  curl -X POST localhost:8000/create -d '{"url": "https://example.com"}'
+  curl 'localhost:8000/trend?minutes=60'
+
+메모리 저장소는 워커 프로세스마다 따로 있으므로 --seed 데이터만 모든 워커가 공유합니다.
+(서버 실행 중 생성한 링크를 여러 워커에서 조회하려면 SQLite를 쓰거나 --workers 1)
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import sys
+import urllib.parse
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_SRC = os.path.join(_PROJECT_ROOT, "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+DB_PATH = os.path.join(_PROJECT_ROOT, "local_links.db")
+
+_SEED_CATEGORIES = ("IT", "뉴스", "쇼핑", "여행", "음식", "기타")
+_MAX_HEADER_BYTES = 64 * 1024
+_MAX_BODY_BYTES = 10 * 1024 * 1024
+# create 응답의 shortUrl이 https://{Host}/{stage}/{code} 형식이므로 스테이지 접두사도 허용
+_STAGE = "local"
+
+
+def _configure(args) -> None:
+    """핸들러 import 전에 로컬 서버용 환경 변수 설정"""
+    os.environ["STORAGE_BACKEND"] = args.backend
+    os.environ["STORAGE_SQLITE_PATH"] = args.db
+    os.environ["AI_BACKEND"] = args.ai
+    os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+
+
+def _seed(args) -> None:
+    """부하 테스트용 매핑 args.seed개 생성 (워커 fork 전에 부모에서, spawn + 메모리 저장소면 워커마다 실행)"""
+    from common import storage
+    from common.base62 import encode_range
+
+    if args.backend == "memory":
+        # from_env 공용 인스턴스에 넣어 두면 fork된 워커가 그대로 물려받음
+        store = storage.from_env()
+    else:
+        # SQLite 연결은 fork로 물려주면 안 되므로 별도 인스턴스로 쓰고 닫음
+        store = storage.create(args.backend, path=args.db)
+
+    last = store.reserve_ids(args.seed)
+    first = last - args.seed + 1
+    created_at = datetime.now(timezone.utc).isoformat()
+    rng = random.Random(0)
+    items = [
+        {
+            "shortCode": code,
+            "originalUrl": f"https://example.com/item/{first + i}",
+            "category": rng.choice(_SEED_CATEGORIES),
+            "summary": "부하 테스트용 시드 링크",
+            "createdAt": created_at,
+        }
+        for i, code in enumerate(encode_range(first, args.seed))
+    ]
+    failed = store.put_mappings(items)
+    if args.backend != "memory":
+        store.close()
+    print(f"seeded {len(items) - len(failed)} links: {items[0]['shortCode']} .. {items[-1]['shortCode']}")
+
+
+class _Router:
+    """HTTP 메서드 + 경로 -> (핸들러, 경로 파라미터, 이벤트 루프에서 바로 실행할지)"""
+
+    def __init__(self):
+        from create import app as create_app
+        from redirect import app as redirect_app
+        from stats import app as stats_app
+        from trend import app as trend_app
+
+        self.redirect_app = redirect_app
+        self._static = {
+            ("POST", "/create"): ("/create", create_app.handler),
+            ("POST", "/create/batch"): ("/create/batch", create_app.batch_handler),
+            ("GET", "/trend"): ("/trend", trend_app.handler),
+        }
+        self._stats = stats_app.handler
+        self._redirect = redirect_app.handler
+
+    def match(self, method: str, path: str):
+        if path.startswith(f"/{_STAGE}/"):
+            path = path[len(_STAGE) + 1:]
+        route = self._static.get((method, path))
+        if route:
+            resource, handler = route
+            return resource, handler, None
+        if method != "GET":
+            return None
+        parts = path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "stats" and parts[1]:
+            return "/stats/{shortCode}", self._stats, {"shortCode": parts[1]}
+        if len(parts) == 1 and parts[0]:
+            return "/{shortCode}", self._redirect, {"shortCode": parts[0]}
+        return None
+
+
+def _event(method: str, target: str, headers: dict, body: bytes, peer, resource: str, path_params) -> dict:
+    """HTTP 요청 -> API Gateway (REST, 프록시 통합) 이벤트"""
+    path, _, query = target.partition("?")
+    path = urllib.parse.unquote(path)
+    try:
+        text = body.decode("utf-8") if body else None
+        is_base64 = False
+    except UnicodeDecodeError:
+        import base64
+        text = base64.b64encode(body).decode("ascii")
+        is_base64 = True
+    return {
+        "resource": resource,
+        "path": path,
+        "httpMethod": method,
+        "headers": headers,
+        "queryStringParameters": dict(urllib.parse.parse_qsl(query)) or None,
+        "pathParameters": path_params,
+        "body": text,
+        "isBase64Encoded": is_base64,
+        "requestContext": {
+            "stage": _STAGE,
+            "httpMethod": method,
+            "path": path,
+            "identity": {"sourceIp": peer[0] if peer else "127.0.0.1"},
+        },
+    }
+
+
+def _header_value(value) -> str:
+    """헤더 값의 비 ASCII 문자는 퍼센트 인코딩 (예: 한글 경로가 들어간 Location)"""
+    return "".join(ch if ord(ch) < 128 else urllib.parse.quote(ch) for ch in str(value))
+
+
+def _encode_response(resp: dict, keep_alive: bool) -> bytes:
+    """Lambda 프록시 응답 -> HTTP/1.1 응답 바이트"""
+    status = int(resp.get("statusCode", 200))
+    body = resp.get("body") or ""
+    data = body.encode("utf-8") if isinstance(body, str) else bytes(body)
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    lines = [f"HTTP/1.1 {status} {reason}"]
+    for name, value in (resp.get("headers") or {}).items():
+        if name.lower() not in ("content-length", "connection"):
+            lines.append(f"{name}: {_header_value(value)}")
+    lines.append(f"Content-Length: {len(data)}")
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data
+
+
+def _error_response(status: int, message: str) -> dict:
+    return {
+        "statusCode": status,
+        "headers": {"Content-Type": "application/json"},
+        "body": json.dumps({"error": message}),
+    }
+
+
+async def _serve_connection(router: _Router, reader, writer) -> None:
+    """연결 하나 처리 (HTTP/1.1 keep-alive, 요청 순서대로 응답)"""
+    loop = asyncio.get_running_loop()
+    peer = writer.get_extra_info("peername")
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except asyncio.LimitOverrunError:
+                writer.write(_encode_response(_error_response(431, "Request header too large"), False))
+                return
+
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(_encode_response(_error_response(400, "Bad request line"), False))
+                return
+            headers = {}
+            for line in lines[1:]:
+                if line:
+                    name, _, value = line.partition(":")
+                    headers[name.strip()] = value.strip()
+            lowered = {name.lower(): value for name, value in headers.items()}
+
+            connection = lowered.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+            try:
+                length = int(lowered.get("content-length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                writer.write(_encode_response(_error_response(400, "Invalid Content-Length"), False))
+                return
+            if length > _MAX_BODY_BYTES:
+                writer.write(_encode_response(_error_response(413, "Request body too large"), False))
+                return
+            body = await reader.readexactly(length) if length else b""
+
+            try:
+                route = router.match(method, target.partition("?")[0])
+                if route is None:
+                    resp = _error_response(404, "Not found")
+                else:
+                    resource, handler, path_params = route
+                    event = _event(method, target, headers, body, peer, resource, path_params)
+                    resp = await loop.run_in_executor(None, handler, event, None)
+                data = _encode_response(resp, keep_alive)
+            except Exception as e:
+                # 핸들러 / 응답 인코딩 오류도 연결을 끊지 않고 500으로 응답
+                print(f"ERROR {method} {target}: {e!r}", file=sys.stderr)
+                data = _encode_response(_error_response(500, "Internal server error"), keep_alive)
+
+            writer.write(data)
+            await writer.drain()
+            if not keep_alive:
+                return
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _worker_main(args, sock) -> None:
+    router = _Router()
+    loop = asyncio.get_running_loop()
+
+    def _client(reader, writer):
+        return _serve_connection(router, reader, writer)
+
+    if sock is None:
+        server = await asyncio.start_server(
+            _client, args.host, args.port, reuse_port=True, backlog=4096, limit=_MAX_HEADER_BYTES,
+        )
+    else:
+        server = await asyncio.start_server(_client, sock=sock, backlog=4096, limit=_MAX_HEADER_BYTES)
+
+    stopped = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stopped.set)
+    async with server:
+        await stopped.wait()
+    # multiprocessing 자식은 atexit를 실행하지 않으므로 남은 클릭 로그를 직접 저장
+    router.redirect_app._CLICK_BUFFER.flush()
+
+
+def _worker(args, sock, seed: bool = False) -> None:
+    if not args.verbose:
+        # 핸들러 DEBUG 출력이 요청마다 터미널에 쓰이지 않도록
+        sys.stdout = open(os.devnull, "w")
+    if seed:
+        # spawn된 워커는 부모의 메모리 저장소를 물려받지 않으므로 같은 시드 데이터를 직접 생성
+        _seed(args)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(_worker_main(args, sock))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 HTTP 서버 (create / redirect / trend / stats, 부하 테스트용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="워커 프로세스 수 (기본: 코어 수)")
+    parser.add_argument("--backend", choices=("sqlite", "memory"), default="sqlite", help="저장소 백엔드")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite DB 파일 경로")
+    parser.add_argument("--ai", choices=("stub", "bedrock"), default="stub", help="AI 분류 / 트렌드 분석 백엔드")
+    parser.add_argument("--seed", type=int, default=0, help="시작 전에 생성할 테스트 링크 수")
+    parser.add_argument("--verbose", action="store_true", help="핸들러 DEBUG 출력 표시")
+    args = parser.parse_args()
+    if os.name != "posix":
+        parser.error("POSIX(Linux / macOS) 전용입니다 (asyncio 시그널 핸들러 / 워커 소켓 공유)")
+
+    _configure(args)
+    # Linux만 fork (설정 / 시드 데이터를 그대로 물려줌), 그 외 POSIX는 spawn
+    start_method = "fork" if sys.platform.startswith("linux") else "spawn"
+    seed_in_worker = args.seed > 0 and start_method == "spawn" and args.backend == "memory"
+    if args.seed > 0 and not seed_in_worker:
+        _seed(args)
+    if args.backend == "memory" and args.workers > 1:
+        print("WARNING: memory backend is per-worker; links created while serving are visible only to that worker")
+
+    # Linux는 워커마다 SO_REUSEPORT 소켓, 그 외는 부모 소켓을 워커에 넘겨 공유
+    sock = None
+    if not hasattr(socket, "SO_REUSEPORT") or start_method != "fork":
+        sock = socket.create_server((args.host, args.port), backlog=4096)
+
+    ctx = multiprocessing.get_context(start_method)
+    workers = [
+        ctx.Process(target=_worker, args=(args, sock, seed_in_worker), name=f"surl-worker-{i}")
+        for i in range(max(1, args.workers))
+    ]
+    for proc in workers:
+        proc.start()
+    print(f"serving on http://{args.host}:{args.port} "
+          f"(workers={len(workers)}, backend={args.backend}, ai={args.ai})")
+
+    def _stop(signum, frame):
+        for proc in workers:
+            if proc.is_alive():
+                os.kill(proc.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    for proc in workers:
+        proc.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Lambda 콜드 스타트 프로파일러
+
+핸들러 모듈마다 새 인터프리터(python -X importtime)를 띄워 다음을 측정합니다.
+  - init: 핸들러 모듈 import 시간 (Lambda init 단계에 해당)
+  - client: init 이후 첫 요청에서 추가로 드는 DynamoDB 클라이언트 생성 시간 (init에서 이미 만들었으면 0)
+  - cold: init + client = 콜드 스타트 첫 요청이 추가로 기다리는 시간 (비교 기준)
+  - init 단계 모듈별 import 시간 (self 기준 상위 N개, 최상위 패키지별 합계)
+  - init 직후 로드된 무거운 패키지(boto3/botocore/numpy)와 생성된 클라이언트
+
+--json 으로 결과를 저장하고 --baseline 으로 이전 결과와 비교하면 cold 시간이 기준보다
+--max-regression % 넘게 늘어난 핸들러가 있을 때 종료 코드 1을 반환합니다.
+
+사용법:
+  python3 scripts/profile_cold_start.py --runs 5
+  python3 scripts/profile_cold_start.py --json cold_start.json
+  python3 scripts/profile_cold_start.py --baseline cold_start.json --max-regression 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+_SRC = os.path.join(_PROJECT_ROOT, "src")
+
+HANDLERS = ("redirect.app", "create.app", "trend.app")
+# init 단계에 로드되면 콜드 스타트 비용이 큰 패키지
+_HEAVY_PACKAGES = ("boto3", "botocore", "numpy")
+
+# 자식 인터프리터에서 실행: 핸들러 import(init) -> 첫 요청에서 DynamoDB 클라이언트를 얻는 시간
+_PROBE = """
+import io, contextlib, json, sys, time
+t0 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    __import__(sys.argv[1])
+t1 = time.perf_counter()
+heavy = [name for name in sys.argv[2:] if name in sys.modules]
+sys.stderr.write("--- init done ---\\n")
+sys.stderr.flush()
+from common import clients, dynamo
+created = clients.created()
+t2 = time.perf_counter()
+dynamo.resource().client
+t3 = time.perf_counter()
+print(json.dumps({"init_ms": (t1 - t0) * 1000, "client_ms": (t3 - t2) * 1000,
+                  "heavy": heavy, "clients": created}))
+"""
+_INIT_MARKER = "--- init done ---"
+
+
+def _parse_importtime(lines: list) -> list:
+    """-X importtime 출력 -> [(모듈, self_us, cumulative_us)]"""
+    rows = []
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+def _run_once(module: str) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = _SRC + os.pathsep + env.get("PYTHONPATH", "")
+    env.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, module, *_HEAVY_PACKAGES],
+        env=env, capture_output=True, text=True, cwd=_PROJECT_ROOT,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    lines = proc.stderr.splitlines()
+    marker = lines.index(_INIT_MARKER)
+    result["imports"] = _parse_importtime(lines[:marker])
+    result["client_imports"] = _parse_importtime(lines[marker + 1:])
+    return result
+
+
+def _by_package(imports: list) -> dict:
+    totals = {}
+    for name, self_us, _ in imports:
+        top = name.split(".")[0]
+        totals[top] = totals.get(top, 0) + self_us
+    return totals
+
+
+def profile(module: str, runs: int, top: int) -> dict:
+    samples = [_run_once(module) for _ in range(runs)]
+    # 모듈 목록은 마지막 실행 기준 (import 구성은 실행마다 같음), 단계별 시간은 중앙값
+    last = samples[-1]
+    return {
+        "module": module,
+        "init_ms": statistics.median(s["init_ms"] for s in samples),
+        "client_ms": statistics.median(s["client_ms"] for s in samples),
+        "cold_ms": statistics.median(s["init_ms"] + s["client_ms"] for s in samples),
+        "heavy": last["heavy"],
+        "clients": last["clients"],
+        "modules": len(last["imports"]),
+        "client_modules": len(last["client_imports"]),
+        "top_modules": sorted(last["imports"], key=lambda r: r[1], reverse=True)[:top],
+        "top_packages": sorted(_by_package(last["imports"]).items(), key=lambda kv: kv[1], reverse=True)[:top],
+    }
+
+
+def _print_report(result: dict) -> None:
+    print(f"== {result['module']}")
+    print(f"  init   {result['init_ms']:8.1f} ms  (modules loaded: {result['modules']})")
+    print(f"  client {result['client_ms']:8.1f} ms  (DynamoDB client on first request, modules loaded: {result['client_modules']})")
+    print(f"  cold   {result['cold_ms']:8.1f} ms  (init + first request)")
+    print(f"  heavy packages at init: {', '.join(result['heavy']) or '-'}")
+    print(f"  clients created at init: {', '.join(result['clients']) or '-'}")
+    print("  top packages at init (self ms):")
+    for name, us in result["top_packages"]:
+        print(f"    {us / 1000:8.2f}  {name}")
+    print("  top modules at init (self ms / cumulative ms):")
+    for name, self_us, cum_us in result["top_modules"]:
+        print(f"    {self_us / 1000:8.2f} / {cum_us / 1000:8.2f}  {name}")
+
+
+def _regressions(results: list, baseline: dict, max_regression: float) -> list:
+    failed = []
+    for result in results:
+        base = baseline.get(result["module"])
+        if not base:
+            continue
+        base_ms = base.get("cold_ms", base["init_ms"])
+        limit = base_ms * (1 + max_regression / 100)
+        if result["cold_ms"] > limit:
+            failed.append(f"{result['module']}: cold {result['cold_ms']:.1f} ms > {limit:.1f} ms "
+                          f"(baseline {base_ms:.1f} ms)")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="핸들러 콜드 스타트(import / init) 프로파일")
+    parser.add_argument("modules", nargs="*", default=list(HANDLERS), help="핸들러 모듈 (기본: redirect/create/trend)")
+    parser.add_argument("--runs", type=int, default=3, help="핸들러별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=10, help="표시할 상위 모듈/패키지 수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--max-regression", type=float, default=20, help="허용하는 cold(init + 첫 요청) 시간 증가율(%%)")
+    args = parser.parse_args()
+
+    results = [profile(module, args.runs, args.top) for module in args.modules]
+    for result in results:
+        _print_report(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({r["module"]: r for r in results}, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            failed = _regressions(results, json.load(f), args.max_regression)
+        for line in failed:
+            print(f"REGRESSION {line}")
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
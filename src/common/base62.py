@@ -1,26 +1,154 @@
 """
 Base62 인코딩/디코딩 (URL 단축용)
 문자集: 0-9, a-z, A-Z (62자)
+디코딩은 바이트 값 -> 자릿값 역조회 테이블 사용, 대량 변환(encode_many/decode_many)은 NumPy가 있으면 벡터화
 """
 
+import importlib.util
+
+# 선택 의존성: 설치 여부만 확인하고 import는 벡터화 경로에서 처음 쓸 때 (콜드 스타트에 NumPy 로드 비용 없음)
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+np = None
+
 ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
 BASE = len(ALPHABET)
 
+# 바이트 값(0~255) -> 자릿값, Base62 문자가 아니면 -1
+_DECODE_TABLE = tuple(ALPHABET.find(chr(b)) if b < 128 else -1 for b in range(256))
+# NumPy 경로 최대 자릿수 (62^10 < 2^63이므로 int64 범위에서 오버플로 없음)
+_VECTOR_MAX_LEN = 10
+# 이보다 적은 건수는 배열 변환 비용이 더 커서 순수 Python 경로 사용
+_VECTOR_MIN_BATCH = 1000
+
+
+class Base62Error(ValueError):
+    """Base62 형식이 아닌 코드 또는 인코딩할 수 없는 값"""
+
 
 def encode(num: int) -> str:
     """정수 -> Base62 문자열"""
-    if num == 0:
-        return ALPHABET[0]
+    if num <= 0:
+        if num == 0:
+            return ALPHABET[0]
+        raise Base62Error(f"cannot encode {num!r}: expected a non-negative integer")
+    alphabet = ALPHABET
     result = []
-    while num > 0:
-        result.append(ALPHABET[num % BASE])
-        num //= BASE
-    return "".join(reversed(result))
+    while num:
+        num, rem = divmod(num, BASE)
+        result.append(alphabet[rem])
+    result.reverse()
+    return "".join(result)
+
 
+def decode(s: str, strict: bool = False) -> int:
+    """Base62 문자열 -> 정수
 
-def decode(s: str) -> int:
-    """Base62 문자열 -> 정수"""
+    strict=True면 encode 결과와 같은 정규형(앞자리 0 없음)만 허용
+    """
+    if not s:
+        raise Base62Error("empty code")
+    try:
+        raw = s.encode("ascii")
+    except (AttributeError, UnicodeEncodeError):
+        raise Base62Error(f"invalid base62 code: {s!r}") from None
+    table = _DECODE_TABLE
     num = 0
-    for char in s:
-        num = num * BASE + ALPHABET.index(char)
+    for b in raw:
+        digit = table[b]
+        if digit < 0:
+            raise Base62Error(f"invalid base62 code: {s!r}")
+        num = num * BASE + digit
+    if strict and len(raw) > 1 and raw[0] == 48:  # "0"
+        raise Base62Error(f"non-canonical base62 code: {s!r}")
     return num
+
+
+def is_valid(s: str, strict: bool = True) -> bool:
+    """디코딩 가능한(기본: 정규형) Base62 코드인지 여부"""
+    try:
+        decode(s, strict=strict)
+        return True
+    except Base62Error:
+        return False
+
+
+def _numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+def _use_vector(values, vectorize) -> bool:
+    if not HAS_NUMPY or vectorize is False:
+        return False
+    return vectorize or len(values) >= _VECTOR_MIN_BATCH
+
+
+def encode_many(nums, vectorize: bool = None) -> list:
+    """정수 목록 -> Base62 문자열 목록 (vectorize=None: 건수가 많고 NumPy가 있으면 벡터화)"""
+    nums = list(nums)
+    if _use_vector(nums, vectorize):
+        np = _numpy()
+        try:
+            ids = np.array(nums, dtype=np.int64)
+        except (OverflowError, TypeError, ValueError):
+            ids = None
+        if ids is not None and (ids >= 0).all():
+            return _encode_numpy(ids)
+    return [encode(n) for n in nums]
+
+
+def decode_many(codes, strict: bool = False, vectorize: bool = None) -> list:
+    """Base62 문자열 목록 -> 정수 목록 (잘못된 코드가 있으면 Base62Error)"""
+    codes = list(codes)
+    if _use_vector(codes, vectorize) and all(0 < len(c) <= _VECTOR_MAX_LEN for c in codes):
+        try:
+            return _decode_numpy(codes, strict)
+        except UnicodeEncodeError:
+            raise Base62Error("invalid base62 code in batch") from None
+    return [decode(c, strict=strict) for c in codes]
+
+
+def encode_range(start: int, count: int) -> list:
+    """연속 ID 구간 [start, start + count)의 Base62 코드 (일괄 생성용)"""
+    if HAS_NUMPY and count >= _VECTOR_MIN_BATCH and start >= 0 and start + count < 2 ** 63:
+        np = _numpy()
+        return _encode_numpy(np.arange(start, start + count, dtype=np.int64))
+    return [encode(n) for n in range(start, start + count)]
+
+
+def _encode_numpy(ids) -> list:
+    np = _numpy()
+    # 자릿수 11개(2^63 미만 전체)를 뒤에서부터 채운 뒤 앞자리 0을 제거
+    width = 11
+    alphabet = np.frombuffer(ALPHABET.encode("ascii"), dtype=np.uint8)
+    digits = np.empty((len(ids), width), dtype=np.uint8)
+    rest = ids.copy()
+    for col in range(width - 1, -1, -1):
+        rest, rem = np.divmod(rest, BASE)
+        digits[:, col] = alphabet[rem]
+    padded = digits.view(f"S{width}").ravel()
+    stripped = np.char.lstrip(padded, b"0")
+    stripped[stripped == b""] = b"0"
+    return stripped.astype(str).tolist()
+
+
+def _decode_numpy(codes: list, strict: bool) -> list:
+    np = _numpy()
+    width = _VECTOR_MAX_LEN
+    raw = np.array([c.encode("ascii") for c in codes], dtype=f"S{width}")
+    lengths = np.char.str_len(raw)
+    # S 타입은 끝의 NUL 바이트를 잘라내므로 원래 길이와 다르면 잘못된 코드
+    if (lengths != np.array([len(c) for c in codes])).any():
+        raise Base62Error("invalid base62 code in batch")
+    # 오른쪽 정렬(앞을 "0"으로 채움)해 자릿값 행렬로 변환
+    aligned = np.char.rjust(raw, width, b"0").view(np.uint8).reshape(len(codes), width)
+    digits = np.array(_DECODE_TABLE, dtype=np.int64)[aligned]
+    if (digits < 0).any():
+        raise Base62Error("invalid base62 code in batch")
+    if strict and ((lengths > 1) & (raw.view(np.uint8).reshape(len(codes), width)[:, 0] == 48)).any():
+        raise Base62Error("non-canonical base62 code in batch")
+    powers = BASE ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (digits * powers).sum(axis=1).tolist()
@@ -0,0 +1,47 @@
+"""
+Bedrock Runtime 대역 (AI_BACKEND=stub, 로컬 서버 / 부하 테스트용)
+invoke_model 응답 형식(Claude messages)을 그대로 흉내내고, 프롬프트 종류에 맞는 고정 응답 반환
+  - URL 다건 분류(JSON 배열 요청): 목록 번호마다 {"index", "category", "summary"}
+  - URL 단건 분류(JSON 객체 요청): {"category", "summary"}
+  - 그 외(트렌드 분석): 대시보드 파싱 형식의 한 줄 문장
+"""
+
+import io
+import json
+import os
+import re
+import time
+
+STUB_CATEGORY = "기타"
+STUB_SUMMARY = "로컬 스텁 분류 (AI 분석 생략)"
+STUB_TREND = "[분야] 스텁 [사유] AI_BACKEND=stub 고정 응답 [요약] 실제 모델을 호출하지 않았습니다."
+
+_LISTING_LINE = re.compile(r"^\s*(\d+)\.\s", re.MULTILINE)
+
+
+def stub_text(prompt: str) -> str:
+    """프롬프트 -> 고정 응답 텍스트"""
+    if "JSON array" in prompt:
+        return json.dumps([
+            {"index": int(n), "category": STUB_CATEGORY, "summary": STUB_SUMMARY}
+            for n in _LISTING_LINE.findall(prompt)
+        ], ensure_ascii=False)
+    if "JSON format" in prompt:
+        return json.dumps({"category": STUB_CATEGORY, "summary": STUB_SUMMARY}, ensure_ascii=False)
+    return STUB_TREND
+
+
+class StubBedrock:
+    """invoke_model만 제공하는 클라이언트 대역 (latency_ms만큼 지연해 모델 호출 시간을 흉내낼 수 있음)"""
+
+    def __init__(self, latency_ms: float = None):
+        if latency_ms is None:
+            latency_ms = float(os.environ.get("AI_STUB_LATENCY_MS", "0"))
+        self.latency_ms = latency_ms
+
+    def invoke_model(self, modelId: str, body: str, **kwargs) -> dict:  # noqa: N803 (boto3와 같은 인자 이름)
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+        prompt = json.loads(body)["messages"][0]["content"]
+        payload = {"content": [{"type": "text", "text": stub_text(prompt)}], "model": modelId}
+        return {"body": io.BytesIO(json.dumps(payload, ensure_ascii=False).encode("utf-8"))}
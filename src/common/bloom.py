@@ -0,0 +1,44 @@
+"""
+Bloom 필터 (발급된 shortCode 존재 여부 사전 판별용)
+"없음" 판정은 확실하고, "있음" 판정은 error_rate 확률로 오탐할 수 있음
+"""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """bytearray 기반 Bloom 필터 (double hashing)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, int(capacity))
+        error_rate = min(max(float(error_rate), 1e-9), 0.5)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, keys) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,42 @@
+"""
+클릭 로그 시간 버킷 유틸리티
+hourBucket 값 형식: "YYYY-MM-DDTHH#<shard>" (UTC, ISO 타임스탬프 앞 13자리 + 샤드 번호)
+"""
+
+import zlib
+from datetime import datetime, timedelta, timezone
+
+HOUR_BUCKET_INDEX = "HourBucketIndex"
+
+
+def hour_of(timestamp: str) -> str:
+    """ISO 타임스탬프 -> 시간 버킷 접두어 (예: 2026-10-17T05)"""
+    return timestamp[:13]
+
+
+def shard_of(short_code: str, shards: int) -> int:
+    """shortCode 기준 샤드 번호 (GSI 파티션 쓰기 분산)"""
+    if shards <= 1:
+        return 0
+    return zlib.crc32(short_code.encode("utf-8")) % shards
+
+
+def hour_bucket(timestamp: str, short_code: str, shards: int = 1) -> str:
+    """클릭 로그에 저장할 hourBucket 값"""
+    return f"{hour_of(timestamp)}#{shard_of(short_code, shards)}"
+
+
+def hours_between(since: datetime, until: datetime = None) -> list:
+    """since ~ until(기본 현재) 구간에 걸친 시간 버킷 접두어 목록 (오래된 순)"""
+    until = until or datetime.now(timezone.utc)
+    current = since.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    hours = []
+    while current <= until:
+        hours.append(current.strftime("%Y-%m-%dT%H"))
+        current += timedelta(hours=1)
+    return hours
+
+
+def window_buckets(since: datetime, shards: int = 1, until: datetime = None) -> list:
+    """구간 조회 시 Query해야 할 hourBucket 값 전체"""
+    return [f"{hour}#{shard}" for hour in hours_between(since, until) for shard in range(max(1, shards))]
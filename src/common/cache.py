@@ -0,0 +1,87 @@
+"""
+프로세스 내 TTL + LRU 캐시
+Lambda 웜 컨테이너 간에 유지되는 모듈 전역 캐시로 사용
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """크기 제한(LRU)과 만료 시간(TTL)을 함께 갖는 스레드 안전 캐시"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, clock=time.monotonic):
+        self.maxsize = max(0, int(maxsize))
+        self.ttl = float(ttl)
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """키 조회 (만료된 항목은 제거 후 miss 처리)"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None) -> None:
+        """키 저장 (용량 초과 시 가장 오래 사용되지 않은 항목부터 제거)"""
+        if self.maxsize == 0:
+            return
+        expires_at = self._clock() + (self.ttl if ttl is None else float(ttl))
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = (expires_at, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """키 삭제 후 값 반환"""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry is not _MISSING and entry[0] > self._clock()
+
+    def stats(self) -> dict:
+        """hit/miss/eviction 카운터 스냅샷"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hitRate": round(self.hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,181 @@
+"""
+URL 분류 결과 캐시 (정규화 URL 우선, 선택적 등록 도메인 fallback)
+메모리 LRU 계층 + DynamoDB TTL 계층으로 반복 도메인의 Bedrock 호출 생략
+"""
+
+import hashlib
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from common.cache import TTLCache
+
+# 분류에 영향 없는 추적용 쿼리 파라미터
+_TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "yclid"}
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+# 2단계 공개 접미사 (예: shop.co.kr -> 등록 도메인 shop.co.kr)
+_SECOND_LEVEL_SUFFIXES = {
+    "co.kr", "or.kr", "go.kr", "ac.kr", "ne.kr", "re.kr", "pe.kr", "ms.kr", "hs.kr",
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "co.jp", "ne.jp", "or.jp",
+    "com.au", "net.au", "org.au", "com.cn", "net.cn", "com.br", "com.tw", "com.hk", "co.nz",
+}
+# 사용자별 서브도메인을 주는 공유 호스팅 (공개 접미사처럼 취급: alice.github.io -> alice.github.io)
+_SHARED_HOST_SUFFIXES = {
+    "github.io", "gitlab.io", "blogspot.com", "tistory.com", "wordpress.com", "netlify.app",
+    "vercel.app", "pages.dev", "herokuapp.com", "notion.site", "substack.com",
+}
+# 같은 도메인 아래 성격이 제각각인 링크가 모이는 단축 URL / 대형 플랫폼 (도메인 fallback 제외)
+_NO_DOMAIN_FALLBACK = {
+    "bit.ly", "t.co", "goo.gl", "tinyurl.com", "ow.ly", "buff.ly", "is.gd", "naver.me", "me2.do",
+    "youtu.be", "youtube.com", "medium.com", "naver.com", "daum.net", "google.com",
+}
+
+
+def normalize_url(url: str) -> str:
+    """분류 캐시용 URL 정규화 (소문자 호스트, 기본 포트/fragment/추적 파라미터 제거, 쿼리 정렬)"""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    netloc = host
+    if parts.port and str(parts.port) != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def registered_domain(url: str) -> str:
+    """등록 도메인(eTLD+1) 추출 (예: https://m.shop.example.co.kr/a -> example.co.kr)"""
+    host = (urlsplit(url.strip()).hostname or "").lower().rstrip(".")
+    labels = host.split(".")
+    if len(labels) <= 2 or host.replace(".", "").isdigit():
+        return host
+    if ".".join(labels[-2:]) in _SECOND_LEVEL_SUFFIXES | _SHARED_HOST_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _url_key(url: str) -> str:
+    return "url#" + hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+def _domain_key(url: str):
+    """도메인 fallback 키 (단축 URL / 대형 플랫폼 / 공유 호스팅 루트는 None)"""
+    domain = registered_domain(url)
+    if not domain or domain in _NO_DOMAIN_FALLBACK or domain in _SHARED_HOST_SUFFIXES:
+        return None
+    return "domain#" + domain
+
+
+class CategoryCache:
+    """2계층 분류 캐시
+
+    memory: TTLCache (컨테이너 내 LRU)
+    dynamo: table_name이 주어진 경우에만 사용, item = {cacheKey, category, summary, expiresAt}
+    domain_fallback: 같은 등록 도메인의 분류 재사용 (기본 off, 도메인 하나가 한 분야인 서비스에서만 사용)
+    """
+
+    def __init__(self, memory_size: int = 5000, memory_ttl: float = 3600.0,
+                 dynamo=None, table_name: str = None, table_ttl: float = 7 * 86400,
+                 domain_fallback: bool = False):
+        self._memory = TTLCache(maxsize=memory_size, ttl=memory_ttl)
+        self._dynamo = dynamo
+        self._table_name = table_name
+        self.table_ttl = float(table_ttl)
+        self.domain_fallback = domain_fallback
+        self._lock = threading.Lock()
+        self.counts = {"memory_url": 0, "memory_domain": 0, "dynamo_url": 0, "dynamo_domain": 0, "miss": 0}
+
+    def _count(self, tier: str) -> None:
+        with self._lock:
+            self.counts[tier] += 1
+
+    def _from_domain(self, domain_entry: dict, url: str) -> dict:
+        return {
+            "category": domain_entry["category"],
+            "summary": f"{registered_domain(url)} 도메인 분류 결과 재사용",
+        }
+
+    def get(self, url: str):
+        """(분류 결과, 적중 계층) 반환, 없으면 (None, "miss")"""
+        url_key = _url_key(url)
+        domain_key = _domain_key(url) if self.domain_fallback else None
+
+        hit = self._memory.get(url_key)
+        if hit is not None:
+            self._count("memory_url")
+            return hit, "memory_url"
+        if domain_key:
+            hit = self._memory.get(domain_key)
+            if hit is not None:
+                self._count("memory_domain")
+                return self._from_domain(hit, url), "memory_domain"
+
+        if self._table_name:
+            items = self._read_table([url_key, domain_key] if domain_key else [url_key])
+            if url_key in items:
+                self._memory.set(url_key, items[url_key])
+                self._count("dynamo_url")
+                return items[url_key], "dynamo_url"
+            if domain_key and domain_key in items:
+                self._memory.set(domain_key, items[domain_key])
+                self._count("dynamo_domain")
+                return self._from_domain(items[domain_key], url), "dynamo_domain"
+
+        self._count("miss")
+        return None, "miss"
+
+    def put(self, url: str, result: dict) -> None:
+        """성공한 분류 결과를 URL 키로 저장 (도메인 fallback 사용 시 도메인 키도)"""
+        entry = {"category": result.get("category", "기타"), "summary": result.get("summary", "분석 없음")}
+        entries = {_url_key(url): entry}
+        domain_key = _domain_key(url) if self.domain_fallback else None
+        if domain_key:
+            entries[domain_key] = entry
+        for key, value in entries.items():
+            self._memory.set(key, value)
+        if self._table_name:
+            self._write_table(entries)
+
+    def _read_table(self, keys: list) -> dict:
+        try:
+            resp = self._dynamo.batch_get_item(RequestItems={
+                self._table_name: {"Keys": [{"cacheKey": k} for k in keys]},
+            })
+            now = int(time.time())
+            found = {}
+            for item in resp.get("Responses", {}).get(self._table_name, []):
+                # DynamoDB TTL 삭제는 지연되므로 만료 여부를 직접 확인
+                if int(item.get("expiresAt", 0)) > now:
+                    found[item["cacheKey"]] = {"category": item.get("category"), "summary": item.get("summary")}
+            return found
+        except Exception as e:
+            print(f"DEBUG ERROR in CategoryCache._read_table: {str(e)}")
+            return {}
+
+    def _write_table(self, entries: dict) -> None:
+        expires_at = int(time.time() + self.table_ttl)
+        try:
+            self._dynamo.batch_write_item(RequestItems={
+                self._table_name: [
+                    {"PutRequest": {"Item": {"cacheKey": k, "expiresAt": expires_at, **v}}}
+                    for k, v in entries.items()
+                ],
+            })
+        except Exception as e:
+            print(f"DEBUG ERROR in CategoryCache._write_table: {str(e)}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+        total = sum(counts.values())
+        hits = total - counts["miss"]
+        counts["hitRate"] = round(hits / total, 4) if total else 0.0
+        return counts
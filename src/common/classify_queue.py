@@ -0,0 +1,101 @@
+"""
+URL 분류(Bedrock) 비동기 작업 큐
+운영: SQS로 전송 -> 분류 워커 람다가 처리 / 로컬: 프로세스 내 큐 + 워커 스레드로 대체
+"""
+
+import json
+import queue
+import threading
+
+# 분류 완료 전 매핑에 저장되는 임시 값
+PENDING_CATEGORY = "분석중"
+PENDING_SUMMARY = "AI 분석 대기중"
+
+
+class LocalQueue:
+    """SQS 대역: 프로세스 내 큐에 적재하고 데몬 스레드가 worker_fn(job)으로 처리"""
+
+    def __init__(self, worker_fn, workers: int = 1):
+        self._worker_fn = worker_fn
+        self._queue = queue.Queue()
+        self._threads = []
+        self._workers = max(1, int(workers))
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self._workers):
+                t = threading.Thread(target=self._run, name=f"classify-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._worker_fn(job)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"DEBUG ERROR in LocalQueue worker: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def send(self, job: dict) -> None:
+        self._ensure_workers()
+        self._queue.put(job)
+
+    def send_many(self, jobs: list) -> list:
+        for job in jobs:
+            self.send(job)
+        return []
+
+    def join(self) -> None:
+        """적재된 작업이 모두 처리될 때까지 대기 (테스트/로컬 실행용)"""
+        self._queue.join()
+
+
+class SqsQueue:
+    """SQS 큐로 작업 전송 (분류 워커 람다의 이벤트 소스)"""
+
+    def __init__(self, queue_url: str, client):
+        self.queue_url = queue_url
+        self._client = client
+
+    def send(self, job: dict) -> None:
+        self._client.send_message(
+            QueueUrl=self.queue_url,
+            MessageBody=json.dumps(job, ensure_ascii=False),
+        )
+
+    def send_many(self, jobs: list) -> list:
+        """send_message_batch로 10건씩 전송 (실패 건은 개별 재전송), 끝내 보내지 못한 작업 반환
+
+        중간에 예외가 나도 나머지 작업은 계속 전송
+        """
+        unsent = []
+        for start in range(0, len(jobs), 10):
+            chunk = jobs[start:start + 10]
+            try:
+                resp = self._client.send_message_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {"Id": str(i), "MessageBody": json.dumps(job, ensure_ascii=False)}
+                        for i, job in enumerate(chunk)
+                    ],
+                )
+                retry = [chunk[int(failed["Id"])] for failed in resp.get("Failed", [])]
+            except Exception as e:
+                print(f"DEBUG ERROR in SqsQueue.send_many: {str(e)}")
+                retry = chunk
+            for job in retry:
+                try:
+                    self.send(job)
+                except Exception as e:
+                    print(f"DEBUG ERROR in SqsQueue.send: {str(e)}")
+                    unsent.append(job)
+        return unsent
@@ -0,0 +1,44 @@
+"""
+AWS 클라이언트 생성 / 캐시 (서비스별 프로세스 공용)
+DynamoDB는 매 요청 쓰므로 common.dynamo.resource()가 init 단계에서 생성
+Bedrock / SQS는 일부 경로에서만 쓰므로 처음 호출할 때 생성 (예: redirect, 저장된 트렌드 리포트, async 분류는 Bedrock 없음)
+"""
+
+import os
+import threading
+
+_lock = threading.Lock()
+_clients = {}
+
+
+def client(service: str, region_name: str = None, **config_options):
+    """서비스별 프로세스 공용 클라이언트 (config_options는 botocore Config 인자, 첫 생성 시에만 적용)"""
+    cached = _clients.get(service)
+    if cached is not None:
+        return cached
+    with _lock:
+        cached = _clients.get(service)
+        if cached is None:
+            import boto3
+            from botocore.config import Config
+
+            config = Config(**config_options) if config_options else None
+            cached = _clients[service] = boto3.client(service, region_name=region_name, config=config)
+        return cached
+
+
+def bedrock():
+    """Bedrock Runtime 클라이언트 (리전 설정 필수, AI_BACKEND=stub이면 고정 응답 대역)"""
+    if os.environ.get("AI_BACKEND", "bedrock").strip().lower() == "stub":
+        from common.bedrock_stub import StubBedrock
+        return StubBedrock()
+    return client("bedrock-runtime", region_name=os.environ.get("AWS_REGION", "ap-northeast-2"))
+
+
+def sqs():
+    return client("sqs")
+
+
+def created() -> list:
+    """지금까지 생성된 클라이언트 서비스 이름 (콜드 스타트 프로파일링용)"""
+    return sorted(_clients)
@@ -0,0 +1,229 @@
+"""
+저수준 DynamoDB 클라이언트 기반 데이터 접근 계층
+boto3 resource와 같은 메서드/응답 형태(get_item, query, batch_write_item 등)를 제공하되,
+TypeSerializer/Decimal 변환 대신 직접 작성한 속성 인코딩/디코딩을 사용하고 Table 객체를 재사용
+배포 환경(STORAGE_BACKEND=dynamo)에서는 resource()가 init 단계에서 클라이언트를 바로 생성
+(redirect / create / trend는 매 요청 DynamoDB를 쓰므로 지연 생성은 init 비용을 첫 요청으로 옮길 뿐이고,
+ init 단계의 CPU 부스트도 받지 못함) - 로컬 백엔드에서는 선택적 DynamoDB 계층을 처음 쓸 때 생성
+"""
+
+import os
+import threading
+from decimal import Decimal
+
+from common import clients
+
+# 핸들러 지연 시간에 맞춘 클라이언트 설정 (타임아웃 / 재시도 / keep-alive / 커넥션 풀)
+CONFIG_OPTIONS = {
+    "connect_timeout": float(os.environ.get("DYNAMO_CONNECT_TIMEOUT", "1")),
+    "read_timeout": float(os.environ.get("DYNAMO_READ_TIMEOUT", "3")),
+    "retries": {"total_max_attempts": int(os.environ.get("DYNAMO_MAX_ATTEMPTS", "3")), "mode": "standard"},
+    "max_pool_connections": int(os.environ.get("DYNAMO_MAX_POOL", "32")),
+    "tcp_keepalive": True,
+}
+
+_lock = threading.Lock()
+_shared = {"resource": None}
+
+
+def _number(raw: str):
+    """N 속성 -> int (정수) / float"""
+    if "." in raw or "e" in raw or "E" in raw:
+        return float(raw)
+    return int(raw)
+
+
+def from_attr(attr: dict):
+    """DynamoDB 속성 값({"S": ...} 등) -> Python 값"""
+    (tag, value), = attr.items()
+    if tag == "S":
+        return value
+    if tag == "N":
+        return _number(value)
+    if tag == "M":
+        return {k: from_attr(v) for k, v in value.items()}
+    if tag == "L":
+        return [from_attr(v) for v in value]
+    if tag == "B":
+        return bytes(value)
+    if tag == "BOOL":
+        return value
+    if tag == "NULL":
+        return None
+    if tag == "SS":
+        return set(value)
+    if tag == "NS":
+        return {_number(v) for v in value}
+    if tag == "BS":
+        return {bytes(v) for v in value}
+    raise ValueError(f"unsupported attribute type: {tag}")
+
+
+def to_attr(value) -> dict:
+    """Python 값 -> DynamoDB 속성 값"""
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, (int, float, Decimal)):
+        return {"N": str(value)}
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, dict):
+        return {"M": {k: to_attr(v) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [to_attr(v) for v in value]}
+    if isinstance(value, (bytes, bytearray)):
+        return {"B": bytes(value)}
+    if isinstance(value, (set, frozenset)) and value:
+        sample = next(iter(value))
+        if isinstance(sample, str):
+            return {"SS": list(value)}
+        if isinstance(sample, (bytes, bytearray)):
+            return {"BS": [bytes(v) for v in value]}
+        return {"NS": [str(v) for v in value]}
+    raise TypeError(f"unsupported value for DynamoDB: {type(value).__name__}")
+
+
+def decode_item(item: dict) -> dict:
+    return {k: from_attr(v) for k, v in item.items()}
+
+
+def encode_item(item: dict) -> dict:
+    return {k: to_attr(v) for k, v in item.items()}
+
+
+# resource 인터페이스에서 값이 담기는 요청/응답 필드
+_ENCODED_PARAMS = ("Key", "Item", "ExclusiveStartKey")
+
+
+def _encode_params(params: dict) -> dict:
+    out = dict(params)
+    for name in _ENCODED_PARAMS:
+        if name in out:
+            out[name] = encode_item(out[name])
+    if "ExpressionAttributeValues" in out:
+        out["ExpressionAttributeValues"] = encode_item(out["ExpressionAttributeValues"])
+    return out
+
+
+class Table:
+    """resource Table과 같은 호출 형태의 테이블 핸들 (값은 int/float/str/bytes로 반환)"""
+
+    def __init__(self, db: "Dynamo", name: str):
+        self._db = db
+        self.name = name
+        self.table_name = name
+
+    @property
+    def _client(self):
+        return self._db.client
+
+    def get_item(self, **params) -> dict:
+        resp = self._client.get_item(TableName=self.name, **_encode_params(params))
+        if "Item" in resp:
+            return {"Item": decode_item(resp["Item"])}
+        return {}
+
+    def put_item(self, **params) -> dict:
+        resp = self._client.put_item(TableName=self.name, **_encode_params(params))
+        if "Attributes" in resp:
+            return {"Attributes": decode_item(resp["Attributes"])}
+        return {}
+
+    def update_item(self, **params) -> dict:
+        resp = self._client.update_item(TableName=self.name, **_encode_params(params))
+        if "Attributes" in resp:
+            return {"Attributes": decode_item(resp["Attributes"])}
+        return {}
+
+    def delete_item(self, **params) -> dict:
+        self._client.delete_item(TableName=self.name, **_encode_params(params))
+        return {}
+
+    def _page(self, resp: dict) -> dict:
+        page = {"Items": [decode_item(item) for item in resp.get("Items", [])], "Count": resp.get("Count", 0)}
+        if "LastEvaluatedKey" in resp:
+            page["LastEvaluatedKey"] = decode_item(resp["LastEvaluatedKey"])
+        return page
+
+    def query(self, **params) -> dict:
+        return self._page(self._client.query(TableName=self.name, **_encode_params(params)))
+
+    def scan(self, **params) -> dict:
+        return self._page(self._client.scan(TableName=self.name, **_encode_params(params)))
+
+
+class Dynamo:
+    """resource 대체: 테이블 이름별 Table 캐시 + batch_get_item / batch_write_item / transact_write_items"""
+
+    def __init__(self, client=None):
+        self._client = client
+        self._tables = {}
+
+    @property
+    def client(self):
+        """저수준 클라이언트 (주입되지 않았으면 첫 사용 시 생성)"""
+        if self._client is None:
+            self._client = clients.client("dynamodb", **CONFIG_OPTIONS)
+        return self._client
+
+    def Table(self, name: str) -> Table:  # noqa: N802 (resource와 같은 이름)
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables[name] = Table(self, name)
+        return table
+
+    def batch_get_item(self, RequestItems: dict) -> dict:  # noqa: N803
+        request = {
+            name: {**spec, "Keys": [encode_item(k) for k in spec["Keys"]]}
+            for name, spec in RequestItems.items()
+        }
+        resp = self.client.batch_get_item(RequestItems=request)
+        out = {"Responses": {
+            name: [decode_item(item) for item in items] for name, items in resp.get("Responses", {}).items()
+        }}
+        out["UnprocessedKeys"] = {
+            name: {**spec, "Keys": [decode_item(k) for k in spec["Keys"]]}
+            for name, spec in (resp.get("UnprocessedKeys") or {}).items()
+        }
+        return out
+
+    def batch_write_item(self, RequestItems: dict) -> dict:  # noqa: N803
+        resp = self.client.batch_write_item(RequestItems={
+            name: [_encode_write(r) for r in requests] for name, requests in RequestItems.items()
+        })
+        return {"UnprocessedItems": {
+            name: [_decode_write(r) for r in requests]
+            for name, requests in (resp.get("UnprocessedItems") or {}).items()
+        }}
+
+    def transact_write_items(self, TransactItems: list) -> dict:  # noqa: N803
+        """Put 항목만 지원 (조건부 일괄 저장용)"""
+        self.client.transact_write_items(TransactItems=[
+            {"Put": _encode_params(entry["Put"])} for entry in TransactItems
+        ])
+        return {}
+
+
+def _encode_write(request: dict) -> dict:
+    if "PutRequest" in request:
+        return {"PutRequest": {"Item": encode_item(request["PutRequest"]["Item"])}}
+    return {"DeleteRequest": {"Key": encode_item(request["DeleteRequest"]["Key"])}}
+
+
+def _decode_write(request: dict) -> dict:
+    if "PutRequest" in request:
+        return {"PutRequest": {"Item": decode_item(request["PutRequest"]["Item"])}}
+    return {"DeleteRequest": {"Key": decode_item(request["DeleteRequest"]["Key"])}}
+
+
+def resource() -> Dynamo:
+    """프로세스 공용 Dynamo (저수준 클라이언트는 스레드 간 공유 가능, STORAGE_BACKEND=dynamo면 즉시 생성)"""
+    with _lock:
+        if _shared["resource"] is None:
+            _shared["resource"] = Dynamo()
+        db = _shared["resource"]
+    if os.environ.get("STORAGE_BACKEND", "dynamo").strip().lower() == "dynamo":
+        db.client
+    return db
@@ -0,0 +1,81 @@
+"""
+Lambda internal extension (응답을 반환한 뒤 같은 호출 안에서 후처리 실행)
+Extensions API에 INVOKE 이벤트로 등록하면 Lambda는 핸들러가 응답을 보낸 뒤에도
+확장 스레드가 다음 이벤트를 요청할 때까지 실행 환경을 멈추지 않음
+-> 클릭 로그 flush 같은 작업을 응답 지연 없이, 컨테이너가 멈추기 전에 끝낼 수 있음
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.request
+
+_API_VERSION = "2020-01-01"
+
+
+class PostResponseHook:
+    """호출마다 핸들러 종료(invocation_done) 후 callback을 실행하는 internal extension
+
+    start()는 init 단계(모듈 import 중)에 호출해야 등록됨 (Lambda 밖이거나 등록 실패 시 False)
+    """
+
+    def __init__(self, callback, name: str = "surl-post-response", runtime_api: str = None):
+        self._callback = callback
+        self._name = name
+        self._runtime_api = runtime_api if runtime_api is not None else os.environ.get("AWS_LAMBDA_RUNTIME_API")
+        self._extension_id = None
+        self._done = threading.Event()
+        self._thread = None
+
+    def _url(self, path: str) -> str:
+        return f"http://{self._runtime_api}/{_API_VERSION}/extension/{path}"
+
+    def start(self) -> bool:
+        if not self._runtime_api:
+            return False
+        try:
+            request = urllib.request.Request(
+                self._url("register"),
+                data=json.dumps({"events": ["INVOKE"]}).encode("utf-8"),
+                headers={"Lambda-Extension-Name": self._name},
+                method="POST",
+            )
+            with urllib.request.urlopen(request, timeout=2) as resp:
+                self._extension_id = resp.headers["Lambda-Extension-Identifier"]
+        except Exception as e:
+            print(f"DEBUG ERROR in PostResponseHook.start: {str(e)}")
+            return False
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+        return True
+
+    def invocation_done(self) -> None:
+        """핸들러가 응답을 반환하기 직전에 호출 -> 응답 후 callback 실행"""
+        self._done.set()
+
+    def _next_event(self) -> dict:
+        request = urllib.request.Request(
+            self._url("event/next"), headers={"Lambda-Extension-Identifier": self._extension_id},
+        )
+        # 다음 호출이 올 때까지 블로킹 (이 요청을 보내야 Lambda가 현재 호출을 끝난 것으로 처리)
+        with urllib.request.urlopen(request) as resp:
+            return json.loads(resp.read() or b"{}")
+
+    def _run(self) -> None:
+        while True:
+            try:
+                event = self._next_event()
+            except Exception as e:
+                print(f"DEBUG ERROR in PostResponseHook._next_event: {str(e)}")
+                return
+            if event.get("eventType") == "SHUTDOWN":
+                return
+            deadline_ms = event.get("deadlineMs")
+            timeout = max(0.0, deadline_ms / 1000 - time.time()) if deadline_ms else None
+            self._done.wait(timeout)
+            self._done.clear()
+            try:
+                self._callback()
+            except Exception as e:
+                print(f"DEBUG ERROR in PostResponseHook callback: {str(e)}")
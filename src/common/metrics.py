@@ -0,0 +1,52 @@
+"""
+CloudWatch Embedded Metric Format(EMF) 로그 출력
+print 한 줄로 지표를 남기면 CloudWatch가 로그에서 지표를 추출 (PutMetricData 호출 불필요)
+"""
+
+import json
+import time
+
+NAMESPACE = "Surl"
+
+
+def emit(metrics: dict, dimensions: dict = None, unit: str = "Count", namespace: str = NAMESPACE) -> None:
+    """지표 딕셔너리를 EMF 형식 로그 한 줄로 출력"""
+    dimensions = dimensions or {}
+    payload = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": namespace,
+                "Dimensions": [list(dimensions.keys())],
+                "Metrics": [{"Name": name, "Unit": unit} for name in metrics],
+            }],
+        },
+    }
+    payload.update(dimensions)
+    payload.update(metrics)
+    print(json.dumps(payload, ensure_ascii=False))
+
+
+class StageTimer:
+    """요청 처리 단계별 소요 시간(ms) 기록 (스레드에서 실행되는 단계도 기록 가능)"""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.timings = {}
+
+    def run(self, name: str, fn, *args, **kwargs):
+        """fn 실행 시간을 name 단계로 기록하고 결과 반환"""
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    def finish(self) -> dict:
+        """total 포함 전체 단계 시간 반환"""
+        self.timings["total"] = round((time.perf_counter() - self._start) * 1000, 2)
+        return dict(self.timings)
+
+    def server_timing(self) -> str:
+        """HTTP Server-Timing 헤더 값 (예: id;dur=12.1, ai;dur=803.4)"""
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.timings.items())
@@ -0,0 +1,37 @@
+"""
+DynamoDB 병렬 세그먼트 Scan (Segment/TotalSegments)
+세그먼트마다 별도 스레드에서 페이지를 순회하며 집계하고, 결과는 마지막에 병합
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def scan_pages(table, scan_kwargs: dict = None, segment: int = None, total_segments: int = None):
+    """Scan 결과를 페이지(Items 리스트) 단위로 순회하는 제너레이터"""
+    params = dict(scan_kwargs or {})
+    if total_segments and total_segments > 1:
+        params["Segment"] = segment
+        params["TotalSegments"] = total_segments
+    while True:
+        resp = table.scan(**params)
+        yield resp.get("Items", [])
+        if "LastEvaluatedKey" not in resp:
+            break
+        params["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def parallel_scan(make_table, total_segments: int, scan_kwargs: dict, aggregate, max_workers: int = None) -> list:
+    """total_segments개 세그먼트를 동시에 Scan하고 세그먼트별 aggregate(pages) 결과 리스트 반환
+
+    make_table: 스레드마다 호출되어 Table 객체를 돌려주는 함수 (boto3 resource는 스레드 간 공유 불가)
+    aggregate: 페이지 제너레이터를 받아 세그먼트 집계 결과를 반환하는 함수
+    """
+    total_segments = max(1, int(total_segments))
+
+    def run(segment):
+        return aggregate(scan_pages(make_table(), scan_kwargs, segment, total_segments))
+
+    if total_segments == 1:
+        return [run(0)]
+    with ThreadPoolExecutor(max_workers=max_workers or total_segments) as pool:
+        return list(pool.map(run, range(total_segments)))
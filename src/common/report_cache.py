@@ -0,0 +1,140 @@
+"""
+트렌드 AI 분석 결과 캐시 (윈도우 + 양자화된 카테고리 분포 지문)
+분포가 거의 같으면(총변동거리 <= max_shift) 직전 분석 문장을 재사용해 Bedrock 호출 생략
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+from common.cache import TTLCache
+
+
+def shares(stats: dict) -> dict:
+    """카테고리별 클릭 수 -> 비율"""
+    total = sum(stats.values())
+    if not total:
+        return {}
+    return {cat: n / total for cat, n in stats.items()}
+
+
+def fingerprint(stats: dict, quantum: float = 0.05) -> str:
+    """비율을 quantum 단위로 반올림한 분포 지문 (작은 변동은 같은 지문)"""
+    buckets = sorted(
+        (cat, round(share / quantum)) for cat, share in shares(stats).items()
+    )
+    buckets = [(cat, q) for cat, q in buckets if q]
+    return hashlib.sha256(json.dumps(buckets, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def distribution_shift(a: dict, b: dict) -> float:
+    """두 비율 분포의 총변동거리 (0 = 동일, 1 = 완전히 다름)"""
+    return 0.5 * sum(abs(a.get(cat, 0.0) - b.get(cat, 0.0)) for cat in set(a) | set(b))
+
+
+class TrendReportCache:
+    """2계층 트렌드 분석 캐시
+
+    exact 키: "fp#<분>#<지문>" / near 키: "last#<분>" (윈도우별 마지막 분석, 분포 비교 후 재사용)
+    dynamo: table_name이 주어진 경우에만 사용, item = {reportKey, text, shares(JSON), expiresAt}
+    """
+
+    def __init__(self, memory_size: int = 256, memory_ttl: float = 300.0,
+                 dynamo=None, table_name: str = None, table_ttl: float = 3600.0,
+                 quantum: float = 0.05, max_shift: float = 0.1):
+        self._memory = TTLCache(maxsize=memory_size, ttl=memory_ttl)
+        self._dynamo = dynamo
+        self._table_name = table_name
+        self.table_ttl = float(table_ttl)
+        self.quantum = float(quantum)
+        self.max_shift = float(max_shift)
+        self._lock = threading.Lock()
+        self.counts = {"memory_exact": 0, "memory_near": 0, "dynamo_exact": 0, "dynamo_near": 0, "miss": 0}
+
+    def _keys(self, minutes: int, stats: dict) -> tuple:
+        return f"fp#{minutes}#{fingerprint(stats, self.quantum)}", f"last#{minutes}"
+
+    def _count(self, tier: str) -> None:
+        with self._lock:
+            self.counts[tier] += 1
+
+    def _is_near(self, entry, current: dict) -> bool:
+        return entry is not None and distribution_shift(entry["shares"], current) <= self.max_shift
+
+    def get(self, minutes: int, stats: dict):
+        """(분석 문장, 적중 계층) 반환, 없으면 (None, "miss")"""
+        exact_key, near_key = self._keys(minutes, stats)
+        current = shares(stats)
+
+        hit = self._memory.get(exact_key)
+        if hit is not None:
+            self._count("memory_exact")
+            return hit["text"], "memory_exact"
+        hit = self._memory.get(near_key)
+        if self._is_near(hit, current):
+            self._count("memory_near")
+            return hit["text"], "memory_near"
+
+        if self._table_name:
+            items = self._read_table([exact_key, near_key])
+            if exact_key in items:
+                self._memory.set(exact_key, items[exact_key])
+                self._count("dynamo_exact")
+                return items[exact_key]["text"], "dynamo_exact"
+            if self._is_near(items.get(near_key), current):
+                self._memory.set(near_key, items[near_key])
+                self._count("dynamo_near")
+                return items[near_key]["text"], "dynamo_near"
+
+        self._count("miss")
+        return None, "miss"
+
+    def put(self, minutes: int, stats: dict, text: str) -> None:
+        """새로 계산한 분석 문장을 exact/near 키로 저장"""
+        entry = {"text": text, "shares": shares(stats)}
+        exact_key, near_key = self._keys(minutes, stats)
+        self._memory.set(exact_key, entry)
+        self._memory.set(near_key, entry)
+        if self._table_name:
+            self._write_table({exact_key: entry, near_key: entry})
+
+    def _read_table(self, keys: list) -> dict:
+        try:
+            resp = self._dynamo.batch_get_item(RequestItems={
+                self._table_name: {"Keys": [{"reportKey": k} for k in keys]},
+            })
+            now = int(time.time())
+            found = {}
+            for item in resp.get("Responses", {}).get(self._table_name, []):
+                # DynamoDB TTL 삭제는 지연되므로 만료 여부를 직접 확인
+                if int(item.get("expiresAt", 0)) > now:
+                    found[item["reportKey"]] = {"text": item["text"], "shares": json.loads(item["shares"])}
+            return found
+        except Exception as e:
+            print(f"DEBUG ERROR in TrendReportCache._read_table: {str(e)}")
+            return {}
+
+    def _write_table(self, entries: dict) -> None:
+        expires_at = int(time.time() + self.table_ttl)
+        try:
+            # 비율은 float이므로 Decimal 변환 없이 JSON 문자열로 저장
+            self._dynamo.batch_write_item(RequestItems={
+                self._table_name: [
+                    {"PutRequest": {"Item": {
+                        "reportKey": k, "text": v["text"],
+                        "shares": json.dumps(v["shares"], ensure_ascii=False), "expiresAt": expires_at,
+                    }}}
+                    for k, v in entries.items()
+                ],
+            })
+        except Exception as e:
+            print(f"DEBUG ERROR in TrendReportCache._write_table: {str(e)}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+        total = sum(counts.values())
+        hits = total - counts["miss"]
+        counts["hitRate"] = round(hits / total, 4) if total else 0.0
+        return counts
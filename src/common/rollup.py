@@ -0,0 +1,217 @@
+"""
+분 단위 카테고리 클릭 집계(rollup)
+항목 형식: {day: "YYYY-MM-DD", slot: "HH:MM#카테고리", clicks: N}
+하루가 파티션 1개이므로 최대 윈도우(7일)도 Query 8회 이내로 합산
+
+시간 단위 스케치(고유 방문자 / 인기 링크)는 {hour: "YYYY-MM-DDTHH", version, ...} 항목에 병합
+스트림 배치 token을 넘기면 DynamoDB 항목에 반영한 token을 함께 기록해 같은 배치의 재시도를 무시
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from common.buckets import hour_of
+from common.sketch import ClickSketch
+
+# 스케치 항목에 남겨 두는 최근 배치 token 수 (스트림 재시도는 같은 배치를 곧바로 다시 보내므로 최근 것만 확인)
+RECENT_BATCHES = 64
+
+
+def _is_conditional_failure(e: Exception) -> bool:
+    return getattr(e, "response", {}).get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
+def slot_of(timestamp: str, category: str) -> tuple:
+    """ISO 타임스탬프 + 카테고리 -> (day, slot)"""
+    return timestamp[:10], f"{timestamp[11:16]}#{category}"
+
+
+def accumulate(clicks) -> dict:
+    """클릭 로그(timestamp, category) 묶음을 (day, slot) -> 클릭 수로 사전 집계"""
+    increments = {}
+    for click in clicks:
+        key = slot_of(click["timestamp"], click.get("category") or "기타")
+        increments[key] = increments.get(key, 0) + 1
+    return increments
+
+
+def window_days(since: datetime, until: datetime = None) -> list:
+    """구간에 걸친 day 파티션 목록 (오래된 순)"""
+    until = until or datetime.now(timezone.utc)
+    day = since.astimezone(timezone.utc).date()
+    days = []
+    while day <= until.date():
+        days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+
+def split_slot(slot: str) -> tuple:
+    """slot -> (HH:MM, 카테고리)"""
+    minute, _, category = slot.partition("#")
+    return minute, category
+
+
+class DynamoRollupStore:
+    """DynamoDB rollup 테이블 (update_item ADD로 증분 반영)
+
+    token이 있으면 행마다 반영한 배치 token 집합(batches)에 조건부로 추가하며 ADD
+    -> 중간에 실패한 배치를 재시도해도 이미 반영된 행은 건너뜀 (분 버킷 행이라 집합 크기는 분당 배치 수)
+    """
+
+    def __init__(self, table):
+        self._table = table
+
+    def apply(self, increments: dict, token: str = None) -> None:
+        for (day, slot), count in increments.items():
+            params = {
+                "Key": {"day": day, "slot": slot},
+                "UpdateExpression": "ADD clicks :n",
+                "ExpressionAttributeValues": {":n": count},
+            }
+            if token:
+                params["UpdateExpression"] = "ADD clicks :n, batches :t"
+                params["ConditionExpression"] = "NOT contains(batches, :id)"
+                params["ExpressionAttributeValues"].update({":t": {token}, ":id": token})
+            try:
+                self._table.update_item(**params)
+            except Exception as e:
+                if not (token and _is_conditional_failure(e)):
+                    raise
+
+    def iter_window(self, since: datetime):
+        """since 이후 분 버킷의 (day, HH:MM, 카테고리, 클릭 수) 순회"""
+        since = since.astimezone(timezone.utc)
+        first_day, first_minute = since.date().isoformat(), since.strftime("%H:%M")
+        for day in window_days(since):
+            params = {
+                "KeyConditionExpression": "#d = :d",
+                "ProjectionExpression": "slot, clicks",
+                "ExpressionAttributeNames": {"#d": "day"},
+                "ExpressionAttributeValues": {":d": day},
+            }
+            if day == first_day:
+                params["KeyConditionExpression"] = "#d = :d AND slot >= :from"
+                params["ExpressionAttributeValues"][":from"] = first_minute
+            while True:
+                resp = self._table.query(**params)
+                for item in resp.get("Items", []):
+                    minute, category = split_slot(item["slot"])
+                    yield day, minute, category, int(item.get("clicks", 0))
+                if "LastEvaluatedKey" not in resp:
+                    break
+                params["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+class MemoryRollupStore:
+    """rollup 테이블 로컬 대역 (프로세스 내 dict)"""
+
+    def __init__(self):
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def apply(self, increments: dict) -> None:
+        with self._lock:
+            for key, count in increments.items():
+                self._rows[key] = self._rows.get(key, 0) + count
+
+    def iter_window(self, since: datetime):
+        since = since.astimezone(timezone.utc)
+        first_day, first_minute = since.date().isoformat(), since.strftime("%H:%M")
+        with self._lock:
+            rows = sorted(self._rows.items())
+        for (day, slot), count in rows:
+            minute, category = split_slot(slot)
+            if day < first_day or (day == first_day and minute < first_minute):
+                continue
+            yield day, minute, category, count
+
+
+def sketch_clicks(clicks) -> dict:
+    """클릭 로그(timestamp, ip, category, shortCode) 묶음 -> 시간 버킷별 ClickSketch"""
+    sketches = {}
+    for click in clicks:
+        hour = hour_of(click["timestamp"])
+        if hour not in sketches:
+            sketches[hour] = ClickSketch()
+        sketches[hour].add(click.get("ip") or "unknown", click.get("category") or "기타", click.get("shortCode") or "")
+    return sketches
+
+
+class DynamoSketchStore:
+    """DynamoDB 시간 버킷 스케치 테이블 (version 조건부 쓰기로 동시 병합 충돌 시 재시도)
+
+    token이 있으면 최근 RECENT_BATCHES개 배치 token을 항목에 같이 저장하고, 이미 있는 token이면 병합 생략
+    (Count-Min 병합은 덧셈이라 같은 배치를 두 번 병합하면 인기 링크 클릭 수가 두 배가 됨)
+    """
+
+    def __init__(self, table, dynamo=None, max_retries: int = 5):
+        self._table = table
+        self._dynamo = dynamo
+        self.max_retries = max_retries
+
+    def merge(self, hour: str, sketch: ClickSketch, token: str = None) -> None:
+        for _ in range(self.max_retries):
+            item = self._table.get_item(Key={"hour": hour}, ConsistentRead=True).get("Item")
+            batches = list(item.get("batches", [])) if item else []
+            if token and token in batches:
+                return
+            current = ClickSketch.from_item(item) if item else ClickSketch()
+            current.merge(sketch)
+            version = int(item["version"]) if item else 0
+            params = {"Item": {"hour": hour, "version": version + 1, **current.to_item()}}
+            if token:
+                params["Item"]["batches"] = (batches + [token])[-RECENT_BATCHES:]
+            if item:
+                params["ConditionExpression"] = "version = :v"
+                params["ExpressionAttributeValues"] = {":v": version}
+            else:
+                params["ConditionExpression"] = "attribute_not_exists(#h)"
+                params["ExpressionAttributeNames"] = {"#h": "hour"}
+            try:
+                self._table.put_item(**params)
+                return
+            except Exception as e:
+                if not _is_conditional_failure(e):
+                    raise
+        raise RuntimeError(f"sketch merge for {hour} kept conflicting after {self.max_retries} attempts")
+
+    def read(self, hours: list) -> ClickSketch:
+        """시간 버킷 스케치들을 batch_get_item(100개 단위)으로 읽어 하나로 병합"""
+        merged = ClickSketch()
+        name = self._table.name
+        for start in range(0, len(hours), 100):
+            request = {name: {"Keys": [{"hour": h} for h in hours[start:start + 100]]}}
+            while request:
+                resp = self._dynamo.batch_get_item(RequestItems=request)
+                for item in resp.get("Responses", {}).get(name, []):
+                    merged.merge(ClickSketch.from_item(item))
+                request = resp.get("UnprocessedKeys") or None
+        return merged
+
+
+class MemorySketchStore:
+    """스케치 테이블 로컬 대역 (프로세스 내 dict)"""
+
+    def __init__(self):
+        self._sketches = {}
+        self._tokens = set()
+        self._lock = threading.Lock()
+
+    def merge(self, hour: str, sketch: ClickSketch, token: str = None) -> None:
+        with self._lock:
+            if token:
+                if (hour, token) in self._tokens:
+                    return
+                self._tokens.add((hour, token))
+            if hour not in self._sketches:
+                self._sketches[hour] = ClickSketch()
+            self._sketches[hour].merge(sketch)
+
+    def read(self, hours: list) -> ClickSketch:
+        merged = ClickSketch()
+        with self._lock:
+            for hour in hours:
+                if hour in self._sketches:
+                    merged.merge(self._sketches[hour])
+        return merged
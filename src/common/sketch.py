@@ -0,0 +1,227 @@
+"""
+병합 가능한 근사 집계 스케치
+HyperLogLog: 고유 방문자(IP) 수 (UniqueCounter: 적을 때는 정확한 set) / Count-Min + 후보 집합: 클릭 상위 K개 shortCode
+모두 고정 크기 메모리이며 같은 설정끼리 merge로 합칠 수 있음 (시간 버킷 -> 윈도우 합산)
+"""
+
+import hashlib
+import json
+import math
+from array import array
+
+# 카테고리별 HLL 개수 상한 (p=11이면 HLL 1개 2KB, Count-Min 16KB와 합쳐 DynamoDB 항목 400KB 미만 유지)
+# AI가 자유 형식 카테고리를 내놓아도 상한을 넘는 카테고리는 OVERFLOW_CATEGORY 하나로 합침
+MAX_CATEGORY_HLLS = 64
+OVERFLOW_CATEGORY = "기타"
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _raw(value) -> bytes:
+    """DynamoDB Binary(boto3) / bytes 모두 bytes로 변환"""
+    return bytes(getattr(value, "value", value))
+
+
+class HyperLogLog:
+    """고유 원소 수 추정 (표준 오차 약 1.04 / sqrt(2^p), p=11이면 약 2.3%, 2KB)"""
+
+    def __init__(self, p: int = 11, registers: bytes = None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(registers) if registers else bytearray(self.m)
+        if len(self.registers) != self.m:
+            raise ValueError("register size does not match precision")
+
+    def add(self, value: str) -> None:
+        h = _hash64(value)
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        # 작은 구간은 선형 카운팅으로 보정
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.p != self.p:
+            raise ValueError("cannot merge HyperLogLog with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data, p: int = 11) -> "HyperLogLog":
+        return cls(p, _raw(data))
+
+
+class UniqueCounter:
+    """고유 원소 수 (threshold개까지는 정확한 set, 넘으면 HyperLogLog로 전환해 메모리 고정)"""
+
+    def __init__(self, threshold: int = 10000, p: int = 11):
+        self.threshold = threshold
+        self.p = p
+        self._values = set()
+        self._hll = None
+
+    @property
+    def exact(self) -> bool:
+        return self._hll is None
+
+    def add(self, value: str) -> None:
+        if self._hll is not None:
+            self._hll.add(value)
+            return
+        self._values.add(value)
+        if len(self._values) > self.threshold:
+            self._hll = HyperLogLog(self.p)
+            for v in self._values:
+                self._hll.add(v)
+            self._values = set()
+
+    def count(self) -> int:
+        return len(self._values) if self._hll is None else self._hll.count()
+
+
+class CountMinSketch:
+    """원소별 빈도 추정 (과대 추정만 발생, 오차 <= 총합 * e / width 확률 1 - e^-depth)"""
+
+    def __init__(self, width: int = 1024, depth: int = 4, counts: bytes = None):
+        self.width = width
+        self.depth = depth
+        self.counts = array("I")
+        if counts:
+            self.counts.frombytes(_raw(counts))
+        else:
+            self.counts.extend([0] * (width * depth))
+        if len(self.counts) != width * depth:
+            raise ValueError("counter size does not match width * depth")
+
+    def _cells(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+        for row in range(self.depth):
+            yield row * self.width + (h1 + row * h2) % self.width
+
+    def add(self, key: str, n: int = 1) -> None:
+        for cell in self._cells(key):
+            self.counts[cell] += n
+
+    def estimate(self, key: str) -> int:
+        return min(self.counts[cell] for cell in self._cells(key))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("cannot merge CountMinSketch with different shape")
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+
+    def to_bytes(self) -> bytes:
+        return self.counts.tobytes()
+
+
+class HeavyHitters:
+    """Count-Min 빈도 추정 + 상위 k개 후보 집합으로 인기 원소 추적"""
+
+    def __init__(self, k: int = 20, width: int = 1024, depth: int = 4):
+        self.k = k
+        self.cms = CountMinSketch(width, depth)
+        self.candidates = {}
+
+    def add(self, key: str, n: int = 1) -> None:
+        self.cms.add(key, n)
+        estimate = self.cms.estimate(key)
+        if key in self.candidates or len(self.candidates) < self.k:
+            self.candidates[key] = estimate
+            return
+        weakest = min(self.candidates, key=self.candidates.get)
+        if estimate > self.candidates[weakest]:
+            del self.candidates[weakest]
+            self.candidates[key] = estimate
+
+    def _trim(self) -> None:
+        ranked = sorted(self.candidates, key=self.candidates.get, reverse=True)
+        self.candidates = {key: self.candidates[key] for key in ranked[:self.k]}
+
+    def merge(self, other: "HeavyHitters") -> None:
+        self.cms.merge(other.cms)
+        keys = set(self.candidates) | set(other.candidates)
+        self.candidates = {key: self.cms.estimate(key) for key in keys}
+        self._trim()
+
+    def top(self, limit: int = None) -> list:
+        """[(원소, 추정 빈도)] 빈도 내림차순"""
+        ranked = sorted(((key, self.cms.estimate(key)) for key in self.candidates), key=lambda kv: (-kv[1], kv[0]))
+        return ranked[:limit or self.k]
+
+
+class ClickSketch:
+    """시간 버킷 1개의 클릭 스케치 (전체/카테고리별 고유 IP + 인기 shortCode)
+
+    카테고리별 HLL은 max_categories개까지 (그 뒤 새 카테고리는 OVERFLOW_CATEGORY에 합산)
+    """
+
+    def __init__(self, p: int = 11, k: int = 20, width: int = 1024, depth: int = 4,
+                 max_categories: int = MAX_CATEGORY_HLLS):
+        self.p = p
+        self.max_categories = max_categories
+        self.visitors = HyperLogLog(p)
+        self.category_visitors = {}
+        self.links = HeavyHitters(k, width, depth)
+
+    def _category_hll(self, category: str) -> HyperLogLog:
+        if category not in self.category_visitors:
+            if len(self.category_visitors) >= self.max_categories:
+                category = OVERFLOW_CATEGORY
+            if category not in self.category_visitors:
+                self.category_visitors[category] = HyperLogLog(self.p)
+        return self.category_visitors[category]
+
+    def add(self, ip: str, category: str, short_code: str) -> None:
+        self.visitors.add(ip)
+        self._category_hll(category).add(ip)
+        self.links.add(short_code)
+
+    def merge(self, other: "ClickSketch") -> None:
+        self.visitors.merge(other.visitors)
+        for category, hll in other.category_visitors.items():
+            self._category_hll(category).merge(hll)
+        self.links.merge(other.links)
+
+    def summary(self, limit: int = 10) -> dict:
+        return {
+            "uniqueVisitors": self.visitors.count(),
+            "uniqueVisitorsByCategory": {cat: hll.count() for cat, hll in sorted(self.category_visitors.items())},
+            "topLinks": [{"shortCode": code, "clicks": n} for code, n in self.links.top(limit)],
+        }
+
+    def to_item(self) -> dict:
+        """DynamoDB 항목 속성 (Binary + 후보 목록 JSON)"""
+        return {
+            "visitors": self.visitors.to_bytes(),
+            "categoryVisitors": {cat: hll.to_bytes() for cat, hll in self.category_visitors.items()},
+            "linkCounts": self.links.cms.to_bytes(),
+            "linkCandidates": json.dumps(sorted(self.links.candidates), ensure_ascii=False),
+        }
+
+    @classmethod
+    def from_item(cls, item: dict, p: int = 11, k: int = 20, width: int = 1024, depth: int = 4) -> "ClickSketch":
+        sketch = cls(p, k, width, depth)
+        sketch.visitors = HyperLogLog.from_bytes(item["visitors"], p)
+        for cat, data in item.get("categoryVisitors", {}).items():
+            sketch._category_hll(cat).merge(HyperLogLog.from_bytes(data, p))
+        sketch.links.cms = CountMinSketch(width, depth, item["linkCounts"])
+        sketch.links.candidates = {
+            code: sketch.links.cms.estimate(code) for code in json.loads(item.get("linkCandidates", "[]"))
+        }
+        return sketch
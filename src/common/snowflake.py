@@ -0,0 +1,82 @@
+"""
+Snowflake 방식 ID 생성기 (카운터 테이블 없이 컨테이너 내부에서 ID 생성)
+[41bit 타임스탬프(ms, EPOCH_MS 기준)][10bit worker id][12bit sequence]
+"""
+
+import os
+import secrets
+import threading
+import time
+
+EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z
+TIMESTAMP_BITS = 41
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+WORKER_SHIFT = SEQUENCE_BITS
+TIMESTAMP_SHIFT = SEQUENCE_BITS + WORKER_BITS
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def default_worker_id() -> int:
+    """WORKER_ID 환경변수 우선, 없으면 컨테이너마다 무작위 worker id"""
+    value = os.environ.get("WORKER_ID")
+    if value:
+        return int(value) & MAX_WORKER_ID
+    return secrets.randbelow(MAX_WORKER_ID + 1)
+
+
+def compose(timestamp_ms: int, worker_id: int, sequence: int, epoch_ms: int = EPOCH_MS) -> int:
+    return ((timestamp_ms - epoch_ms) << TIMESTAMP_SHIFT) | (worker_id << WORKER_SHIFT) | sequence
+
+
+def parse(snowflake_id: int, epoch_ms: int = EPOCH_MS) -> dict:
+    """ID -> 구성 요소(timestamp_ms, worker_id, sequence)"""
+    return {
+        "timestamp_ms": (snowflake_id >> TIMESTAMP_SHIFT) + epoch_ms,
+        "worker_id": (snowflake_id >> WORKER_SHIFT) & MAX_WORKER_ID,
+        "sequence": snowflake_id & MAX_SEQUENCE,
+    }
+
+
+def max_id_at(timestamp_ms: int, epoch_ms: int = EPOCH_MS) -> int:
+    """해당 시각까지 생성될 수 있는 가장 큰 ID (발급 여부 범위 판별용)"""
+    return compose(timestamp_ms, MAX_WORKER_ID, MAX_SEQUENCE, epoch_ms)
+
+
+class SnowflakeGenerator:
+    """스레드 안전 Snowflake ID 생성기
+
+    같은 밀리초 안에서는 sequence를 증가시키고, 4096개를 넘으면 다음 밀리초까지 대기
+    시계가 뒤로 가면 마지막 타임스탬프를 계속 사용하여 단조 증가를 유지
+    """
+
+    def __init__(self, worker_id: int = None, epoch_ms: int = EPOCH_MS, clock=_now_ms):
+        if worker_id is None:
+            worker_id = default_worker_id()
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be in 0..{MAX_WORKER_ID}")
+        self.worker_id = worker_id
+        self.epoch_ms = epoch_ms
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_id(self) -> int:
+        with self._lock:
+            now = max(self._clock(), self._last_ms)
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    while now <= self._last_ms:
+                        now = self._clock()
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return compose(now, self.worker_id, self._sequence, self.epoch_ms)
@@ -0,0 +1,48 @@
+"""
+저장소 계층 (매핑 / URL 인덱스 / ID 카운터 / 클릭 로그 / rollup)
+STORAGE_BACKEND: dynamo(기본, 배포 환경) | sqlite(STORAGE_SQLITE_PATH 파일) | memory(프로세스 내)
+같은 핸들러 코드를 AWS 없이 로컬 실행 / 벤치마크 / 부하 테스트할 수 있도록 백엔드를 분리
+"""
+
+import os
+import threading
+
+from common.storage.base import COUNTER_KEY, Conflict, Storage
+
+__all__ = ["COUNTER_KEY", "Conflict", "Storage", "create", "from_env"]
+
+_lock = threading.Lock()
+_shared = {}
+
+
+def create(backend: str, path: str = None) -> Storage:
+    """백엔드 이름으로 저장소 생성 (sqlite3 / boto3는 해당 백엔드를 쓸 때만 import)"""
+    backend = (backend or "dynamo").strip().lower()
+    if backend == "memory":
+        from common.storage.memory import MemoryStorage
+        return MemoryStorage()
+    if backend == "sqlite":
+        from common.storage.sqlite import SqliteStorage
+        return SqliteStorage(path or os.environ.get("STORAGE_SQLITE_PATH", "surl_local.db"))
+    if backend == "dynamo":
+        from common import dynamo
+        from common.storage.dynamo import DynamoStorage
+        return DynamoStorage(
+            dynamo.resource(),
+            mapping_table=os.environ.get("MAPPING_TABLE_NAME", "SurlMappingTable").strip(),
+            counter_table=os.environ.get("COUNTER_TABLE_NAME", "SurlCounter").strip(),
+            url_index_table=os.environ.get("URL_INDEX_TABLE_NAME", "SurlUrlIndexTable").strip(),
+            log_table=os.environ.get("LOG_TABLE_NAME", "SurlClickLogsTable").strip(),
+            rollup_table=os.environ.get("ROLLUP_TABLE_NAME", "SurlClickRollupTable").strip(),
+            bucket_shards=int(os.environ.get("CLICK_BUCKET_SHARDS", "1")),
+        )
+    raise ValueError(f"unknown storage backend: {backend}")
+
+
+def from_env() -> Storage:
+    """프로세스 공용 저장소 (같은 프로세스의 핸들러끼리 공유, memory 백엔드도 데이터가 이어짐)"""
+    backend = os.environ.get("STORAGE_BACKEND", "dynamo").strip().lower()
+    with _lock:
+        if backend not in _shared:
+            _shared[backend] = create(backend)
+        return _shared[backend]
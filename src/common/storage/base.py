@@ -0,0 +1,139 @@
+"""
+저장소 인터페이스 (매핑 / URL 인덱스 / ID 카운터 / 클릭 로그 / rollup)
+핸들러는 이 메서드만 사용하고, 백엔드(DynamoDB / SQLite / 메모리)는 환경 변수로 선택
+항목은 DynamoDB 속성 이름 그대로의 dict (shortCode, originalUrl, category, summary, createdAt 등)
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+COUNTER_KEY = "surl_id"
+# map_click_pages / iter_click_pages 페이지 크기 (DynamoDB 1MB 페이지에 해당하는 대략적인 항목 수)
+PAGE_SIZE = 1000
+
+
+class Conflict(Exception):
+    """조건부 쓰기 충돌 (이미 있는 shortCode 저장 / 없는 매핑 갱신)
+
+    existing: 저장 충돌 시 이미 있던 항목 (백엔드가 알려 준 경우)
+    """
+
+    def __init__(self, key: str, existing: dict = None):
+        super().__init__(key)
+        self.existing = existing
+
+
+class Storage(ABC):
+    """백엔드 공통 인터페이스
+
+    조회 결과의 timestamp는 ISO 문자열, 숫자는 int로 반환
+    클릭 로그를 저장하면 백엔드에 따라 rollup 반영 방식이 다름
+    (DynamoDB: 스트림 소비 람다가 반영 / SQLite, 메모리: put_clicks 안에서 즉시 반영)
+    put_click / map_click_pages 외의 메서드는 백엔드가 모두 구현해야 인스턴스화 가능
+    """
+
+    # --- 매핑 ---
+    @abstractmethod
+    def get_mapping(self, short_code: str, attributes: tuple = None):
+        """shortCode 매핑 (없으면 None, attributes가 있으면 해당 속성만)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_mappings(self, short_codes: list, attributes: tuple = None) -> dict:
+        """여러 매핑 일괄 조회, shortCode -> item (없는 코드는 제외)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def put_mapping(self, item: dict) -> None:
+        """매핑 저장 (같은 shortCode가 이미 있으면 기존 항목을 담은 Conflict)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def put_mappings(self, items: list) -> list:
+        """매핑 일괄 저장 (이미 있는 shortCode는 덮어쓰지 않음), 충돌 / 최종 실패 항목(입력 dict 그대로) 반환"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_mapping(self, short_code: str, fields: dict) -> None:
+        """기존 매핑의 일부 속성 갱신 (매핑이 없으면 Conflict)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_short_codes(self):
+        """저장된 전체 shortCode 순회 (redirect Bloom 필터 구성용)"""
+        raise NotImplementedError
+
+    # --- URL 인덱스 (중복 생성 방지) ---
+    @abstractmethod
+    def get_url_codes(self, url_hashes: list) -> dict:
+        """urlHash -> shortCode (인덱스에 없는 해시는 제외)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def put_url_index(self, url_hash: str, short_code: str, created_at: str) -> bool:
+        """인덱스 저장 (이미 있으면 먼저 저장된 코드를 유지하고 False)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def put_url_indexes(self, items: list) -> list:
+        """{urlHash, shortCode, createdAt} 일괄 저장 (이미 있는 urlHash는 기존 코드 유지), 최종 실패 항목 반환"""
+        raise NotImplementedError
+
+    # --- ID 카운터 ---
+    @abstractmethod
+    def reserve_ids(self, count: int) -> int:
+        """카운터를 count만큼 원자적으로 증가시키고 증가 후 값(예약한 마지막 ID) 반환"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def read_counter(self) -> int:
+        """지금까지 예약된 마지막 ID (없으면 0)"""
+        raise NotImplementedError
+
+    # --- 클릭 로그 ---
+    def put_click(self, item: dict) -> None:
+        self.put_clicks([item])
+
+    @abstractmethod
+    def put_clicks(self, items: list) -> list:
+        """클릭 로그 일괄 저장 (같은 shortCode/timestamp는 덮어쓰기), 최종 실패 항목 반환"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_click_pages(self, since: datetime, mode: str = "query"):
+        """since 이후 클릭 로그({timestamp, category})를 페이지 단위로 순회
+
+        mode는 DynamoDB 조회 방식(query: hourBucket GSI, scan: 전체 Scan), 다른 백엔드는 무시
+        """
+        raise NotImplementedError
+
+    def map_click_pages(self, since: datetime, aggregate, mode: str = "query", segments: int = 1) -> list:
+        """파티션(DynamoDB 병렬 Scan 세그먼트)별 aggregate(pages) 결과 리스트 (기본: 파티션 1개)"""
+        return [aggregate(self.iter_click_pages(since, mode))]
+
+    @abstractmethod
+    def iter_link_click_pages(self, short_code: str, since: str, until: str):
+        """shortCode 하나의 [since, until] 구간 클릭 로그({timestamp, ip})를 페이지 단위로 순회"""
+        raise NotImplementedError
+
+    # --- rollup ---
+    @abstractmethod
+    def apply_rollup(self, increments: dict, token: str = None) -> None:
+        """(day, slot) -> 클릭 수 증분 반영
+
+        token: 스트림 배치 식별자 (DynamoDB는 같은 token의 재반영을 행 단위로 무시,
+        스트림 재시도가 없는 로컬 백엔드는 무시)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_rollup(self, since: datetime):
+        """since 이후 분 버킷의 (day, HH:MM, 카테고리, 클릭 수) 순회"""
+        raise NotImplementedError
+
+
+def project(item: dict, attributes: tuple = None) -> dict:
+    """attributes에 있는 속성만 남긴 사본 (None이면 전체)"""
+    if attributes is None:
+        return dict(item)
+    return {k: item[k] for k in attributes if k in item}
@@ -0,0 +1,276 @@
+"""
+DynamoDB 저장소 백엔드 (배포 환경 기본값)
+매핑 / URL 인덱스 / 카운터 / 클릭 로그 / rollup 테이블을 common.dynamo 접근 계층으로 사용
+"""
+
+from datetime import datetime
+
+from common.dynamo import decode_item
+from common.buckets import HOUR_BUCKET_INDEX, window_buckets
+from common.parallel_scan import parallel_scan, scan_pages
+from common.rollup import DynamoRollupStore
+from common.storage.base import COUNTER_KEY, Conflict, Storage
+from common.write_behind import batch_put
+
+_BATCH_GET_LIMIT = 100
+_TRANSACT_LIMIT = 100
+_TRANSACT_ATTEMPTS = 3
+_CLICK_PROJECTION = "#ts, #cat"
+
+
+def _is_conflict(error: Exception) -> bool:
+    """botocore ClientError의 ConditionalCheckFailed 여부 (botocore를 import하지 않고 응답 속성으로 판별)"""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+    return response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
+def _cancellation_codes(error: Exception):
+    """TransactionCanceledException의 항목별 취소 사유 코드 목록 (다른 오류면 None)"""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict) or response.get("Error", {}).get("Code") != "TransactionCanceledException":
+        return None
+    return [reason.get("Code") for reason in response.get("CancellationReasons", [])]
+
+
+def _projection(attributes: tuple) -> dict:
+    """속성 목록 -> ProjectionExpression 파라미터 (예약어 충돌을 피하려고 항상 이름 치환 사용)"""
+    if not attributes:
+        return {}
+    names = {f"#p{i}": name for i, name in enumerate(attributes)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+
+class DynamoStorage(Storage):
+    def __init__(self, dynamo, mapping_table: str, counter_table: str, url_index_table: str,
+                 log_table: str, rollup_table: str, bucket_shards: int = 1):
+        self._dynamo = dynamo
+        self.mapping_table = mapping_table
+        self.counter_table = counter_table
+        self.url_index_table = url_index_table
+        self.log_table = log_table
+        self.rollup_table = rollup_table
+        # hourBucket GSI 쓰기 분산용 샤드 수 (클릭 로그 저장 시 redirect가 같은 값으로 기록)
+        self.bucket_shards = max(1, int(bucket_shards))
+
+    def _table(self, name: str):
+        if not name:
+            raise RuntimeError("Server configuration error")
+        return self._dynamo.Table(name)
+
+    def _batch_get(self, table_name: str, key_name: str, keys: list, attributes: tuple = None) -> dict:
+        """batch_get_item으로 100건씩 조회 (UnprocessedKeys 재시도), key 값 -> item"""
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        if attributes:
+            attributes = tuple(dict.fromkeys((key_name, *attributes)))
+        for start in range(0, len(unique), _BATCH_GET_LIMIT):
+            spec = {"Keys": [{key_name: k} for k in unique[start:start + _BATCH_GET_LIMIT]], **_projection(attributes)}
+            request = {table_name: spec}
+            for _ in range(5):
+                resp = self._dynamo.batch_get_item(RequestItems=request)
+                for item in resp.get("Responses", {}).get(table_name, []):
+                    found[item[key_name]] = item
+                request = resp.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+        return found
+
+    # --- 매핑 ---
+    def get_mapping(self, short_code: str, attributes: tuple = None):
+        resp = self._table(self.mapping_table).get_item(Key={"shortCode": short_code}, **_projection(attributes))
+        return resp.get("Item")
+
+    def get_mappings(self, short_codes: list, attributes: tuple = None) -> dict:
+        if not short_codes:
+            return {}
+        return self._batch_get(self._table(self.mapping_table).name, "shortCode", short_codes, attributes)
+
+    def put_mapping(self, item: dict) -> None:
+        try:
+            self._table(self.mapping_table).put_item(
+                Item=item,
+                ConditionExpression="attribute_not_exists(shortCode)",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+        except Exception as e:
+            if _is_conflict(e):
+                old = e.response.get("Item")
+                raise Conflict(item["shortCode"], decode_item(old) if old else None) from e
+            raise
+
+    def _transact_put_new(self, table_name: str, key_name: str, items: list, label: str) -> tuple:
+        """TransactWriteItems(attribute_not_exists 조건부 Put)로 100건씩 저장, (이미 있던 항목, 저장 실패 항목) 반환
+
+        트랜잭션이 취소되면 CancellationReasons로 충돌 항목만 골라내고 나머지를 다시 저장
+        """
+        existing, failed = [], []
+        for start in range(0, len(items), _TRANSACT_LIMIT):
+            pending = items[start:start + _TRANSACT_LIMIT]
+            for _ in range(_TRANSACT_ATTEMPTS):
+                try:
+                    self._dynamo.transact_write_items(TransactItems=[
+                        {"Put": {"TableName": table_name, "Item": item,
+                                 "ConditionExpression": f"attribute_not_exists({key_name})"}}
+                        for item in pending
+                    ])
+                    pending = []
+                    break
+                except Exception as e:
+                    reasons = _cancellation_codes(e)
+                    if reasons is None or len(reasons) != len(pending):
+                        print(f"DEBUG ERROR in {label}: {str(e)}")
+                        break
+                    existing.extend(item for item, code in zip(pending, reasons) if code == "ConditionalCheckFailed")
+                    pending = [item for item, code in zip(pending, reasons) if code != "ConditionalCheckFailed"]
+                    if not pending:
+                        break
+            failed.extend(pending)
+        return existing, failed
+
+    def put_mappings(self, items: list) -> list:
+        """조건부 트랜잭션으로 저장 (충돌 항목도 실패로 반환)
+
+        batch_write_item은 조건을 걸 수 없어 snowflake worker id 충돌 시 기존 링크를 덮어쓰므로 사용하지 않음
+        """
+        existing, failed = self._transact_put_new(
+            self._table(self.mapping_table).name, "shortCode", items, "put_mappings",
+        )
+        return existing + failed
+
+    def update_mapping(self, short_code: str, fields: dict) -> None:
+        names = {f"#f{i}": name for i, name in enumerate(fields)}
+        values = {f":v{i}": value for i, value in enumerate(fields.values())}
+        try:
+            self._table(self.mapping_table).update_item(
+                Key={"shortCode": short_code},
+                UpdateExpression="SET " + ", ".join(f"{n} = {v}" for n, v in zip(names, values)),
+                ConditionExpression="attribute_exists(shortCode)",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+        except Exception as e:
+            if _is_conflict(e):
+                raise Conflict(short_code) from e
+            raise
+
+    def iter_short_codes(self):
+        for page in scan_pages(self._table(self.mapping_table), {"ProjectionExpression": "shortCode"}):
+            for item in page:
+                yield item["shortCode"]
+
+    # --- URL 인덱스 ---
+    def get_url_codes(self, url_hashes: list) -> dict:
+        table = self._table(self.url_index_table)
+        if len(url_hashes) == 1:
+            item = table.get_item(Key={"urlHash": url_hashes[0]}, ProjectionExpression="shortCode").get("Item")
+            return {url_hashes[0]: item["shortCode"]} if item and item.get("shortCode") else {}
+        found = self._batch_get(table.name, "urlHash", url_hashes)
+        return {h: item["shortCode"] for h, item in found.items() if item.get("shortCode")}
+
+    def put_url_index(self, url_hash: str, short_code: str, created_at: str) -> bool:
+        try:
+            self._table(self.url_index_table).put_item(
+                Item={"urlHash": url_hash, "shortCode": short_code, "createdAt": created_at},
+                ConditionExpression="attribute_not_exists(urlHash)",
+            )
+            return True
+        except Exception as e:
+            if _is_conflict(e):
+                return False
+            raise
+
+    def put_url_indexes(self, items: list) -> list:
+        # 조건부 Put이라 이미 있는 urlHash는 먼저 저장된 코드를 유지 (충돌은 실패가 아님)
+        _, failed = self._transact_put_new(
+            self._table(self.url_index_table).name, "urlHash", items, "put_url_indexes",
+        )
+        return failed
+
+    # --- ID 카운터 ---
+    def reserve_ids(self, count: int) -> int:
+        resp = self._table(self.counter_table).update_item(
+            Key={"counter_name": COUNTER_KEY},
+            UpdateExpression="SET last_id = if_not_exists(last_id, :zero) + :inc",
+            ExpressionAttributeValues={":zero": 0, ":inc": count},
+            ReturnValues="UPDATED_NEW",
+        )
+        return int(resp["Attributes"]["last_id"])
+
+    def read_counter(self) -> int:
+        resp = self._table(self.counter_table).get_item(
+            Key={"counter_name": COUNTER_KEY},
+            ProjectionExpression="last_id",
+        )
+        return int(resp.get("Item", {}).get("last_id", 0))
+
+    # --- 클릭 로그 ---
+    def put_click(self, item: dict) -> None:
+        self._table(self.log_table).put_item(Item=item)
+
+    def put_clicks(self, items: list) -> list:
+        return batch_put(self._dynamo, self._table(self.log_table).name, items, key_fields=("shortCode", "timestamp"))
+
+    def _scan_params(self, since: str) -> dict:
+        # 필터링 파라미터 (timestamp는 예약어일 수 있으므로 #ts 사용)
+        return {
+            "FilterExpression": "#ts > :since",
+            "ProjectionExpression": _CLICK_PROJECTION,
+            "ExpressionAttributeNames": {"#ts": "timestamp", "#cat": "category"},
+            "ExpressionAttributeValues": {":since": since},
+        }
+
+    def _query_bucket_pages(self, table, bucket: str, since: str):
+        """시간 버킷 1개를 HourBucketIndex로 Query (윈도우 시작 이후만, 페이지 단위)"""
+        params = {
+            "IndexName": HOUR_BUCKET_INDEX,
+            "KeyConditionExpression": "hourBucket = :b AND #ts > :since",
+            "ProjectionExpression": _CLICK_PROJECTION,
+            "ExpressionAttributeNames": {"#ts": "timestamp", "#cat": "category"},
+            "ExpressionAttributeValues": {":b": bucket, ":since": since},
+        }
+        while True:
+            resp = table.query(**params)
+            yield resp.get("Items", [])
+            if "LastEvaluatedKey" not in resp:
+                break
+            params["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+    def iter_click_pages(self, since: datetime, mode: str = "query"):
+        """query: 시간 버킷 GSI (윈도우 크기에 비례) / scan: 전체 테이블 (버킷 없는 과거 로그용)"""
+        table = self._table(self.log_table)
+        if mode == "query":
+            for bucket in window_buckets(since, self.bucket_shards):
+                yield from self._query_bucket_pages(table, bucket, since.isoformat())
+            return
+        yield from scan_pages(table, self._scan_params(since.isoformat()))
+
+    def map_click_pages(self, since: datetime, aggregate, mode: str = "query", segments: int = 1) -> list:
+        """scan 모드에서 segments > 1이면 세그먼트 병렬 Scan (저수준 클라이언트는 스레드 간 공유 가능)"""
+        if mode == "scan" and segments > 1:
+            table = self._table(self.log_table)
+            return parallel_scan(lambda: table, segments, self._scan_params(since.isoformat()), aggregate)
+        return super().map_click_pages(since, aggregate, mode, segments)
+
+    def iter_link_click_pages(self, short_code: str, since: str, until: str):
+        params = {
+            "KeyConditionExpression": "shortCode = :c AND #ts BETWEEN :since AND :until",
+            "ProjectionExpression": "#ts, ip",
+            "ExpressionAttributeNames": {"#ts": "timestamp"},
+            "ExpressionAttributeValues": {":c": short_code, ":since": since, ":until": until},
+        }
+        table = self._table(self.log_table)
+        while True:
+            resp = table.query(**params)
+            yield resp.get("Items", [])
+            if "LastEvaluatedKey" not in resp:
+                break
+            params["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+    # --- rollup (증분은 클릭 로그 스트림 소비 람다가 반영) ---
+    def apply_rollup(self, increments: dict, token: str = None) -> None:
+        DynamoRollupStore(self._table(self.rollup_table)).apply(increments, token)
+
+    def iter_rollup(self, since: datetime):
+        return DynamoRollupStore(self._table(self.rollup_table)).iter_window(since)
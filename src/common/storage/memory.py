@@ -0,0 +1,138 @@
+"""
+메모리 저장소 백엔드 (프로세스 내 dict, 테스트 / 오프라인 벤치마크용)
+클릭 로그 저장 시 rollup도 즉시 반영 (DynamoDB 스트림 소비 람다 역할)
+"""
+
+import bisect
+import threading
+from datetime import datetime
+from operator import itemgetter
+
+from common.rollup import MemoryRollupStore, accumulate
+from common.storage.base import PAGE_SIZE, Conflict, Storage, project
+
+_timestamp = itemgetter(0)
+
+
+class MemoryStorage(Storage):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._mappings = {}
+        self._url_index = {}
+        self._counter = 0
+        # (timestamp, shortCode) 정렬 키 목록 + 키 -> 항목 (구간 조회는 이진 탐색)
+        self._click_keys = []
+        self._clicks = {}
+        self._rollup = MemoryRollupStore()
+
+    # --- 매핑 ---
+    def get_mapping(self, short_code: str, attributes: tuple = None):
+        with self._lock:
+            item = self._mappings.get(short_code)
+            return project(item, attributes) if item is not None else None
+
+    def get_mappings(self, short_codes: list, attributes: tuple = None) -> dict:
+        with self._lock:
+            return {c: project(self._mappings[c], attributes) for c in short_codes if c in self._mappings}
+
+    def put_mapping(self, item: dict) -> None:
+        with self._lock:
+            if item["shortCode"] in self._mappings:
+                raise Conflict(item["shortCode"], dict(self._mappings[item["shortCode"]]))
+            self._mappings[item["shortCode"]] = dict(item)
+
+    def put_mappings(self, items: list) -> list:
+        failed = []
+        with self._lock:
+            for item in items:
+                if item["shortCode"] in self._mappings:
+                    failed.append(item)
+                else:
+                    self._mappings[item["shortCode"]] = dict(item)
+        return failed
+
+    def update_mapping(self, short_code: str, fields: dict) -> None:
+        with self._lock:
+            if short_code not in self._mappings:
+                raise Conflict(short_code)
+            self._mappings[short_code].update(fields)
+
+    def iter_short_codes(self):
+        with self._lock:
+            codes = list(self._mappings)
+        return iter(codes)
+
+    # --- URL 인덱스 ---
+    def get_url_codes(self, url_hashes: list) -> dict:
+        with self._lock:
+            return {h: self._url_index[h] for h in url_hashes if h in self._url_index}
+
+    def put_url_index(self, url_hash: str, short_code: str, created_at: str) -> bool:
+        with self._lock:
+            if url_hash in self._url_index:
+                return False
+            self._url_index[url_hash] = short_code
+            return True
+
+    def put_url_indexes(self, items: list) -> list:
+        with self._lock:
+            for item in items:
+                self._url_index.setdefault(item["urlHash"], item["shortCode"])
+        return []
+
+    # --- ID 카운터 ---
+    def reserve_ids(self, count: int) -> int:
+        with self._lock:
+            self._counter += count
+            return self._counter
+
+    def read_counter(self) -> int:
+        with self._lock:
+            return self._counter
+
+    # --- 클릭 로그 ---
+    def put_clicks(self, items: list) -> list:
+        inserted = []
+        with self._lock:
+            keys = self._click_keys
+            for item in items:
+                key = (item["timestamp"], item["shortCode"])
+                if key not in self._clicks:
+                    inserted.append(item)
+                    # 대부분 시간 순으로 도착하므로 끝에 붙이고, 늦게 도착한 항목만 정렬 위치에 삽입
+                    if not keys or key > keys[-1]:
+                        keys.append(key)
+                    else:
+                        bisect.insort(keys, key)
+                self._clicks[key] = dict(item)
+        # 스트림 소비 람다와 같이 새로 생긴 로그만 rollup에 반영
+        self._rollup.apply(accumulate(inserted))
+        return []
+
+    def _clicks_between(self, since: str, until: str = None, inclusive: bool = False) -> list:
+        """since 초과(inclusive면 이상) ~ until 이하 클릭 로그 (timestamp 순)"""
+        with self._lock:
+            keys = self._click_keys
+            start = (bisect.bisect_left if inclusive else bisect.bisect_right)(keys, since, key=_timestamp)
+            end = len(keys) if until is None else bisect.bisect_right(keys, until, key=_timestamp)
+            return [self._clicks[key] for key in keys[start:end]]
+
+    def iter_click_pages(self, since: datetime, mode: str = "query"):
+        items = self._clicks_between(since.isoformat())
+        for start in range(0, len(items), PAGE_SIZE):
+            yield [project(item, ("timestamp", "category")) for item in items[start:start + PAGE_SIZE]]
+
+    def iter_link_click_pages(self, short_code: str, since: str, until: str):
+        items = [
+            project(item, ("timestamp", "ip"))
+            for item in self._clicks_between(since, until, inclusive=True) if item["shortCode"] == short_code
+        ]
+        for start in range(0, len(items), PAGE_SIZE):
+            yield items[start:start + PAGE_SIZE]
+
+    # --- rollup ---
+    def apply_rollup(self, increments: dict, token: str = None) -> None:
+        self._rollup.apply(increments)
+
+    def iter_rollup(self, since: datetime):
+        return self._rollup.iter_window(since)
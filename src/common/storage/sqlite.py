@@ -0,0 +1,273 @@
+"""
+SQLite 저장소 백엔드 (로컬 실행 / 오프라인 부하 테스트용)
+파일 DB는 WAL 모드로 열어 여러 프로세스가 같은 파일을 공유할 수 있음
+클릭 로그 저장 시 rollup도 같은 트랜잭션에서 반영 (DynamoDB 스트림 소비 람다 역할)
+"""
+
+import contextlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from common.rollup import accumulate, split_slot
+from common.storage.base import COUNTER_KEY, PAGE_SIZE, Conflict, Storage, project
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mappings (
+    short_code TEXT PRIMARY KEY,
+    original_url TEXT NOT NULL,
+    category TEXT,
+    summary TEXT,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS url_index (
+    url_hash TEXT PRIMARY KEY,
+    short_code TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS click_logs (
+    short_code TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    category TEXT,
+    ip TEXT,
+    hour_bucket TEXT,
+    PRIMARY KEY (short_code, timestamp)
+);
+CREATE INDEX IF NOT EXISTS click_logs_timestamp ON click_logs (timestamp);
+CREATE TABLE IF NOT EXISTS click_rollup (
+    day TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    clicks INTEGER NOT NULL,
+    PRIMARY KEY (day, slot)
+);
+"""
+
+# 항목 속성 이름 -> 매핑 테이블 컬럼
+_MAPPING_COLUMNS = {
+    "shortCode": "short_code",
+    "originalUrl": "original_url",
+    "category": "category",
+    "summary": "summary",
+    "createdAt": "created_at",
+}
+_CLICK_COLUMNS = {
+    "shortCode": "short_code",
+    "timestamp": "timestamp",
+    "category": "category",
+    "ip": "ip",
+    "hourBucket": "hour_bucket",
+}
+
+
+def _item(row: sqlite3.Row, columns: dict) -> dict:
+    """행 -> 항목 (NULL 컬럼은 속성 없음으로 취급)"""
+    keys = row.keys()
+    return {attr: row[col] for attr, col in columns.items() if col in keys and row[col] is not None}
+
+
+class SqliteStorage(Storage):
+    """연결 1개를 스레드 간 공유 (문장 실행은 잠금으로 직렬화, 쓰기 트랜잭션은 BEGIN IMMEDIATE)"""
+
+    def __init__(self, path: str = ":memory:", timeout: float = 30.0):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """쓰기 트랜잭션 (시작 시점에 쓰기 잠금을 잡아 다른 프로세스와 직렬화)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _write(self, sql: str, rows: list) -> None:
+        """여러 행 쓰기를 트랜잭션 1개로 실행"""
+        with self._transaction() as conn:
+            conn.executemany(sql, rows)
+
+    # --- 매핑 ---
+    def get_mapping(self, short_code: str, attributes: tuple = None):
+        rows = self._query("SELECT * FROM mappings WHERE short_code = ?", (short_code,))
+        return project(_item(rows[0], _MAPPING_COLUMNS), attributes) if rows else None
+
+    def get_mappings(self, short_codes: list, attributes: tuple = None) -> dict:
+        found = {}
+        unique = list(dict.fromkeys(short_codes))
+        # SQLite 바인딩 변수 수 제한(기본 999) 이내로 나눠 조회
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            rows = self._query(
+                f"SELECT * FROM mappings WHERE short_code IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            for row in rows:
+                found[row["short_code"]] = project(_item(row, _MAPPING_COLUMNS), attributes)
+        return found
+
+    def _mapping_row(self, item: dict) -> tuple:
+        return tuple(item.get(attr) for attr in _MAPPING_COLUMNS)
+
+    def put_mapping(self, item: dict) -> None:
+        try:
+            self._write(
+                f"INSERT INTO mappings ({', '.join(_MAPPING_COLUMNS.values())}) VALUES (?, ?, ?, ?, ?)",
+                [self._mapping_row(item)],
+            )
+        except sqlite3.IntegrityError as e:
+            raise Conflict(item["shortCode"], self.get_mapping(item["shortCode"])) from e
+
+    def put_mappings(self, items: list) -> list:
+        failed = []
+        sql = f"INSERT OR IGNORE INTO mappings ({', '.join(_MAPPING_COLUMNS.values())}) VALUES (?, ?, ?, ?, ?)"
+        with self._transaction() as conn:
+            for item in items:
+                if conn.execute(sql, self._mapping_row(item)).rowcount == 0:
+                    failed.append(item)
+        return failed
+
+    def update_mapping(self, short_code: str, fields: dict) -> None:
+        assignments = ", ".join(f"{_MAPPING_COLUMNS[attr]} = ?" for attr in fields)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE mappings SET {assignments} WHERE short_code = ?", (*fields.values(), short_code)
+            )
+        if cursor.rowcount == 0:
+            raise Conflict(short_code)
+
+    def iter_short_codes(self):
+        # 전체 목록을 한 번에 fetchall하지 않고 페이지 단위로 읽음 (Bloom 필터 구성용)
+        for page in self._pages("SELECT short_code FROM mappings", (), {"shortCode": "short_code"}):
+            for item in page:
+                yield item["shortCode"]
+
+    # --- URL 인덱스 ---
+    def get_url_codes(self, url_hashes: list) -> dict:
+        found = {}
+        unique = list(dict.fromkeys(url_hashes))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            rows = self._query(
+                f"SELECT url_hash, short_code FROM url_index WHERE url_hash IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            found.update((row["url_hash"], row["short_code"]) for row in rows)
+        return found
+
+    def put_url_index(self, url_hash: str, short_code: str, created_at: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO url_index (url_hash, short_code, created_at) VALUES (?, ?, ?)",
+                (url_hash, short_code, created_at),
+            )
+        return cursor.rowcount == 1
+
+    def put_url_indexes(self, items: list) -> list:
+        self._write(
+            "INSERT OR IGNORE INTO url_index (url_hash, short_code, created_at) VALUES (?, ?, ?)",
+            [(item["urlHash"], item["shortCode"], item.get("createdAt")) for item in items],
+        )
+        return []
+
+    # --- ID 카운터 ---
+    def reserve_ids(self, count: int) -> int:
+        # UPSERT + RETURNING을 문장 1개로 실행하므로 여러 프로세스가 같은 파일을 써도 원자적
+        rows = self._query(
+            "INSERT INTO counters (name, last_id) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET last_id = last_id + excluded.last_id RETURNING last_id",
+            (COUNTER_KEY, count),
+        )
+        return int(rows[0]["last_id"])
+
+    def read_counter(self) -> int:
+        rows = self._query("SELECT last_id FROM counters WHERE name = ?", (COUNTER_KEY,))
+        return int(rows[0]["last_id"]) if rows else 0
+
+    # --- 클릭 로그 ---
+    def put_clicks(self, items: list) -> list:
+        if not items:
+            return []
+        with self._transaction() as conn:
+            # 스트림 소비 람다와 같이 새로 생긴 로그만 rollup에 반영 (같은 키는 덮어쓰기만)
+            inserted = []
+            for item in items:
+                cursor = conn.execute(
+                    f"INSERT OR IGNORE INTO click_logs ({', '.join(_CLICK_COLUMNS.values())}) VALUES (?, ?, ?, ?, ?)",
+                    tuple(item.get(attr) for attr in _CLICK_COLUMNS),
+                )
+                if cursor.rowcount == 1:
+                    inserted.append(item)
+                    continue
+                conn.execute(
+                    "UPDATE click_logs SET category = ?, ip = ?, hour_bucket = ? WHERE short_code = ? AND timestamp = ?",
+                    (item.get("category"), item.get("ip"), item.get("hourBucket"), item["shortCode"], item["timestamp"]),
+                )
+            self._apply_rollup(conn, accumulate(inserted))
+        return []
+
+    def _pages(self, sql: str, params: tuple, columns: dict):
+        """커서를 PAGE_SIZE 단위로 읽어 페이지 순회 (페이지 사이에는 잠금을 놓음)"""
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(PAGE_SIZE)
+            if not rows:
+                return
+            yield [_item(row, columns) for row in rows]
+
+    def iter_click_pages(self, since: datetime, mode: str = "query"):
+        return self._pages(
+            "SELECT timestamp, category FROM click_logs WHERE timestamp > ? ORDER BY timestamp",
+            (since.isoformat(),), _CLICK_COLUMNS,
+        )
+
+    def iter_link_click_pages(self, short_code: str, since: str, until: str):
+        return self._pages(
+            "SELECT timestamp, ip FROM click_logs WHERE short_code = ? AND timestamp BETWEEN ? AND ? "
+            "ORDER BY timestamp",
+            (short_code, since, until), _CLICK_COLUMNS,
+        )
+
+    # --- rollup ---
+    def _apply_rollup(self, conn, increments: dict) -> None:
+        conn.executemany(
+            "INSERT INTO click_rollup (day, slot, clicks) VALUES (?, ?, ?) "
+            "ON CONFLICT (day, slot) DO UPDATE SET clicks = clicks + excluded.clicks",
+            [(day, slot, n) for (day, slot), n in increments.items()],
+        )
+
+    def apply_rollup(self, increments: dict, token: str = None) -> None:
+        with self._transaction() as conn:
+            self._apply_rollup(conn, increments)
+
+    def iter_rollup(self, since: datetime):
+        since = since.astimezone(timezone.utc)
+        first_day, first_minute = since.date().isoformat(), since.strftime("%H:%M")
+        rows = self._query(
+            "SELECT day, slot, clicks FROM click_rollup WHERE day > ? OR (day = ? AND slot >= ?) ORDER BY day, slot",
+            (first_day, first_day, first_minute),
+        )
+        for row in rows:
+            minute, category = split_slot(row["slot"])
+            yield row["day"], minute, category, row["clicks"]
@@ -0,0 +1,104 @@
+"""
+클릭 로그 시계열 / 시간대 히트맵 집계
+NumPy가 있으면 열(column) 배열(int64 epoch 초 + 카테고리 코드)로 변환해 bincount로 한 번에 집계,
+없으면 동일 결과를 내는 순수 Python 루프로 대체
+"""
+
+import importlib.util
+from datetime import datetime, timezone
+
+# 선택 의존성 (Lambda 기본 런타임에는 없음): 설치 여부만 확인하고 import는 벡터화 집계에서 처음 쓸 때
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+np = None
+
+
+def _numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+def _epoch(timestamp: str) -> int:
+    """ISO 타임스탬프(초 단위까지 사용, UTC) -> epoch 초"""
+    return int(datetime.fromisoformat(timestamp[:19]).replace(tzinfo=timezone.utc).timestamp())
+
+
+def _result(stats: dict, series: list, heatmap: dict, since: int, bucket_seconds: int, engine: str) -> dict:
+    return {
+        "engine": engine,
+        "count": sum(stats.values()),
+        "stats": stats,
+        "bucketMinutes": bucket_seconds // 60,
+        "series": [
+            {"start": datetime.fromtimestamp(since + i * bucket_seconds, timezone.utc).isoformat(), "counts": counts}
+            for i, counts in enumerate(series)
+        ],
+        # 카테고리별 시간대(0~23시) 클릭 수
+        "heatmap": heatmap,
+    }
+
+
+def _bucket_count(since: int, until: int, bucket_seconds: int) -> int:
+    return max(1, -(-(until - since) // bucket_seconds))
+
+
+def analyze_python(rows, since: int, until: int, bucket_seconds: int, tz_offset_hours: int = 0) -> dict:
+    """순수 Python 루프 집계 (rows: (timestamp, 카테고리, 클릭 수))"""
+    buckets = _bucket_count(since, until, bucket_seconds)
+    stats, series, heatmap = {}, [{} for _ in range(buckets)], {}
+    for ts, cat, n in rows:
+        epoch = _epoch(ts)
+        b = (epoch - since) // bucket_seconds
+        if b < 0 or b >= buckets:
+            continue
+        stats[cat] = stats.get(cat, 0) + n
+        series[b][cat] = series[b].get(cat, 0) + n
+        if cat not in heatmap:
+            heatmap[cat] = [0] * 24
+        heatmap[cat][(epoch // 3600 + tz_offset_hours) % 24] += n
+    return _result(stats, series, heatmap, since, bucket_seconds, "python")
+
+
+def analyze_numpy(rows, since: int, until: int, bucket_seconds: int, tz_offset_hours: int = 0) -> dict:
+    """NumPy 열 배열 + bincount 집계 (analyze_python과 동일한 결과)"""
+    np = _numpy()
+    timestamps, cats, weights = [], [], []
+    for ts, cat, n in rows:
+        timestamps.append(ts[:19])
+        cats.append(cat)
+        weights.append(n)
+
+    buckets = _bucket_count(since, until, bucket_seconds)
+    if not timestamps:
+        return _result({}, [{} for _ in range(buckets)], {}, since, bucket_seconds, "numpy")
+
+    epochs = np.array(timestamps, dtype="datetime64[s]").astype(np.int64)
+    categories, codes = np.unique(np.array(cats), return_inverse=True)
+    weights = np.array(weights, dtype=np.int64)
+    ncat = len(categories)
+
+    b = (epochs - since) // bucket_seconds
+    mask = (b >= 0) & (b < buckets)
+    epochs, codes, weights, b = epochs[mask], codes[mask], weights[mask], b[mask]
+
+    totals = np.bincount(codes, weights=weights, minlength=ncat).astype(np.int64)
+    grid = np.bincount(b * ncat + codes, weights=weights, minlength=buckets * ncat).astype(np.int64).reshape(buckets, ncat)
+    hours = (epochs // 3600 + tz_offset_hours) % 24
+    heat = np.bincount(hours * ncat + codes, weights=weights, minlength=24 * ncat).astype(np.int64).reshape(24, ncat)
+
+    # 윈도우 밖 행만 있던 카테고리는 제외 (Python 경로와 결과 일치)
+    names = categories.tolist()
+    keep = np.nonzero(totals)[0].tolist()
+    stats = {names[c]: int(totals[c]) for c in keep}
+    series = [{names[c]: int(row[c]) for c in keep if row[c]} for row in grid.tolist()]
+    heatmap = {names[c]: heat[:, c].tolist() for c in keep}
+    return _result(stats, series, heatmap, since, bucket_seconds, "numpy")
+
+
+def analyze(rows, since: int, until: int, bucket_seconds: int, tz_offset_hours: int = 0, vectorize: bool = True) -> dict:
+    """시간 버킷 시계열 + 시간대 히트맵 + 카테고리 합계 (NumPy 사용 가능 시 벡터화)"""
+    if vectorize and HAS_NUMPY:
+        return analyze_numpy(rows, since, until, bucket_seconds, tz_offset_hours)
+    return analyze_python(rows, since, until, bucket_seconds, tz_offset_hours)
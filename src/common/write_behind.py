@@ -0,0 +1,143 @@
+"""
+DynamoDB write-behind 버퍼
+요청 경로에서는 메모리 버퍼에 적재만 하고, 크기/경과 시간 기준으로 batch_write_item 일괄 저장
+"""
+
+import atexit
+import random
+import threading
+import time
+
+BATCH_LIMIT = 25  # batch_write_item 1회 최대 요청 수
+
+
+def batch_put(dynamo, table_name: str, items: list, key_fields=None,
+              max_retries: int = 5, base_delay: float = 0.05) -> list:
+    """batch_write_item으로 일괄 저장 (UnprocessedItems 지수 백오프 재시도), 최종 실패 항목 반환"""
+    if key_fields:
+        # 같은 배치 안의 중복 키는 batch_write_item이 거부하므로 마지막 값만 유지 (put_item 덮어쓰기와 동일)
+        unique = {}
+        for item in items:
+            unique[tuple(item.get(k) for k in key_fields)] = item
+        items = list(unique.values())
+
+    failed = []
+    for start in range(0, len(items), BATCH_LIMIT):
+        requests = [{"PutRequest": {"Item": item}} for item in items[start:start + BATCH_LIMIT]]
+        attempt = 0
+        while requests:
+            try:
+                resp = dynamo.batch_write_item(RequestItems={table_name: requests})
+                requests = resp.get("UnprocessedItems", {}).get(table_name, [])
+            except Exception as e:
+                print(f"DEBUG ERROR in batch_put: {str(e)}")
+            if not requests:
+                break
+            attempt += 1
+            if attempt > max_retries:
+                failed.extend(req["PutRequest"]["Item"] for req in requests)
+                break
+            time.sleep(base_delay * (2 ** (attempt - 1)) * (0.5 + random.random()))
+    return failed
+
+
+class WriteBehindBuffer:
+    """크기(max_items) 또는 경과 시간(max_age) 기준으로 flush하는 스레드 안전 버퍼
+
+    interval > 0 이면 백그라운드 스레드가 flush를 담당하여 요청 스레드는 적재만 수행
+    flush_fn(items)은 저장에 실패한 항목 리스트를 반환하며, 실패 항목은 max_pending 한도 내에서 재적재
+    """
+
+    def __init__(self, flush_fn, max_items: int = BATCH_LIMIT, max_age: float = 1.0,
+                 interval: float = 0.0, max_pending: int = 10000, clock=time.monotonic):
+        self._flush_fn = flush_fn
+        self.max_items = max(1, int(max_items))
+        self.max_age = float(max_age)
+        self.interval = float(interval)
+        self.max_pending = int(max_pending)
+        self._clock = clock
+        self._items = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.flushed = 0
+        self.dropped = 0
+        # 장기 실행 프로세스용 안전망 (Lambda는 컨테이너 회수 시 atexit을 실행하지 않음 -> 응답 후 flush 사용)
+        atexit.register(self.flush)
+
+    def add(self, item) -> None:
+        with self._lock:
+            if not self._items:
+                self._oldest = self._clock()
+            self._items.append(item)
+            due = self._is_due()
+        if self.interval > 0:
+            self._ensure_thread()
+            if due:
+                self._wakeup.set()
+        elif due:
+            self.flush()
+
+    def _is_due(self) -> bool:
+        return bool(self._items) and (
+            len(self._items) >= self.max_items or self._clock() - self._oldest >= self.max_age
+        )
+
+    def flush_if_due(self) -> int:
+        """크기/경과 시간 기준에 도달했으면 호출한 스레드에서 바로 flush (저장 성공 건수 반환)
+
+        응답 후 flush(internal extension)를 쓸 수 없는 Lambda 환경에서 호출 끝에 사용
+        """
+        with self._lock:
+            due = self._is_due()
+        return self.flush() if due else 0
+
+    def flush(self) -> int:
+        """버퍼 비우기 (저장 성공 건수 반환)"""
+        with self._flush_lock:
+            with self._lock:
+                items, self._items, self._oldest = self._items, [], None
+            if not items:
+                return 0
+            try:
+                failed = self._flush_fn(items) or []
+            except Exception as e:
+                print(f"DEBUG ERROR in WriteBehindBuffer.flush: {str(e)}")
+                failed = items
+            if failed:
+                self._requeue(failed)
+            done = len(items) - len(failed)
+            self.flushed += done
+            return done
+
+    def _requeue(self, failed: list) -> None:
+        with self._lock:
+            room = max(0, self.max_pending - len(self._items))
+            kept = failed[:room]
+            self.dropped += len(failed) - len(kept)
+            if kept:
+                self._items[:0] = kept
+                self._oldest = self._clock()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            with self._lock:
+                due = self._is_due()
+            if due:
+                self.flush()
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -1,35 +1,67 @@
+import functools
+import hashlib
 import json
 import os
-import boto3
-import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from botocore.exceptions import ClientError
+
+from common import clients, dynamo, metrics, storage
+from common.base62 import encode, encode_many
+from common.category_cache import CategoryCache
+from common.classify_queue import PENDING_CATEGORY, PENDING_SUMMARY, LocalQueue, SqsQueue
+from common.id_allocator import BlockIdAllocator
+from common.snowflake import SnowflakeGenerator
 
 # --- AWS 리소스 초기화 ---
-# Bedrock 클라이언트는 리전 설정이 필수입니다.
-BEDROCK = boto3.client("bedrock-runtime", region_name=os.environ.get("AWS_REGION", "ap-northeast-2"))
-DYNAMO = boto3.resource("dynamodb")
+# DynamoDB 클라이언트는 init 단계에서 생성, Bedrock은 첫 호출 시 생성 (async 분류 모드는 Bedrock 미사용)
+BEDROCK = None
+DYNAMO = dynamo.resource()
+# 매핑 / URL 인덱스 / 카운터 저장소 (STORAGE_BACKEND: dynamo | sqlite | memory)
+STORAGE = storage.from_env()
 
 # 환경 변수 로드 (template.yaml에 정의된 변수와 일치해야 함)
-MAPPING_TABLE_NAME = os.environ.get("MAPPING_TABLE_NAME", "SurlMappingTable")
-COUNTER_TABLE_NAME = os.environ.get("COUNTER_TABLE_NAME", "SurlCounter")
-_COUNTER_KEY = "surl_id"
-
-def encode(num):
-    """숫자를 Base62 문자열로 변환 (단축 코드 생성용)"""
-    chars = string.digits + string.ascii_letters
-    if num == 0:
-        return chars[0]
-    arr = []
-    base = len(chars)
-    while num:
-        num, rem = divmod(num, base)
-        arr.append(chars[rem])
-    arr.reverse()
-    return ''.join(arr)
+# ID 생성 방식: counter(SurlCounter 블록 임대) | snowflake(네트워크 호출 없는 로컬 생성)
+ID_STRATEGY = os.environ.get("ID_STRATEGY", "counter").strip().lower()
+_SAVE_ATTEMPTS = 3
+# AI 분류 방식: sync(응답 전 Bedrock 호출) | async(분석중 상태로 저장 후 워커가 갱신)
+CLASSIFY_MODE = os.environ.get("CLASSIFY_MODE", "sync").strip().lower()
+CLASSIFY_QUEUE_URL = os.environ.get("CLASSIFY_QUEUE_URL")
+# 동일 URL 중복 생성 방지 (urlHash -> shortCode 인덱스 테이블)
+DEDUP_ENABLED = os.environ.get("DEDUP_ENABLED", "false").lower() == "true"
+# 일괄 생성 (/create/batch) 제한
+BATCH_MAX_URLS = int(os.environ.get("BATCH_MAX_URLS", "100"))
+BATCH_AI_CHUNK = int(os.environ.get("BATCH_AI_CHUNK", "25"))
+
+# 독립적인 I/O 단계(카운터, Bedrock)를 동시에 실행하기 위한 스레드 풀 (웜 컨테이너 간 재사용)
+_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.environ.get("CREATE_IO_WORKERS", "4")))
+
+# 분류 결과 캐시 (정규화 URL, 등록 도메인 fallback은 opt-in / 메모리 + 선택적 DynamoDB 계층)
+_CATEGORY_CACHE = CategoryCache(
+    memory_size=int(os.environ.get("CATEGORY_CACHE_SIZE", "5000")),
+    memory_ttl=float(os.environ.get("CATEGORY_CACHE_TTL", "3600")),
+    dynamo=DYNAMO,
+    table_name=os.environ.get("CATEGORY_CACHE_TABLE_NAME"),
+    table_ttl=float(os.environ.get("CATEGORY_CACHE_TABLE_TTL", str(7 * 86400))),
+    domain_fallback=os.environ.get("CATEGORY_CACHE_DOMAIN_FALLBACK", "false").lower() == "true",
+)
+
+def _lookup_category_cache(url: str):
+    """분류 캐시 조회 + 계층별 적중 지표(EMF) 기록"""
+    result, tier = _CATEGORY_CACHE.get(url)
+    metrics.emit({
+        "CategoryCacheHit": 0 if result is None else 1,
+        "CategoryCacheMemoryHit": 1 if tier.startswith("memory") else 0,
+        "CategoryCacheDynamoHit": 1 if tier.startswith("dynamo") else 0,
+        "CategoryCacheDomainHit": 1 if tier.endswith("domain") else 0,
+    })
+    return result
+
+def _analyze_url(url: str) -> dict:
+    """Bedrock Claude 3 Haiku 모델을 호출하여 URL 분석 수행 (분류 캐시 적중 시 호출 생략, 실패 시 예외)"""
+    cached = _lookup_category_cache(url)
+    if cached is not None:
+        return cached
 
-def _get_ai_analysis(url: str) -> dict:
-    """Bedrock Claude 3 Haiku 모델을 호출하여 URL 분석 수행"""
     prompt = f"""
     Analyze the following URL and respond in JSON format.
     URL: {url}
@@ -38,60 +70,265 @@ def _get_ai_analysis(url: str) -> dict:
     - summary: (One-line summary in Korean)
     """
 
+    raw_text = _invoke_model(prompt, max_tokens=300)
+    result = json.loads(_extract_json(raw_text, "{", "}"))
+    _CATEGORY_CACHE.put(url, result)
+    return result
+
+def _get_ai_analysis(url: str) -> dict:
+    """동기 생성용 URL 분석 (Bedrock 오류 시 기본값으로 응답)"""
+    try:
+        return _analyze_url(url)
+    except Exception as e:
+        print(f"AI Analysis Error: {str(e)}")
+        return {"category": "기타", "summary": "AI 분석 실패"}
+
+def _bedrock():
+    global BEDROCK
+    if BEDROCK is None:
+        BEDROCK = clients.bedrock()
+    return BEDROCK
+
+def _invoke_model(prompt: str, max_tokens: int) -> str:
+    """Bedrock Claude 3 Haiku 호출 후 응답 텍스트 반환"""
     body = json.dumps({
         "anthropic_version": "bedrock-2023-05-31",
-        "max_tokens": 300,
+        "max_tokens": max_tokens,
         "messages": [{"role": "user", "content": prompt}],
         "temperature": 0.1,
     })
+    response = _bedrock().invoke_model(
+        modelId="anthropic.claude-3-haiku-20240307-v1:0",
+        body=body
+    )
+    response_body = json.loads(response.get("body").read())
+    return response_body['content'][0]['text'].strip()
 
+def _extract_json(raw_text: str, open_char: str, close_char: str) -> str:
+    """텍스트 내에서 JSON 부분만 추출하는 방어 로직"""
+    if not raw_text.startswith(open_char):
+        start = raw_text.find(open_char)
+        end = raw_text.rfind(close_char) + 1
+        if start != -1 and end != -1:
+            raw_text = raw_text[start:end]
+    return raw_text
+
+def _classify_chunk(chunk_urls: list) -> list:
+    """URL 묶음을 다건 프롬프트 1회로 분류 (응답에 없는 항목은 None)"""
+    results = [None] * len(chunk_urls)
+    listing = "\n".join(f"{n}. {url}" for n, url in enumerate(chunk_urls))
+    prompt = f"""
+    Analyze each of the following URLs and respond with a JSON array only.
+    URLs:
+    {listing}
+    Each element must include:
+    - index: (the number in front of the URL)
+    - category: (IT, Shopping, Food, Finance, etc)
+    - summary: (One-line summary in Korean)
+    """
     try:
-        response = BEDROCK.invoke_model(
-            modelId="anthropic.claude-3-haiku-20240307-v1:0",
-            body=body
-        )
-        response_body = json.loads(response.get("body").read())
-        raw_text = response_body['content'][0]['text'].strip()
-        
-        # 텍스트 내에서 JSON 부분만 추출하는 방어 로직
-        if not raw_text.startswith('{'):
-            start = raw_text.find('{')
-            end = raw_text.rfind('}') + 1
-            if start != -1 and end != -1:
-                raw_text = raw_text[start:end]
-            
-        return json.loads(raw_text)
+        raw_text = _invoke_model(prompt, max_tokens=min(4096, 120 * len(chunk_urls) + 100))
+        for entry in json.loads(_extract_json(raw_text, "[", "]")):
+            n = int(entry.get("index", -1))
+            if 0 <= n < len(chunk_urls) and entry.get("category"):
+                results[n] = {"category": entry["category"], "summary": entry.get("summary", "분석 없음")}
+                _CATEGORY_CACHE.put(chunk_urls[n], results[n])
     except Exception as e:
-        print(f"AI Analysis Error: {str(e)}")
-        return {"category": "기타", "summary": "AI 분석 실패"}
+        print(f"AI Batch Analysis Error: {str(e)}")
+    return results
 
-def _get_next_id() -> int:
-    """DynamoDB를 이용한 순차적 ID 생성 (Atomic Counter)"""
-    table = DYNAMO.Table(COUNTER_TABLE_NAME)
+def _get_ai_analysis_batch(urls: list) -> list:
+    """여러 URL을 다건 프롬프트로 분류 (캐시 적중분 제외, 묶음별 Bedrock 호출은 동시 실행, 실패 항목은 기본값)"""
+    results = [_lookup_category_cache(url) for url in urls]
+    todo = [i for i, r in enumerate(results) if r is None]
+    chunks = [todo[start:start + BATCH_AI_CHUNK] for start in range(0, len(todo), BATCH_AI_CHUNK)]
+
+    for chunk, chunk_results in zip(chunks, _EXECUTOR.map(_classify_chunk, [[urls[i] for i in c] for c in chunks])):
+        for i, result in zip(chunk, chunk_results):
+            results[i] = result
+
+    return [r if r is not None else {"category": "기타", "summary": "AI 분석 실패"} for r in results]
+
+def _reserve_ids(count: int) -> int:
+    """ID 카운터(DynamoDB: Atomic Counter)를 count만큼 증가시키고 예약한 마지막 ID 반환"""
     try:
-        resp = table.update_item(
-            Key={"counter_name": _COUNTER_KEY},
-            UpdateExpression="SET last_id = if_not_exists(last_id, :zero) + :inc",
-            ExpressionAttributeValues={":zero": 0, ":inc": 1},
-            ReturnValues="UPDATED_NEW",
-        )
-        return int(resp["Attributes"]["last_id"])
+        return STORAGE.reserve_ids(count)
     except Exception as e:
         print(f"Counter Update Error: {str(e)}")
         raise e
 
+# 컨테이너 단위 ID 블록 임대 (ID_BLOCK_SIZE=1이면 요청마다 카운터 1 증가)
+# 컨테이너 종료/임대 만료로 남은 ID는 반납하지 않고 결번 처리 (카운터는 감소하지 않음 -> redirect 존재 필터 전제)
+_ID_ALLOCATOR = BlockIdAllocator(
+    _reserve_ids,
+    block_size=int(os.environ.get("ID_BLOCK_SIZE", "1")),
+    lease_ttl=float(os.environ.get("ID_BLOCK_TTL", "60")),
+)
+
+_SNOWFLAKE = SnowflakeGenerator() if ID_STRATEGY == "snowflake" else None
+
+def _get_next_id() -> int:
+    """단축 코드용 ID 할당 (snowflake 모드는 로컬 생성, 그 외에는 임대한 카운터 블록에서 할당)"""
+    if _SNOWFLAKE is not None:
+        return _SNOWFLAKE.next_id()
+    return _ID_ALLOCATOR.next_id()
+
 def _save_mapping(short_code: str, original_url: str, ai_result: dict) -> None:
-    """단축 정보 및 AI 분석 결과를 DynamoDB에 저장"""
-    table = DYNAMO.Table(MAPPING_TABLE_NAME)
-    table.put_item(
-        Item={
-            "shortCode": short_code,
-            "originalUrl": original_url,
-            "category": ai_result.get("category", "기타"),
-            "summary": ai_result.get("summary", "분석 없음"),
-            "createdAt": datetime.now().isoformat()
-        }
-    )
+    """단축 정보 및 AI 분석 결과 저장 (이미 존재하는 shortCode는 덮어쓰지 않고 storage.Conflict)"""
+    STORAGE.put_mapping({
+        "shortCode": short_code,
+        "originalUrl": original_url,
+        "category": ai_result.get("category", "기타"),
+        "summary": ai_result.get("summary", "분석 없음"),
+        "createdAt": datetime.now().isoformat()
+    })
+
+def _update_category(short_code: str, ai_result: dict) -> None:
+    """비동기 분류 결과로 매핑의 category/summary 갱신"""
+    STORAGE.update_mapping(short_code, {
+        "category": ai_result.get("category", "기타"),
+        "summary": ai_result.get("summary", "분석 없음"),
+    })
+
+def _classify_job(job: dict, fallback: bool = False) -> None:
+    """분류 작업 1건 처리: Bedrock 분석 후 매핑 갱신
+    Bedrock 오류는 그대로 전파해 SQS 재시도 / DLQ로 넘김 (fallback=True면 기본값으로 갱신)
+    """
+    ai_result = _get_ai_analysis(job["url"]) if fallback else _analyze_url(job["url"])
+    _update_category(job["shortCode"], ai_result)
+    print(f"Classified: {job['shortCode']} -> {ai_result.get('category')}")
+
+def _classify_inline(job: dict) -> dict:
+    """큐에 넣지 못한 분류 작업을 직접 처리 (Bedrock 실패 시 기본값), 매핑에 반영한 결과 반환"""
+    ai_result = _get_ai_analysis(job["url"])
+    try:
+        _update_category(job["shortCode"], ai_result)
+    except Exception as e:
+        print(f"DEBUG ERROR in _classify_inline: {str(e)}")
+    return ai_result
+
+def _enqueue_classification(jobs: list) -> dict:
+    """분류 작업을 큐에 전송, 전송하지 못한 작업은 직접 분류 -> shortCode -> 직접 분류한 결과
+
+    매핑은 이미 저장된 상태이므로 큐 오류로 500을 반환하거나 분석중 상태로 남기지 않음
+    """
+    try:
+        unsent = _get_classify_queue().send_many(jobs)
+    except Exception as e:
+        print(f"DEBUG ERROR in _enqueue_classification: {str(e)}")
+        unsent = jobs
+    return {job["shortCode"]: _classify_inline(job) for job in unsent}
+
+_CLASSIFY_QUEUE = None
+
+def _get_classify_queue():
+    """분류 큐 (CLASSIFY_QUEUE_URL이 있으면 SQS, 없으면 프로세스 내 큐)"""
+    global _CLASSIFY_QUEUE
+    if _CLASSIFY_QUEUE is None:
+        if CLASSIFY_QUEUE_URL:
+            _CLASSIFY_QUEUE = SqsQueue(CLASSIFY_QUEUE_URL, clients.sqs())
+        else:
+            # 프로세스 내 큐는 재시도가 없으므로 실패 시 분석중 상태로 남지 않도록 기본값으로 갱신
+            _CLASSIFY_QUEUE = LocalQueue(functools.partial(_classify_job, fallback=True))
+    return _CLASSIFY_QUEUE
+
+def _url_hash(url: str) -> str:
+    """중복 판별 키 (입력 URL 그대로의 SHA-256, 추적 파라미터가 다른 링크는 별도 코드)"""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+# 기존 매핑 응답에 필요한 속성만 읽기
+_MAPPING_ATTRIBUTES = ("shortCode", "originalUrl", "category", "summary")
+
+def _find_existing(original_url: str):
+    """이미 단축된 URL이면 기존 매핑 반환"""
+    url_hash = _url_hash(original_url)
+    short_code = STORAGE.get_url_codes([url_hash]).get(url_hash)
+    if not short_code:
+        return None
+    item = STORAGE.get_mapping(short_code, attributes=_MAPPING_ATTRIBUTES)
+    if not item or item.get("originalUrl") != original_url:
+        return None
+    return item
+
+def _save_url_index(original_url: str, short_code: str) -> None:
+    """urlHash -> shortCode 인덱스 저장 (동시 생성 시 먼저 저장된 코드 유지)"""
+    try:
+        STORAGE.put_url_index(_url_hash(original_url), short_code, datetime.now().isoformat())
+    except Exception as e:
+        print(f"Url Index Error: {str(e)}")
+
+def _find_existing_many(urls: list) -> dict:
+    """이미 단축된 URL들의 기존 매핑 일괄 조회, url -> item"""
+    hashes = {url: _url_hash(url) for url in urls}
+    index = STORAGE.get_url_codes(list(hashes.values()))
+    codes = {url: index[h] for url, h in hashes.items() if h in index}
+    mappings = STORAGE.get_mappings(list(codes.values()), attributes=_MAPPING_ATTRIBUTES)
+    return {
+        url: mappings[code] for url, code in codes.items()
+        if code in mappings and mappings[code].get("originalUrl") == url
+    }
+
+def _allocate_ids(count: int) -> list:
+    """일괄 생성용 ID 목록 (counter: 카운터 1회 증가로 연속 구간 예약, snowflake: 로컬 생성)"""
+    if _SNOWFLAKE is not None:
+        return [_SNOWFLAKE.next_id() for _ in range(count)]
+    last = _reserve_ids(count)
+    return list(range(last - count + 1, last + 1))
+
+def _short_url(event: dict, short_code: str) -> str:
+    host = (event.get('headers') or {}).get('Host', 'localhost')
+    stage = event.get('requestContext', {}).get('stage', 'Prod')
+    return f"https://{host}/{stage}/{short_code}"
+
+def _classify_for_create(original_url: str):
+    """(분류 결과, 비동기 분류 대기 여부) 반환 - async 모드는 캐시 적중 외에는 분석중 상태"""
+    if CLASSIFY_MODE == "async":
+        ai_result = _lookup_category_cache(original_url)
+        if ai_result is None:
+            return {"category": PENDING_CATEGORY, "summary": PENDING_SUMMARY}, True
+        return ai_result, False
+    return _get_ai_analysis(original_url), False
+
+def _save_with_retry(short_code: str, original_url: str, ai_result: dict) -> str:
+    """매핑 저장 (worker id 충돌 등으로 코드가 겹치면 새 ID로 재시도), 저장된 코드 반환
+
+    충돌한 기존 항목이 같은 URL이면 이전 시도(응답만 실패한 쓰기 / 일괄 저장)가 저장한 것이므로 그대로 사용
+    """
+    for attempt in range(_SAVE_ATTEMPTS):
+        try:
+            _save_mapping(short_code, original_url, ai_result)
+            return short_code
+        except storage.Conflict as e:
+            existing = e.existing
+            if existing is None:
+                existing = STORAGE.get_mapping(short_code, attributes=("originalUrl",))
+            if existing and existing.get("originalUrl") == original_url:
+                return short_code
+            if attempt == _SAVE_ATTEMPTS - 1:
+                raise
+            print(f"ShortCode Conflict: {short_code}, retrying")
+            short_code = encode(_get_next_id())
+    return short_code
+
+def _save_many(items: list) -> set:
+    """매핑 일괄 저장, 최종 실패한 shortCode 집합 반환
+    일괄 저장에서 충돌(worker id 충돌 등) / 실패한 항목은 _save_with_retry로 다시 저장하고 새 코드를 item에 반영
+    """
+    failed = set()
+    for item in STORAGE.put_mappings(items):
+        try:
+            item["shortCode"] = _save_with_retry(item["shortCode"], item["originalUrl"], item)
+        except Exception as e:
+            print(f"Batch Save Error: {item['shortCode']}: {str(e)}")
+            failed.add(item["shortCode"])
+    return failed
+
+def _record_timings(timer) -> dict:
+    """단계별 소요 시간 로그(TIMINGS) 및 EMF 지표 기록"""
+    timings = timer.finish()
+    print(f"TIMINGS: {json.dumps(timings)}")
+    metrics.emit({f"CreateStage_{name}": ms for name, ms in timings.items()}, unit="Milliseconds")
+    return timings
 
 def handler(event, context):
     """Lambda 핸들러 메인 함수"""
@@ -104,40 +341,188 @@ def handler(event, context):
         if not original_url:
             return _response(400, {"error": "url 필드가 필요합니다."})
 
-        # 1. 시퀀스 ID 획득 및 인코딩
-        short_id = _get_next_id()
-        short_code = encode(short_id)
+        timer = metrics.StageTimer()
 
-        # 2. Bedrock AI 분석 실행
-        ai_result = _get_ai_analysis(original_url)
+        # 0. 중복 생성 확인 (적중 시 카운터/AI/저장 모두 생략)
+        if DEDUP_ENABLED:
+            existing = timer.run("dedup", _find_existing, original_url)
+            if existing:
+                _record_timings(timer)
+                return _response(200, {
+                    "shortCode": existing["shortCode"],
+                    "shortUrl": _short_url(event, existing["shortCode"]),
+                    "originalUrl": original_url,
+                    "category": existing.get("category"),
+                    "summary": existing.get("summary"),
+                    "deduplicated": True,
+                }, headers={"Server-Timing": timer.server_timing()})
+
+        # 1~2. ID 획득과 AI 분석은 서로 독립적이므로 동시에 실행 (지연 = max(counter, Bedrock))
+        id_future = _EXECUTOR.submit(timer.run, "id", _get_next_id)
+        ai_result, pending = timer.run("ai", _classify_for_create, original_url)
+        short_code = encode(id_future.result())
 
         # 3. DB에 매핑 정보 저장
-        _save_mapping(short_code, original_url, ai_result)
+        short_code = timer.run("save", _save_with_retry, short_code, original_url, ai_result)
 
-        # 4. 최종 URL 생성 및 응답
-        host = event['headers'].get('Host', 'localhost')
-        stage = event.get('requestContext', {}).get('stage', 'Prod')
-        short_url = f"https://{host}/{stage}/{short_code}"
+        if pending:
+            inline = _enqueue_classification([{"shortCode": short_code, "url": original_url}])
+            ai_result = inline.get(short_code, ai_result)
+        if DEDUP_ENABLED:
+            timer.run("index", _save_url_index, original_url, short_code)
 
+        # 4. 최종 URL 생성 및 응답
+        _record_timings(timer)
         return _response(201, {
             "shortCode": short_code, 
-            "shortUrl": short_url,
+            "shortUrl": _short_url(event, short_code),
             "originalUrl": original_url,
             "category": ai_result.get("category"),
             "summary": ai_result.get("summary")
-        })
+        }, headers={"Server-Timing": timer.server_timing()})
 
     except Exception as e:
         print(f"Execution Error: {str(e)}")
         return _response(500, {"error": "Internal Server Error", "details": str(e)})
 
-def _response(status_code: int, body: dict) -> dict:
+def batch_handler(event, context):
+    """일괄 생성 핸들러 (POST /create/batch, body: {"urls": [...]}) - 항목별 결과/오류 반환"""
+    try:
+        body = json.loads(event.get("body") or "{}")
+        urls = body.get("urls") if isinstance(body, dict) else None
+        if not isinstance(urls, list) or not urls:
+            return _response(400, {"error": "urls 배열이 필요합니다."})
+        if len(urls) > BATCH_MAX_URLS:
+            return _response(400, {"error": f"한 번에 최대 {BATCH_MAX_URLS}개까지 요청할 수 있습니다."})
+
+        timer = metrics.StageTimer()
+        results = [None] * len(urls)
+        todo = []
+        for i, url in enumerate(urls):
+            url = url.strip() if isinstance(url, str) else ""
+            if not url:
+                results[i] = {"index": i, "error": "url 값이 비어 있습니다."}
+            else:
+                todo.append((i, url))
+
+        # 0. 중복 생성 확인
+        if DEDUP_ENABLED and todo:
+            existing = timer.run("dedup", _find_existing_many, [url for _, url in todo])
+            remaining = []
+            for i, url in todo:
+                item = existing.get(url)
+                if item:
+                    results[i] = {
+                        "index": i,
+                        "shortCode": item["shortCode"],
+                        "shortUrl": _short_url(event, item["shortCode"]),
+                        "originalUrl": url,
+                        "category": item.get("category"),
+                        "summary": item.get("summary"),
+                        "deduplicated": True,
+                    }
+                else:
+                    remaining.append((i, url))
+            todo = remaining
+
+        if todo:
+            # 같은 요청 안의 동일 URL은 dedup 모드에서 하나의 코드를 공유
+            if DEDUP_ENABLED:
+                unique_urls = list(dict.fromkeys(url for _, url in todo))
+            else:
+                unique_urls = [url for _, url in todo]
+
+            # 1. ID 구간 예약 (카운터 1회) - AI 분류와 동시에 실행
+            ids_future = _EXECUTOR.submit(timer.run, "id", _allocate_ids, len(unique_urls))
+
+            # 2. AI 분류 (다건 프롬프트 / async 모드는 분석중 저장 후 큐 적재)
+            if CLASSIFY_MODE == "async":
+                cached = [_lookup_category_cache(url) for url in unique_urls]
+                ai_results = [
+                    c or {"category": PENDING_CATEGORY, "summary": PENDING_SUMMARY} for c in cached
+                ]
+            else:
+                cached = None
+                ai_results = timer.run("ai", _get_ai_analysis_batch, unique_urls)
+            codes = encode_many(ids_future.result())
+
+            # 3. 매핑 일괄 저장 (DynamoDB: 조건부 TransactWriteItems, 충돌 / 실패 항목은 단건 저장으로 재시도)
+            now = datetime.now().isoformat()
+            items = [
+                {
+                    "shortCode": code,
+                    "originalUrl": url,
+                    "category": ai.get("category", "기타"),
+                    "summary": ai.get("summary", "분석 없음"),
+                    "createdAt": now,
+                }
+                for code, url, ai in zip(codes, unique_urls, ai_results)
+            ]
+            failed = timer.run("save", _save_many, items)
+            saved = [item for item in items if item["shortCode"] not in failed]
+
+            if cached is not None:
+                jobs = [
+                    {"shortCode": item["shortCode"], "url": item["originalUrl"]}
+                    for item, c in zip(items, cached) if c is None and item["shortCode"] not in failed
+                ]
+                if jobs:
+                    inline = _enqueue_classification(jobs)
+                    for item in items:
+                        ai = inline.get(item["shortCode"])
+                        if ai:
+                            item.update(category=ai.get("category", "기타"), summary=ai.get("summary", "분석 없음"))
+            if DEDUP_ENABLED and saved:
+                STORAGE.put_url_indexes([
+                    {"urlHash": _url_hash(item["originalUrl"]), "shortCode": item["shortCode"], "createdAt": now}
+                    for item in saved
+                ])
+
+            by_url = {}
+            if DEDUP_ENABLED:
+                by_url = {item["originalUrl"]: item for item in items}
+            for n, (i, url) in enumerate(todo):
+                item = by_url.get(url) if DEDUP_ENABLED else items[n]
+                if item["shortCode"] in failed:
+                    results[i] = {"index": i, "originalUrl": url, "error": "저장 실패"}
+                    continue
+                results[i] = {
+                    "index": i,
+                    "shortCode": item["shortCode"],
+                    "shortUrl": _short_url(event, item["shortCode"]),
+                    "originalUrl": url,
+                    "category": item["category"],
+                    "summary": item["summary"],
+                }
+
+        errors = sum(1 for r in results if "error" in r)
+        _record_timings(timer)
+        return _response(200, {"results": results, "succeeded": len(results) - errors, "failed": errors},
+                         headers={"Server-Timing": timer.server_timing()})
+
+    except Exception as e:
+        print(f"Batch Execution Error: {str(e)}")
+        return _response(500, {"error": "Internal Server Error", "details": str(e)})
+
+def classify_handler(event, context):
+    """분류 워커 람다 (SQS 이벤트): 실패한 메시지만 재시도되도록 batchItemFailures 반환"""
+    failures = []
+    for record in event.get("Records", []):
+        try:
+            _classify_job(json.loads(record["body"]))
+        except Exception as e:
+            print(f"Classify Error: {str(e)}")
+            failures.append({"itemIdentifier": record.get("messageId")})
+    return {"batchItemFailures": failures}
+
+def _response(status_code: int, body: dict, headers: dict = None) -> dict:
     """API Gateway 표준 응답 포맷"""
     return {
         "statusCode": status_code,
         "headers": {
             "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*"
+            "Access-Control-Allow-Origin": "*",
+            **(headers or {}),
         },
         "body": json.dumps(body, ensure_ascii=False),
     }
\ No newline at end of file
@@ -1,48 +1,277 @@
 import json
 import os
+import threading
+import time
+from collections import deque
 from datetime import datetime, timezone
-import boto3
 
-# 전역 리소스 초기화
-_DYNAMO = boto3.resource("dynamodb")
+from common import metrics, snowflake, storage
+from common.base62 import Base62Error, decode
+from common.bloom import BloomFilter
+from common.buckets import hour_bucket
+from common.cache import TTLCache
+from common.classify_queue import PENDING_CATEGORY
+from common.lambda_extension import PostResponseHook
+from common.write_behind import WriteBehindBuffer
 
-def _get_table(env_name):
-    """환경변수로부터 테이블 객체 안전하게 로드"""
-    table_name = os.environ.get(env_name)
-    if not table_name:
-        print(f"DEBUG ERROR: Environment variable {env_name} is missing!")
+# 저장소 (STORAGE_BACKEND: dynamo | sqlite | memory)
+_STORAGE = storage.from_env()
+
+# shortCode -> (originalUrl, category) 매핑 캐시 (웜 컨테이너 간 유지)
+_MAPPING_CACHE = TTLCache(
+    maxsize=int(os.environ.get("MAPPING_CACHE_SIZE", "10000")),
+    ttl=float(os.environ.get("MAPPING_CACHE_TTL", "300")),
+)
+
+# 매핑 캐시 지표(EMF) 출력 주기 (요청 수, 0이면 출력하지 않음)
+_CACHE_METRICS_EVERY = int(os.environ.get("CACHE_METRICS_EVERY", "1000"))
+_cache_metrics = {"requests": 0, "last": {}}
+_metrics_lock = threading.Lock()
+
+# 존재하지 않는 shortCode 조회 결과 캐시 (404 반복 조회 차단)
+# 곧 발급될 수 있는 코드(확정된 high-water mark 이후)는 캐시하지 않음 -> _is_settled
+_NEGATIVE_CACHE = TTLCache(
+    maxsize=int(os.environ.get("NEGATIVE_CACHE_SIZE", "50000")),
+    ttl=float(os.environ.get("NEGATIVE_CACHE_TTL", "30")),
+)
+
+# 발급 여부 사전 판별 모드: off | range(카운터 최대값) | bloom(range + 매핑 테이블 Bloom 필터)
+_EXISTENCE_FILTER = os.environ.get("EXISTENCE_FILTER", "range").strip().lower()
+# create 함수와 같은 ID 생성 방식 (counter -> snowflake 전환은 가능, 반대 방향은 EXISTENCE_FILTER=off 필요)
+_ID_STRATEGY = os.environ.get("ID_STRATEGY", "counter").strip().lower()
+_SNOWFLAKE_SKEW_MS = 1000  # 컨테이너 간 시계 오차 허용치
+_HWM_REFRESH_SECONDS = float(os.environ.get("HWM_REFRESH_SECONDS", "5"))
+# Bloom 빌드 전 대기 시간: 카운터 값을 읽은 시점에 예약된 ID의 put_item이 끝나도록
+# Create 함수의 ID_BLOCK_TTL(60) + Lambda Timeout보다 길게 설정 (template.yaml과 같은 기본값)
+_BLOOM_BUILD_DELAY = float(os.environ.get("BLOOM_BUILD_DELAY", "90"))
+_BLOOM_ERROR_RATE = float(os.environ.get("BLOOM_ERROR_RATE", "0.01"))
+# 필터 재구성 주기 (그 사이 생성된 코드는 coverage 밖이라 저장소 조회로 처리)
+_BLOOM_REBUILD_SECONDS = float(os.environ.get("BLOOM_REBUILD_SECONDS", "600"))
+# 필터 크기 상한 (초과해도 오탐률만 올라가고 "없음" 판정은 여전히 정확)
+_BLOOM_MAX_CAPACITY = int(os.environ.get("BLOOM_MAX_CAPACITY", "5000000"))
+
+_hwm = {"value": None, "checked_at": float("-inf")}
+_hwm_reads = deque(maxlen=32)  # (monotonic 시각, 재조회한 high-water mark)
+_bloom = {"filter": None, "coverage": 0, "building": False, "started_at": float("-inf")}
+_filter_lock = threading.Lock()
+
+def _read_counter_hwm():
+    """지금까지 발급되었을 수 있는 최대 ID 조회 (snowflake: 현재 시각 기준 상한, counter: SurlCounter last_id)"""
+    if _ID_STRATEGY == "snowflake":
+        return snowflake.max_id_at(time.time_ns() // 1_000_000 + _SNOWFLAKE_SKEW_MS)
+    try:
+        return _STORAGE.read_counter()
+    except Exception as e:
+        print(f"DEBUG ERROR in _read_counter_hwm: {str(e)}")
         return None
-    return _DYNAMO.Table(table_name)
 
-def _save_click_log(short_code: str, category: str, event: dict) -> None:
-    """클릭 로그 저장 로직"""
+def _refresh_hwm():
+    """high-water mark 재조회 후 반환 (갱신 주기 내라서 재조회하지 않았거나 조회 실패 시 None)"""
+    now = time.monotonic()
+    with _filter_lock:
+        if now - _hwm["checked_at"] < _HWM_REFRESH_SECONDS:
+            return None
+        _hwm["checked_at"] = now
+    value = _read_counter_hwm()
+    if value is None:
+        return None
+    with _filter_lock:
+        _hwm_reads.append((now, value))
+        _hwm["value"] = max(value, _hwm["value"] or 0)
+        return _hwm["value"]
+
+def _current_hwm():
+    """캐시된 high-water mark 반환 (아직 없으면 조회)"""
+    value = _hwm["value"]
+    if value is not None:
+        return value
+    return _refresh_hwm()
+
+def _settled_hwm():
+    """_BLOOM_BUILD_DELAY 이전에 확인한 high-water mark (이하 ID는 예약된 블록의 저장까지 끝났거나 임대가 만료됨)"""
+    if _ID_STRATEGY == "snowflake":
+        return snowflake.max_id_at(time.time_ns() // 1_000_000 - int(_BLOOM_BUILD_DELAY * 1000))
+    if not _hwm_reads:
+        _refresh_hwm()
+    cutoff = time.monotonic() - _BLOOM_BUILD_DELAY
+    with _filter_lock:
+        settled = [value for checked_at, value in _hwm_reads if checked_at <= cutoff]
+    return max(settled) if settled else None
+
+def _is_settled(short_code: str) -> bool:
+    """없는 코드가 이후에도 발급될 수 없으면 True (부정 캐시 대상)
+
+    카운터 코드는 순차 발급이라 다음 코드를 미리 조회한 결과를 캐시하면 몇 초 뒤 생성된 링크가 TTL 동안 404가 됨
+    """
+    try:
+        code_id = decode(short_code, strict=True)
+    except Base62Error:
+        return True
+    settled = _settled_hwm()
+    return settled is not None and code_id <= settled
+
+def _bloom_capacity(coverage: int) -> int:
+    """새 필터 크기: 이전 필터 항목 수(없으면 카운터 최대값) 기준 여유분 포함"""
+    previous = _bloom["filter"]
+    if previous is not None:
+        estimate = len(previous) * 1.5
+    elif _ID_STRATEGY == "snowflake":
+        estimate = _BLOOM_MAX_CAPACITY
+    else:
+        estimate = coverage * 1.2
+    return min(max(1000, int(estimate)), _BLOOM_MAX_CAPACITY)
+
+def _build_bloom() -> None:
+    """매핑 테이블 전체 shortCode로 Bloom 필터 구성 (백그라운드 스레드, 스캔 페이지를 바로 필터에 추가)"""
     try:
-        # 템플릿의 변수명 LOG_TABLE_NAME 사용
-        log_table = _get_table("LOG_TABLE_NAME")
-        if log_table is None:
+        coverage = _read_counter_hwm()
+        if coverage is None:
             return
+        time.sleep(_BLOOM_BUILD_DELAY)
+
+        bloom = BloomFilter(capacity=_bloom_capacity(coverage), error_rate=_BLOOM_ERROR_RATE)
+        bloom.update(_STORAGE.iter_short_codes())
+        with _filter_lock:
+            _bloom["filter"] = bloom
+            _bloom["coverage"] = coverage
+        print(f"DEBUG SUCCESS: Bloom filter built ({len(bloom)} codes, coverage <= {coverage})")
+    except Exception as e:
+        print(f"DEBUG ERROR in _build_bloom: {str(e)}")
+    finally:
+        with _filter_lock:
+            _bloom["building"] = False
+
+def _ensure_bloom() -> None:
+    """필터가 없거나 재구성 주기가 지났으면 백그라운드 재구성 시작 (실패해도 다음 주기에 재시도)"""
+    now = time.monotonic()
+    with _filter_lock:
+        if _bloom["building"] or now - _bloom["started_at"] < _BLOOM_REBUILD_SECONDS:
+            return
+        _bloom["building"] = True
+        _bloom["started_at"] = now
+    threading.Thread(target=_build_bloom, name="bloom-builder", daemon=True).start()
+
+def _is_unissued(short_code: str) -> bool:
+    """저장소 조회 없이 발급된 적 없음을 증명할 수 있으면 True"""
+    if _EXISTENCE_FILTER not in ("range", "bloom"):
+        return False
+    # 카운터는 1부터 발급되며 encode 결과는 항상 정규형(앞자리 0 없음)
+    try:
+        code_id = decode(short_code, strict=True)
+    except Base62Error:
+        return True
+    if code_id == 0:
+        return True
 
+    hwm = _current_hwm()
+    if hwm is not None and code_id > hwm:
+        # 캐시된 값 이후에 발급된 코드일 수 있으므로 이번 호출에서 실제로 재조회한 값으로만 거절
+        # (갱신 주기 내라 재조회하지 못했으면 저장소 조회로 넘김 -> 방금 생성된 링크가 404가 되지 않음)
+        hwm = _refresh_hwm()
+        if hwm is not None and code_id > hwm:
+            return True
+
+    if _EXISTENCE_FILTER == "bloom":
+        _ensure_bloom()
+        bloom, coverage = _bloom["filter"], _bloom["coverage"]
+        if bloom is not None and code_id <= coverage and short_code not in bloom:
+            return True
+    return False
+
+def _get_mapping(short_code: str):
+    """매핑 조회 (캐시 우선, miss 시 저장소 조회)"""
+    cached = _MAPPING_CACHE.get(short_code)
+    if cached is not None:
+        return cached
+    if short_code in _NEGATIVE_CACHE or _is_unissued(short_code):
+        return None
+
+    item = _STORAGE.get_mapping(short_code, attributes=("originalUrl", "category"))
+    if not item:
+        if _is_settled(short_code):
+            _NEGATIVE_CACHE.set(short_code, True)
+        return None
+
+    mapping = {
+        "originalUrl": item.get("originalUrl"),
+        "category": item.get("category", "기타"),
+    }
+    # 분류 대기중인 매핑은 category가 곧 갱신되므로 캐시하지 않음
+    if mapping["originalUrl"] and mapping["category"] != PENDING_CATEGORY:
+        _MAPPING_CACHE.set(short_code, mapping)
+    return mapping
+
+def _flush_click_logs(items: list) -> list:
+    """버퍼에 쌓인 클릭 로그를 일괄 저장 (DynamoDB: batch_write_item, 실패 항목 반환)"""
+    failed = _STORAGE.put_clicks(items)
+    print(f"DEBUG SUCCESS: {len(items) - len(failed)} click logs flushed")
+    return failed
+
+# hourBucket GSI 쓰기 분산용 샤드 수 (trend 함수와 같은 값이어야 함)
+_CLICK_BUCKET_SHARDS = int(os.environ.get("CLICK_BUCKET_SHARDS", "1"))
+
+# 클릭 로그 저장 모드: buffer(write-behind, 기본) | sync(요청마다 put_item)
+_CLICK_LOG_MODE = os.environ.get("CLICK_LOG_MODE", "buffer").strip().lower()
+_CLICK_BUFFER = WriteBehindBuffer(
+    _flush_click_logs,
+    max_items=int(os.environ.get("CLICK_FLUSH_SIZE", "25")),
+    max_age=float(os.environ.get("CLICK_FLUSH_AGE", "1")),
+    interval=float(os.environ.get("CLICK_FLUSH_INTERVAL", "0.5")),
+)
+# Lambda에서는 internal extension으로 응답을 보낸 뒤 같은 호출 안에서 버퍼를 비움
+# (응답 후 컨테이너가 멈추면 flush 스레드가 돌지 못하고, 회수될 때 atexit도 실행되지 않음)
+# Lambda 밖(로컬 서버)은 flush 스레드 + 종료 시 flush, 등록에 실패하면 기한이 된 배치만 요청 스레드에서 저장
+_POST_RESPONSE = PostResponseHook(_CLICK_BUFFER.flush)
+_FLUSH_AFTER_RESPONSE = _CLICK_LOG_MODE == "buffer" and _POST_RESPONSE.start()
+_IN_LAMBDA = bool(os.environ.get("AWS_LAMBDA_RUNTIME_API"))
+
+def _save_click_log(short_code: str, category: str, event: dict) -> None:
+    """클릭 로그 저장 로직"""
+    try:
         # IP 추출
         request_context = event.get("requestContext", {})
         identity = request_context.get("identity", {})
         ip = identity.get("sourceIp", "unknown")
         
         timestamp = datetime.now(timezone.utc).isoformat()
-        
-        # DynamoDB 저장
-        log_table.put_item(
-            Item={
-                "shortCode": short_code,
-                "timestamp": timestamp,
-                "category": category,
-                "ip": ip,
-            }
-        )
+        item = {
+            "shortCode": short_code,
+            "timestamp": timestamp,
+            "category": category,
+            "ip": ip,
+            # trend가 시간 버킷 GSI로 조회할 수 있도록 기록
+            "hourBucket": hour_bucket(timestamp, short_code, _CLICK_BUCKET_SHARDS),
+        }
+
+        if _CLICK_LOG_MODE == "buffer":
+            _CLICK_BUFFER.add(item)
+            if _IN_LAMBDA and not _FLUSH_AFTER_RESPONSE:
+                _CLICK_BUFFER.flush_if_due()
+            return
+
+        _STORAGE.put_click(item)
         print(f"DEBUG SUCCESS: Log saved for {short_code}")
 
     except Exception as e:
         print(f"DEBUG ERROR in _save_click_log: {str(e)}")
 
+def _emit_cache_metrics() -> None:
+    """_CACHE_METRICS_EVERY 요청마다 직전 출력 이후의 캐시 hit/miss/eviction 증분을 EMF로 출력"""
+    if _CACHE_METRICS_EVERY <= 0:
+        return
+    with _metrics_lock:
+        _cache_metrics["requests"] += 1
+        if _cache_metrics["requests"] < _CACHE_METRICS_EVERY:
+            return
+        _cache_metrics["requests"] = 0
+        stats = _MAPPING_CACHE.stats()
+        last, _cache_metrics["last"] = _cache_metrics["last"], stats
+    names = {"hits": "MappingCacheHits", "misses": "MappingCacheMisses",
+             "evictions": "MappingCacheEvictions", "expirations": "MappingCacheExpirations"}
+    values = {metric: stats[key] - last.get(key, 0) for key, metric in names.items()}
+    values["MappingCacheSize"] = stats["size"]
+    metrics.emit(values)
+
 def _response(status_code: int, body: dict) -> dict:
     return {
         "statusCode": status_code,
@@ -64,7 +293,14 @@ def _redirect_response(location: str) -> dict:
     }
 
 def handler(event, context):
-    """Lambda 진입점"""
+    """Lambda 진입점 (응답 후 클릭 로그 flush 예약)"""
+    try:
+        return _handle(event)
+    finally:
+        if _FLUSH_AFTER_RESPONSE:
+            _POST_RESPONSE.invocation_done()
+
+def _handle(event):
     try:
         # 1. Path Parameter 추출
         path_params = event.get("pathParameters") or {}
@@ -73,13 +309,13 @@ def handler(event, context):
         if not short_code:
             return _response(400, {"error": "shortCode is required"})
 
-        # 2. 매핑 테이블 조회 (환경변수명 MAPPING_TABLE_NAME으로 수정)
-        mapping_table = _get_table("MAPPING_TABLE_NAME")
-        if not mapping_table:
+        # 2. 매핑 조회 (캐시 -> 저장소)
+        try:
+            item = _get_mapping(short_code)
+        except RuntimeError:
             return _response(500, {"error": "Server configuration error"})
-
-        resp = mapping_table.get_item(Key={"shortCode": short_code})
-        item = resp.get("Item")
+        finally:
+            _emit_cache_metrics()
 
         if not item:
             return _response(404, {"error": "URL not found"})
@@ -0,0 +1,93 @@
+"""
+링크별 클릭 통계 람다 (GET /stats/{shortCode})
+클릭 로그의 기본 키(shortCode, timestamp)로 해당 링크 파티션의 기간만 조회 (DynamoDB: Query)
+페이지 단위로 버킷별 클릭 수와 고유 IP 수를 집계 (항목 리스트를 만들지 않음)
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from common import storage
+from common.cache import TTLCache
+from common.sketch import UniqueCounter
+
+_STORAGE = storage.from_env()
+
+# 같은 링크/구간 반복 조회(대시보드 폴링) 응답 캐시
+_STATS_CACHE = TTLCache(
+    maxsize=int(os.environ.get("STATS_CACHE_SIZE", "2000")),
+    ttl=float(os.environ.get("STATS_CACHE_TTL", "30")),
+)
+# 고유 IP를 정확히 세는 최대 개수 (초과 시 HyperLogLog 근사로 전환)
+_UNIQUE_EXACT_LIMIT = int(os.environ.get("STATS_UNIQUE_EXACT_LIMIT", "10000"))
+_MAX_BUCKETS = int(os.environ.get("STATS_MAX_BUCKETS", "1440"))
+_MAX_MINUTES = 30 * 1440
+
+
+def _link_stats(pages, since_dt: datetime, minutes: int, bucket_minutes: int) -> dict:
+    """페이지를 순회하며 버킷별 클릭 수 / 고유 IP 집계"""
+    buckets = max(1, -(-minutes // bucket_minutes))
+    counts = [0] * buckets
+    uniques = UniqueCounter(threshold=_UNIQUE_EXACT_LIMIT)
+    bucket_seconds = bucket_minutes * 60
+    for page in pages:
+        for item in page:
+            offset = (datetime.fromisoformat(item["timestamp"]) - since_dt).total_seconds()
+            index = min(buckets - 1, max(0, int(offset // bucket_seconds)))
+            counts[index] += 1
+            uniques.add(item.get("ip", "unknown"))
+    return {
+        "count": sum(counts),
+        "uniqueVisitors": uniques.count(),
+        "uniqueExact": uniques.exact,
+        "bucketMinutes": bucket_minutes,
+        "series": [
+            {"start": (since_dt + timedelta(minutes=i * bucket_minutes)).isoformat(), "count": n}
+            for i, n in enumerate(counts)
+        ],
+    }
+
+
+def _response(status_code: int, body: dict) -> dict:
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": "*"
+        },
+        "body": json.dumps(body, ensure_ascii=False),
+    }
+
+
+def handler(event, context):
+    """Stats Lambda 진입점 (?minutes=1440&bucket=60)"""
+    try:
+        short_code = ((event.get("pathParameters") or {}).get("shortCode") or "").strip()
+        if not short_code:
+            return _response(400, {"error": "shortCode is required"})
+
+        query = event.get("queryStringParameters") or {}
+        try:
+            minutes = max(1, min(_MAX_MINUTES, int(query.get("minutes", 1440))))
+            bucket_minutes = max(1, int(query.get("bucket", 60)))
+        except (TypeError, ValueError):
+            return _response(400, {"error": "minutes/bucket must be integers"})
+        # 버킷 수 상한을 넘으면 버킷 크기를 키움
+        bucket_minutes = max(bucket_minutes, -(-minutes // _MAX_BUCKETS))
+
+        cache_key = (short_code, minutes, bucket_minutes)
+        cached = _STATS_CACHE.get(cache_key)
+        if cached is not None:
+            return _response(200, cached)
+
+        until_dt = datetime.now(timezone.utc)
+        since_dt = until_dt - timedelta(minutes=minutes)
+        pages = _STORAGE.iter_link_click_pages(short_code, since_dt.isoformat(), until_dt.isoformat())
+        body = {"shortCode": short_code, "minutes": minutes, **_link_stats(pages, since_dt, minutes, bucket_minutes)}
+        _STATS_CACHE.set(cache_key, body)
+        return _response(200, body)
+
+    except Exception as e:
+        print(f"DEBUG HANDLER ERROR: {str(e)}")
+        return _response(500, {"error": "Internal Server Error", "details": str(e)})
@@ -8,11 +8,53 @@ import os
 from decimal import Decimal
 from datetime import datetime, timedelta, timezone
 
-import boto3
+from common import clients, dynamo, metrics, storage, timeseries
+from common.buckets import hours_between
+from common.report_cache import TrendReportCache
+from common.rollup import DynamoSketchStore
 
-# 전역 리소스 초기화 (리전 명시)
-_DYNAMO = boto3.resource("dynamodb")
-_BEDROCK = boto3.client("bedrock-runtime", region_name=os.environ.get("AWS_REGION", "ap-northeast-2"))
+# 전역 리소스 (DynamoDB는 init 단계에서 생성, Bedrock은 첫 호출 시 생성 - 저장된 최신 리포트 응답에는 불필요)
+_DYNAMO = dynamo.resource()
+_BEDROCK = None
+# 클릭 로그 / rollup 저장소 (STORAGE_BACKEND: dynamo | sqlite | memory)
+_STORAGE = storage.from_env()
+
+# DynamoDB 클릭 로그 조회 방식: query(hourBucket GSI, 윈도우 크기에 비례) | scan(전체 테이블, 버킷 없는 과거 로그용)
+_FETCH_MODE = os.environ.get("TREND_FETCH_MODE", "query").strip().lower()
+# scan 모드 병렬 세그먼트 수 (1이면 단일 스레드 순차 Scan)
+_SCAN_SEGMENTS = int(os.environ.get("TREND_SCAN_SEGMENTS", "1"))
+# 집계 원천: logs(원본 클릭 로그) | rollup(분 단위 카테고리 사전 집계 테이블, 최대 윈도우도 Query 8회 이내)
+_SOURCE = os.environ.get("TREND_SOURCE", "logs").strip().lower()
+# 시간 버킷 스케치 (고유 방문자 / 인기 링크), 테이블이 설정된 경우에만 응답에 포함
+_SKETCH_TABLE_NAME = os.environ.get("SKETCH_TABLE_NAME")
+_SKETCH_STORE = DynamoSketchStore(_DYNAMO.Table(_SKETCH_TABLE_NAME), _DYNAMO) if _SKETCH_TABLE_NAME else None
+_TOP_LINKS = int(os.environ.get("TREND_TOP_LINKS", "10"))
+
+# 시계열/히트맵 집계 (?bucket=<분>), NumPy가 설치된 경우 벡터화 (auto | off)
+_VECTORIZE = os.environ.get("TREND_VECTORIZE", "auto").strip().lower() != "off"
+_MAX_SERIES_BUCKETS = int(os.environ.get("TREND_MAX_SERIES_BUCKETS", "1440"))
+# 히트맵 시간대 기준 (기본 KST)
+_HEATMAP_TZ_OFFSET = int(os.environ.get("TREND_HEATMAP_TZ_OFFSET", "9"))
+
+# AI 분석 결과 캐시 (윈도우 + 분포 지문, 메모리 + 선택적 DynamoDB 계층)
+_REPORT_CACHE = TrendReportCache(
+    memory_size=int(os.environ.get("TREND_REPORT_CACHE_SIZE", "256")),
+    memory_ttl=float(os.environ.get("TREND_REPORT_CACHE_TTL", "300")),
+    dynamo=_DYNAMO,
+    table_name=os.environ.get("TREND_REPORT_TABLE_NAME"),
+    table_ttl=float(os.environ.get("TREND_REPORT_TABLE_TTL", "3600")),
+    quantum=float(os.environ.get("TREND_REPORT_QUANTUM", "0.05")),
+    max_shift=float(os.environ.get("TREND_REPORT_MAX_SHIFT", "0.1")),
+)
+_AI_ERROR_PREFIX = "[분야] 오류"
+
+# 주기 실행(EventBridge)으로 미리 계산해 두는 표준 윈도우 (1시간/6시간/24시간/7일)
+_PRECOMPUTE_WINDOWS = [int(w) for w in os.environ.get("TREND_PRECOMPUTE_WINDOWS", "60,360,1440,10080").split(",") if w.strip()]
+# 저장된 최신 리포트를 그대로 응답할 최대 경과 시간(초), 초과 시 요청 스레드에서 새로 계산
+_LATEST_MAX_AGE = float(os.environ.get("TREND_LATEST_MAX_AGE", "900"))
+_REPORT_TABLE_NAME = os.environ.get("TREND_REPORT_TABLE_NAME")
+# 리포트 테이블이 없을 때(로컬) 쓰는 프로세스 내 저장소
+_LOCAL_LATEST = {}
 
 
 class DecimalEncoder(json.JSONEncoder):
@@ -23,93 +65,310 @@ class DecimalEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
-def _get_log_table():
-    """환경 변수로부터 로그 테이블 객체 로드"""
-    try:
-        name = os.environ.get("LOG_TABLE_NAME", "SurlClickLogsTable").strip()
-        return _DYNAMO.Table(name)
-    except Exception as e:
-        print(f"DEBUG _get_log_table error: {e}")
-        return None
+def _iter_click_pages(minutes: int = 1440):
+    """최근 N분간의 클릭 로그({timestamp, category})를 페이지 단위로 순회
 
+    전체 항목 리스트를 만들지 않고, 필요한 속성만 요청 (DynamoDB: ProjectionExpression)
+    """
+    # UTC 기준 시간 계산
+    since_dt = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+    return _STORAGE.iter_click_pages(since_dt, _FETCH_MODE)
 
-def _fetch_recent_clicks(minutes: int = 1440) -> list:
-    """최근 N분간의 클릭 로그를 Scan하여 가져옴"""
-    try:
-        table = _get_log_table()
-        if not table:
-            return []
-            
-        # UTC 기준 시간 계산
-        since = (datetime.now(timezone.utc) - timedelta(minutes=minutes)).isoformat()
-        items = []
-        
-        # 필터링 파라미터 (timestamp는 예약어일 수 있으므로 #ts 사용)
-        params = {
-            "FilterExpression": "#ts > :since",
-            "ExpressionAttributeNames": {"#ts": "timestamp"},
-            "ExpressionAttributeValues": {":since": since},
-        }
-        
-        while True:
-            resp = table.scan(**params)
-            items.extend(resp.get("Items", []))
-            if "LastEvaluatedKey" not in resp:
+
+def _window_cutoffs(windows) -> list:
+    """윈도우(분) 목록 -> [(분, 시작 시각 ISO)] (큰 윈도우 = 이른 시작 시각 순)"""
+    now = datetime.now(timezone.utc)
+    return [(w, (now - timedelta(minutes=w)).isoformat()) for w in sorted(set(windows), reverse=True)]
+
+
+def _bin_rows(rows, cutoffs: list, inclusive: bool = False) -> dict:
+    """(timestamp, 카테고리, 클릭 수) 행을 중첩 윈도우별로 집계 -> {분: (stats, count)}
+
+    윈도우가 중첩되어 있으므로 큰 윈도우부터 시작 시각을 비교하다 벗어나면 중단
+    """
+    stats = {w: {} for w, _ in cutoffs}
+    counts = {w: 0 for w, _ in cutoffs}
+    for ts, cat, n in rows:
+        for w, since in cutoffs:
+            if ts < since or (ts == since and not inclusive):
                 break
-            params["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
-            
-        return items
+            stats[w][cat] = stats[w].get(cat, 0) + n
+            counts[w] += n
+    return {w: (stats[w], counts[w]) for w, _ in cutoffs}
+
+
+def _page_rows(pages):
+    for page in pages:
+        for item in page:
+            yield item.get("timestamp", ""), item.get("category", "기타"), 1
+
+
+def _merge_windows(results) -> dict:
+    """세그먼트별 {분: (stats, count)} 결과 병합"""
+    merged = {}
+    for result in results:
+        for w, (stats, count) in result.items():
+            m_stats, m_count = merged.get(w, ({}, 0))
+            for cat, n in stats.items():
+                m_stats[cat] = m_stats.get(cat, 0) + n
+            merged[w] = (m_stats, m_count + count)
+    return merged
+
+
+def _collect_multi_stats(windows) -> dict:
+    """여러 윈도우의 카테고리별 집계를 가장 큰 윈도우 1회 조회로 계산 -> {분: (stats, 클릭 수)}
+
+    페이지가 도착할 때마다 timestamp로 중첩 윈도우에 나눠 담으므로 메모리 사용량은 페이지 1개 수준
+    scan 모드에서 TREND_SCAN_SEGMENTS > 1이면 세그먼트 병렬 Scan 후 세그먼트별 집계 결과를 병합
+    TREND_SOURCE=rollup이면 원본 로그 대신 분 단위 rollup 행만 합산
+    """
+    cutoffs = _window_cutoffs(windows)
+    _, largest_since = cutoffs[0]
+    since_dt = datetime.fromisoformat(largest_since)
+    try:
+        if _SOURCE == "rollup":
+            # rollup 행은 분 단위이므로 시작 분을 포함해 비교
+            rows = (
+                (f"{day}T{minute}", cat, clicks)
+                for day, minute, cat, clicks in _STORAGE.iter_rollup(since_dt)
+            )
+            return _bin_rows(rows, [(w, since[:16]) for w, since in cutoffs], inclusive=True)
+
+        aggregate = lambda pages: _bin_rows(_page_rows(pages), cutoffs)
+        return _merge_windows(_STORAGE.map_click_pages(since_dt, aggregate, _FETCH_MODE, _SCAN_SEGMENTS))
     except Exception as e:
-        print(f"DEBUG _fetch_recent_clicks error: {e}")
-        return []
+        print(f"DEBUG _collect_multi_stats error: {e}")
+        return {w: ({}, 0) for w, _ in cutoffs}
 
 
-def _aggregate_by_category(items: list) -> dict:
-    """카테고리별 클릭 횟수 집계"""
+def _collect_sketch(minutes: int):
+    """윈도우에 걸친 시간 버킷 스케치를 병합해 고유 방문자 수 / 인기 링크 요약 (시간 단위 근사)"""
+    if not _SKETCH_STORE:
+        return None
     try:
-        stats = {}
-        for item in items:
-            cat = item.get("category", "기타")
-            stats[cat] = stats.get(cat, 0) + 1
-        return stats
+        since_dt = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+        return _SKETCH_STORE.read(hours_between(since_dt)).summary(_TOP_LINKS)
     except Exception as e:
-        print(f"DEBUG _aggregate_by_category error: {e}")
-        return {}
+        print(f"DEBUG _collect_sketch error: {e}")
+        return None
+
+
+def _iter_rows(minutes: int):
+    """윈도우의 (timestamp, 카테고리, 클릭 수) 행 순회 (rollup 원천이면 분 단위 합계 행)"""
+    if _SOURCE == "rollup":
+        since_dt = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+        for day, minute, cat, clicks in _STORAGE.iter_rollup(since_dt):
+            yield f"{day}T{minute}", cat, clicks
+        return
+    yield from _page_rows(_iter_click_pages(minutes))
+
+
+def _compute_series_report(minutes: int, bucket_minutes: int) -> dict:
+    """bucket_minutes 단위 시계열 + 시간대 x 카테고리 히트맵 (AI 분석 없음)"""
+    # 버킷 수 상한을 넘으면 버킷 크기를 키움
+    bucket_minutes = max(bucket_minutes, -(-minutes // _MAX_SERIES_BUCKETS))
+    # 클릭 타임스탬프는 초 단위로 버려 버킷을 정하므로 현재 초의 클릭까지 포함되도록 다음 초를 끝으로 사용
+    until = int(datetime.now(timezone.utc).timestamp()) + 1
+    since = until - minutes * 60
+    report = timeseries.analyze(
+        _iter_rows(minutes), since, until, bucket_minutes * 60,
+        tz_offset_hours=_HEATMAP_TZ_OFFSET, vectorize=_VECTORIZE,
+    )
+    return {"minutes": minutes, **report}
+
+
+def _collect_stats(minutes: int) -> tuple:
+    """최근 N분간 카테고리별 집계 -> (stats, 클릭 수)"""
+    return _collect_multi_stats([minutes])[minutes]
+
+
+def _time_desc(minutes: int) -> str:
+    hours = minutes // 60
+    return f"{hours}시간" if hours > 0 else f"{minutes}분"
+
+
+def _bedrock():
+    global _BEDROCK
+    if _BEDROCK is None:
+        _BEDROCK = clients.bedrock()
+    return _BEDROCK
+
+
+def _invoke_trend_model(prompt: str) -> str:
+    """Bedrock Claude 3 Haiku 호출 -> 한 줄 응답 문장"""
+    body = json.dumps({
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": 500,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.3
+    })
+    
+    resp = _bedrock().invoke_model(
+        modelId="anthropic.claude-3-haiku-20240307-v1:0",
+        body=body,
+    )
+    parsed = json.loads(resp.get("body").read())
+    return parsed["content"][0]["text"].strip().replace("\n", " ")
 
 
 def _ask_ai_trend(stats: dict, minutes: int = 1440) -> str:
     """Bedrock Claude 3 Haiku를 사용하여 트렌드 분석 요청"""
     try:
-        hours = minutes // 60
-        time_desc = f"{hours}시간" if hours > 0 else f"{minutes}분"
-        
         # 대시보드 파싱용 로그를 위한 엄격한 형식 지정
         prompt = f"""
-다음은 지난 {time_desc} 동안의 URL 클릭 통계 데이터입니다:
+다음은 지난 {_time_desc(minutes)} 동안의 URL 클릭 통계 데이터입니다:
 {json.dumps(stats, ensure_ascii=False)}
 
 위 데이터를 분석해서 반드시 아래의 형식을 엄격히 지켜서 한 줄로 답변하세요.
 형식: [분야] 인기분야명 [사유] 분석사유 [요약] 전체트렌드요약
 """
-        body = json.dumps({
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 500,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.3
-        })
-        
-        resp = _BEDROCK.invoke_model(
-            modelId="anthropic.claude-3-haiku-20240307-v1:0",
-            body=body,
-        )
-        parsed = json.loads(resp.get("body").read())
-        text = parsed["content"][0]["text"].strip().replace("\n", " ")
-        return text
+        return _invoke_trend_model(prompt)
     except Exception as e:
         print(f"DEBUG _ask_ai_trend error: {e}")
         return f"[분야] 오류 [사유] {str(e)} [요약] 분석을 수행할 수 없습니다."
 
 
+def _ask_ai_trend_multi(window_stats: dict) -> str:
+    """여러 윈도우 통계를 프롬프트 1개로 비교 분석 요청 (단기/장기 추세 차이 포함)"""
+    try:
+        lines = "\n".join(
+            f"- 지난 {_time_desc(w)}: {json.dumps(stats, ensure_ascii=False)}"
+            for w, stats in sorted(window_stats.items())
+        )
+        prompt = f"""
+다음은 기간별 URL 클릭 통계 데이터입니다:
+{lines}
+
+기간별 차이(단기 급상승 분야 등)를 함께 분석해서 반드시 아래의 형식을 엄격히 지켜서 한 줄로 답변하세요.
+형식: [분야] 인기분야명 [사유] 분석사유 [요약] 전체트렌드요약
+"""
+        return _invoke_trend_model(prompt)
+    except Exception as e:
+        print(f"DEBUG _ask_ai_trend_multi error: {e}")
+        return f"[분야] 오류 [사유] {str(e)} [요약] 분석을 수행할 수 없습니다."
+
+
+def _cached_ai(cache_key, cache_stats: dict, ask) -> tuple:
+    """분포가 거의 같은 직전 분석이 있으면 재사용, 없으면 ask()로 Bedrock 호출 -> (분석 문장, 적중 계층)"""
+    text, tier = _REPORT_CACHE.get(cache_key, cache_stats)
+    metrics.emit({"TrendReportCacheHit": 0 if text is None else 1})
+    if text is not None:
+        return text, tier
+
+    text = ask()
+    if not text.startswith(_AI_ERROR_PREFIX):
+        _REPORT_CACHE.put(cache_key, cache_stats, text)
+    return text, tier
+
+
+def _cached_ai_trend(stats: dict, minutes: int) -> tuple:
+    return _cached_ai(minutes, stats, lambda: _ask_ai_trend(stats, minutes=minutes))
+
+
+_NO_DATA_ANALYSIS = "[분야] 없음 [사유] 로그 데이터 부족 [요약] 현재 집계된 클릭 데이터가 없습니다."
+
+
+def _compute_report(minutes: int, collected: tuple = None) -> dict:
+    """집계 + AI 분석으로 리포트 1개 계산 (계산마다 REPORT_DATA 마커 1회 출력)
+
+    collected: 여러 윈도우를 한 번에 집계한 경우 이 윈도우의 (stats, count)
+    """
+    # 1~2. 로그 데이터 수집 및 카테고리별 집계
+    stats, count = collected or _collect_stats(minutes)
+
+    if not count:
+        return {
+            "message": "데이터 없음", 
+            "stats": {}, 
+            "ai_analysis": _NO_DATA_ANALYSIS
+        }
+
+    # 3. AI 트렌드 분석 (분포 변화가 작으면 캐시된 분석 재사용)
+    ai_analysis, ai_cache = _cached_ai_trend(stats, minutes)
+
+    # [중요] CloudWatch Logs에 대시보드 위젯이 파싱할 수 있는 마커 출력
+    print(f"REPORT_DATA: {ai_analysis}")
+
+    report = {
+        "stats": stats, 
+        "ai_analysis": ai_analysis,
+        "ai_cache": ai_cache,
+        "count": count
+    }
+    sketch = _collect_sketch(minutes)
+    if sketch is not None:
+        report["sketch"] = sketch
+    return report
+
+
+def _compute_multi_report(windows: list) -> dict:
+    """여러 윈도우를 가장 큰 윈도우 1회 조회 + Bedrock 프롬프트 1개로 계산"""
+    collected = _collect_multi_stats(windows)
+    largest = max(collected)
+    body = {
+        "windows": {str(w): {"stats": stats, "count": count} for w, (stats, count) in sorted(collected.items())},
+        "count": collected[largest][1],
+    }
+    if not body["count"]:
+        return {"message": "데이터 없음", **body, "ai_analysis": _NO_DATA_ANALYSIS}
+
+    window_stats = {w: stats for w, (stats, _count) in collected.items()}
+    # 캐시 지문은 윈도우별 분포를 펼친 dict 기준 (키: "60#IT" 형식)
+    flat = {f"{w}#{cat}": n for w, stats in window_stats.items() for cat, n in stats.items()}
+    cache_key = ",".join(str(w) for w in sorted(collected))
+    ai_analysis, ai_cache = _cached_ai(cache_key, flat, lambda: _ask_ai_trend_multi(window_stats))
+
+    # [중요] CloudWatch Logs에 대시보드 위젯이 파싱할 수 있는 마커 출력
+    print(f"REPORT_DATA: {ai_analysis}")
+    return {**body, "ai_analysis": ai_analysis, "ai_cache": ai_cache}
+
+
+def _save_latest(minutes: int, report: dict) -> None:
+    """윈도우별 최신 리포트 저장 (reportKey = latest#<분>)"""
+    entry = {"report": report, "generatedAt": datetime.now(timezone.utc).isoformat()}
+    if not _REPORT_TABLE_NAME:
+        _LOCAL_LATEST[minutes] = entry
+        return
+    try:
+        _DYNAMO.Table(_REPORT_TABLE_NAME).put_item(Item={
+            "reportKey": f"latest#{minutes}",
+            "report": json.dumps(report, ensure_ascii=False, cls=DecimalEncoder),
+            "generatedAt": entry["generatedAt"],
+        })
+    except Exception as e:
+        print(f"DEBUG _save_latest error: {e}")
+
+
+def _load_latest(minutes: int):
+    """저장된 최신 리포트를 키 1회 조회로 로드 (없거나 오래됐으면 None)"""
+    if not _REPORT_TABLE_NAME:
+        entry = _LOCAL_LATEST.get(minutes)
+    else:
+        try:
+            item = _DYNAMO.Table(_REPORT_TABLE_NAME).get_item(Key={"reportKey": f"latest#{minutes}"}).get("Item")
+        except Exception as e:
+            print(f"DEBUG _load_latest error: {e}")
+            return None
+        entry = item and {"report": json.loads(item["report"]), "generatedAt": item["generatedAt"]}
+    if not entry:
+        return None
+    age = (datetime.now(timezone.utc) - datetime.fromisoformat(entry["generatedAt"])).total_seconds()
+    if age > _LATEST_MAX_AGE:
+        return None
+    return entry
+
+
+def precompute_handler(event, context):
+    """표준 윈도우 리포트를 미리 계산해 저장 (TrendPrecomputeFunction에서 EventBridge 주기 실행, 로그 조회는 가장 큰 윈도우 1회)"""
+    collected = _collect_multi_stats(_PRECOMPUTE_WINDOWS)
+    computed = {}
+    for minutes in _PRECOMPUTE_WINDOWS:
+        report = _compute_report(minutes, collected[minutes])
+        _save_latest(minutes, report)
+        computed[minutes] = report.get("count", 0)
+    return {"windows": computed}
+
+
 def _response(status_code: int, body_obj: dict) -> dict:
     """표준 API 응답 및 CORS 설정"""
     return {
@@ -122,10 +381,37 @@ def _response(status_code: int, body_obj: dict) -> dict:
     }
 
 
+def _parse_windows(raw) -> list:
+    """windows 파라미터 -> 중복 제거된 윈도우(분) 목록 (각각 1분 ~ 1주일로 제한)"""
+    windows = set()
+    for part in str(raw or "").split(","):
+        try:
+            windows.add(max(1, min(10080, int(part))))
+        except ValueError:
+            continue
+    return sorted(windows)
+
+
 def handler(event, context):
-    """Trend Lambda 메인 핸들러"""
+    """Trend Lambda 메인 핸들러 (표준 윈도우는 미리 계산된 리포트 응답, fresh=true면 새로 계산)"""
     try:
         query = event.get("queryStringParameters") or {}
+        if query.get("bucket"):
+            # 시계열/히트맵 분석 (예: ?minutes=1440&bucket=15)
+            try:
+                minutes = max(1, min(10080, int(query.get("minutes", 1440))))
+                bucket = max(1, int(query["bucket"]))
+            except (TypeError, ValueError):
+                return _response(400, {"error": "minutes/bucket은 정수여야 합니다."})
+            return _response(200, _compute_series_report(minutes, bucket))
+
+        windows = _parse_windows(query.get("windows"))
+        if len(windows) > 1:
+            # 여러 윈도우를 한 번의 조회로 계산 (예: ?windows=60,1440,10080)
+            return _response(200, _compute_multi_report(windows))
+        if windows:
+            query = {**query, "minutes": windows[0]}
+
         try:
             minutes = int(query.get("minutes", 1440))
         except (TypeError, ValueError):
@@ -133,31 +419,18 @@ def handler(event, context):
         
         # 분석 범위 제한 (1분 ~ 1주일)
         minutes = max(1, min(10080, minutes))
-        
-        # 1. 로그 데이터 수집
-        items = _fetch_recent_clicks(minutes=minutes)
-
-        if not items:
-            return _response(200, {
-                "message": "데이터 없음", 
-                "stats": {}, 
-                "ai_analysis": "[분야] 없음 [사유] 로그 데이터 부족 [요약] 현재 집계된 클릭 데이터가 없습니다."
-            })
+        fresh = str(query.get("fresh", "false")).lower() == "true"
+        standard = minutes in _PRECOMPUTE_WINDOWS
 
-        # 2. 카테고리별 집계
-        stats = _aggregate_by_category(items)
+        if standard and not fresh:
+            latest = _load_latest(minutes)
+            if latest:
+                return _response(200, {**latest["report"], "generatedAt": latest["generatedAt"], "precomputed": True})
 
-        # 3. AI 트렌드 분석
-        ai_analysis = _ask_ai_trend(stats, minutes=minutes)
-        
-        # [중요] CloudWatch Logs에 대시보드 위젯이 파싱할 수 있는 마커 출력
-        print(f"REPORT_DATA: {ai_analysis}")
-
-        return _response(200, {
-            "stats": stats, 
-            "ai_analysis": ai_analysis,
-            "count": len(items)
-        })
+        report = _compute_report(minutes)
+        if standard:
+            _save_latest(minutes, report)
+        return _response(200, report)
 
     except Exception as e:
         print(f"DEBUG handler error: {e}")
@@ -0,0 +1,13 @@
+"""
+유닛 테스트 공통 설정 - 핸들러 import 전에 AWS 없이 동작하도록 환경 변수 / src 경로 지정
+pytest가 테스트 모듈보다 먼저 불러오고, 직접 실행(python tests/unit/test_*.py)하는 핸들러 테스트는 import conftest로 같은 설정 사용
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+os.environ["STORAGE_BACKEND"] = "memory"
+os.environ["AI_BACKEND"] = "stub"
+os.environ["CLICK_LOG_MODE"] = "sync"
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
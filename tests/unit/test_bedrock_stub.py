@@ -0,0 +1,43 @@
+"""
+로컬 유닛 테스트 - Bedrock 대역(AI_BACKEND=stub)이 프롬프트 종류별로 핸들러가 파싱할 수 있는 응답을 주는지 검증
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common import clients
+from common.bedrock_stub import STUB_CATEGORY, StubBedrock
+
+
+def _invoke(prompt: str) -> str:
+    body = json.dumps({"messages": [{"role": "user", "content": prompt}]})
+    resp = StubBedrock(latency_ms=0).invoke_model(modelId="m", body=body)
+    return json.loads(resp["body"].read())["content"][0]["text"]
+
+
+def test_stub_answers_each_prompt_kind():
+    """단건 분류는 JSON 객체, 다건 분류는 목록 번호별 JSON 배열, 트렌드는 [분야] 형식 문장"""
+    single = json.loads(_invoke("Analyze the following URL and respond in JSON format.\nURL: https://a.com"))
+    assert single["category"] == STUB_CATEGORY
+
+    listing = "\n".join(f"    {n}. https://{n}.com" for n in range(3))
+    batch = json.loads(_invoke(f"respond with a JSON array only.\nURLs:\n{listing}\n- index: (number)"))
+    assert [entry["index"] for entry in batch] == [0, 1, 2]
+
+    assert _invoke("클릭 통계를 분석해 주세요").startswith("[분야]")
+
+
+def test_bedrock_client_switches_to_stub(monkeypatch):
+    """AI_BACKEND=stub이면 boto3 클라이언트 대신 대역을 반환"""
+    monkeypatch.setenv("AI_BACKEND", "stub")
+    assert isinstance(clients.bedrock(), StubBedrock)
+    assert "bedrock-runtime" not in clients.created()
+
+
+if __name__ == "__main__":
+    test_stub_answers_each_prompt_kind()
+    os.environ["AI_BACKEND"] = "stub"
+    assert isinstance(clients.bedrock(), StubBedrock)
+    print("All tests passed.")
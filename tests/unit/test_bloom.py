@@ -0,0 +1,34 @@
+"""
+로컬 유닛 테스트 - Bloom 필터 검증
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.base62 import encode
+from common.bloom import BloomFilter
+
+
+def test_no_false_negatives():
+    """추가한 키는 항상 존재로 판정되는지 검증"""
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    codes = [encode(i) for i in range(1, 5001)]
+    bloom.update(codes)
+    assert all(code in bloom for code in codes)
+    assert len(bloom) == 5000
+
+
+def test_false_positive_rate_within_bound():
+    """미발급 키의 오탐률이 설정값 근처인지 검증"""
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    bloom.update(encode(i) for i in range(1, 5001))
+    probes = [encode(i) for i in range(100000, 120000)]
+    false_positives = sum(1 for code in probes if code in bloom)
+    assert false_positives / len(probes) < 0.03
+
+
+if __name__ == "__main__":
+    test_no_false_negatives()
+    test_false_positive_rate_within_bound()
+    print("All tests passed.")
@@ -0,0 +1,37 @@
+"""
+로컬 유닛 테스트 - 클릭 로그 시간 버킷 검증
+"""
+
+import sys
+import os
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.buckets import hour_bucket, hours_between, shard_of, window_buckets
+
+
+def test_hour_bucket_from_timestamp():
+    """ISO 타임스탬프에서 시간 버킷 값을 만드는지 검증"""
+    assert hour_bucket("2026-10-17T05:12:33.123456+00:00", "abc") == "2026-10-17T05#0"
+
+
+def test_shard_is_stable_and_in_range():
+    """같은 shortCode는 항상 같은 샤드로, 범위 내 값인지 검증"""
+    assert shard_of("abc", 4) == shard_of("abc", 4)
+    assert all(0 <= shard_of(f"c{i}", 4) < 4 for i in range(100))
+    assert shard_of("abc", 1) == 0
+
+
+def test_window_covers_partial_hours():
+    """윈도우 시작/끝이 걸친 시간 버킷을 모두 포함하는지 검증"""
+    since = datetime(2026, 10, 17, 5, 40, tzinfo=timezone.utc)
+    until = datetime(2026, 10, 17, 7, 5, tzinfo=timezone.utc)
+    assert hours_between(since, until) == ["2026-10-17T05", "2026-10-17T06", "2026-10-17T07"]
+    assert len(window_buckets(since, shards=2, until=until)) == 6
+
+
+if __name__ == "__main__":
+    test_hour_bucket_from_timestamp()
+    test_shard_is_stable_and_in_range()
+    test_window_covers_partial_hours()
+    print("All tests passed.")
@@ -0,0 +1,70 @@
+"""
+로컬 유닛 테스트 - TTL/LRU 캐시 검증
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.cache import TTLCache
+
+
+class FakeClock:
+    """테스트용 수동 시계"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_and_miss_counters():
+    """조회 결과에 따라 hit/miss 카운터가 증가하는지 검증"""
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_ttl_expiration():
+    """TTL 경과 후 항목이 만료되는지 검증"""
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    """용량 초과 시 가장 오래 사용되지 않은 항목이 제거되는지 검증"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_size_disables_cache():
+    """maxsize=0이면 캐시가 비활성화되는지 검증"""
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+if __name__ == "__main__":
+    test_hit_and_miss_counters()
+    test_ttl_expiration()
+    test_lru_eviction()
+    test_zero_size_disables_cache()
+    print("All tests passed.")
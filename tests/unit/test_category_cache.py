@@ -0,0 +1,101 @@
+"""
+로컬 유닛 테스트 - URL 정규화 및 분류 캐시 계층 검증
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.category_cache import CategoryCache, normalize_url, registered_domain
+
+
+class FakeDynamo:
+    """batch_get_item / batch_write_item 대역"""
+    def __init__(self):
+        self.items = {}
+
+    def batch_get_item(self, RequestItems):
+        (table, req), = RequestItems.items()
+        found = [self.items[k["cacheKey"]] for k in req["Keys"] if k["cacheKey"] in self.items]
+        return {"Responses": {table: found}}
+
+    def batch_write_item(self, RequestItems):
+        (table, reqs), = RequestItems.items()
+        for r in reqs:
+            item = r["PutRequest"]["Item"]
+            self.items[item["cacheKey"]] = item
+        return {"UnprocessedItems": {}}
+
+
+def test_normalize_url():
+    """호스트 대소문자, 기본 포트, fragment, 추적 파라미터, 쿼리 순서 정규화 검증"""
+    a = normalize_url("HTTPS://WWW.Example.com:443/shop/?b=2&utm_source=x&a=1#top")
+    b = normalize_url("https://example.com/shop?a=1&b=2")
+    assert a == b == "https://example.com/shop?a=1&b=2"
+
+
+def test_registered_domain():
+    """서브도메인 및 2단계 접미사 처리 검증"""
+    assert registered_domain("https://m.shop.example.com/a") == "example.com"
+    assert registered_domain("https://store.example.co.kr/a") == "example.co.kr"
+    assert registered_domain("http://10.0.0.1:8080/") == "10.0.0.1"
+    assert registered_domain("https://alice.github.io/post") == "alice.github.io"
+
+
+def test_memory_url_then_domain_fallback():
+    """같은 URL은 URL 키, 같은 도메인의 다른 URL은 도메인 키로 적중하는지 검증"""
+    cache = CategoryCache(domain_fallback=True)
+    cache.put("https://shop.example.com/item/1", {"category": "Shopping", "summary": "상품"})
+    hit, tier = cache.get("https://shop.example.com/item/1?utm_medium=mail")
+    assert tier == "memory_url" and hit["category"] == "Shopping"
+    hit, tier = cache.get("https://example.com/item/2")
+    assert tier == "memory_domain" and hit["category"] == "Shopping"
+    assert cache.get("https://other.org/")[1] == "miss"
+    assert cache.stats()["hitRate"] == round(2 / 3, 4)
+
+
+def test_dynamo_tier_survives_cold_start():
+    """새 컨테이너(빈 메모리)에서도 DynamoDB 계층에서 적중하는지 검증"""
+    dynamo = FakeDynamo()
+    CategoryCache(dynamo=dynamo, table_name="t").put("https://a.com/x", {"category": "IT", "summary": "s"})
+    cold = CategoryCache(dynamo=dynamo, table_name="t")
+    hit, tier = cold.get("https://a.com/x")
+    assert tier == "dynamo_url" and hit == {"category": "IT", "summary": "s"}
+    assert cold.get("https://a.com/x")[1] == "memory_url"
+
+
+def test_dynamo_tier_ignores_expired_items():
+    """TTL이 지난 항목은 삭제 전이라도 무시하는지 검증"""
+    dynamo = FakeDynamo()
+    CategoryCache(dynamo=dynamo, table_name="t", table_ttl=-1).put("https://a.com/x", {"category": "IT"})
+    assert CategoryCache(dynamo=dynamo, table_name="t").get("https://a.com/x")[1] == "miss"
+
+
+def test_domain_fallback_off_by_default():
+    """기본값은 URL 키만 사용: 같은 도메인의 다른 URL은 miss"""
+    cache = CategoryCache()
+    cache.put("https://shop.example.com/item/1", {"category": "Shopping"})
+    assert cache.get("https://shop.example.com/item/2")[1] == "miss"
+
+
+def test_shared_hosts_do_not_share_domain_category():
+    """공유 호스팅의 다른 사용자 / 단축 URL은 도메인 fallback을 켜도 분류를 재사용하지 않음"""
+    dynamo = FakeDynamo()
+    cache = CategoryCache(dynamo=dynamo, table_name="t", domain_fallback=True)
+    cache.put("https://alice.github.io/ml", {"category": "IT"})
+    cache.put("https://bit.ly/abc", {"category": "뉴스"})
+    assert cache.get("https://alice.github.io/other")[1] == "memory_domain"
+    assert cache.get("https://bob.github.io/recipes")[1] == "miss"
+    assert cache.get("https://bit.ly/xyz")[1] == "miss"
+    assert "domain#bit.ly" not in dynamo.items and "domain#github.io" not in dynamo.items
+
+
+if __name__ == "__main__":
+    test_normalize_url()
+    test_registered_domain()
+    test_memory_url_then_domain_fallback()
+    test_dynamo_tier_survives_cold_start()
+    test_dynamo_tier_ignores_expired_items()
+    test_domain_fallback_off_by_default()
+    test_shared_hosts_do_not_share_domain_category()
+    print("All tests passed.")
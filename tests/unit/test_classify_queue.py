@@ -0,0 +1,70 @@
+"""
+로컬 유닛 테스트 - 비동기 분류 큐(로컬 대역) 검증
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.classify_queue import LocalQueue, SqsQueue
+
+
+def test_local_queue_processes_jobs():
+    """적재한 작업이 워커 스레드에서 모두 처리되는지 검증"""
+    done = []
+    q = LocalQueue(lambda job: done.append(job["shortCode"]), workers=2)
+    for code in ["a", "b", "c"]:
+        q.send({"shortCode": code, "url": f"https://example.com/{code}"})
+    q.join()
+    assert sorted(done) == ["a", "b", "c"]
+    assert q.processed == 3
+
+
+def test_local_queue_survives_worker_errors():
+    """작업 처리 중 예외가 나도 다음 작업을 계속 처리하는지 검증"""
+    def worker(job):
+        if job["fail"]:
+            raise RuntimeError("boom")
+
+    q = LocalQueue(worker)
+    q.send({"fail": True})
+    q.send({"fail": False})
+    q.join()
+    assert q.failed == 1
+    assert q.processed == 1
+
+
+class FlakySqs:
+    """첫 배치는 예외, 두 번째 배치는 1건 실패 응답, 개별 재전송은 "bad" 작업만 예외"""
+
+    def __init__(self):
+        self.batches = 0
+        self.sent = []
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.batches += 1
+        if self.batches == 1:
+            raise ConnectionError("endpoint timeout")
+        self.sent.extend(e["MessageBody"] for e in Entries[1:])
+        return {"Failed": [{"Id": Entries[0]["Id"]}]}
+
+    def send_message(self, QueueUrl, MessageBody):
+        if '"bad"' in MessageBody:
+            raise ConnectionError("endpoint timeout")
+        self.sent.append(MessageBody)
+
+
+def test_sqs_send_many_collects_unsent_jobs():
+    """배치 예외 / 항목 실패 / 개별 재전송 실패가 있어도 나머지는 전송하고 못 보낸 작업만 반환"""
+    client = FlakySqs()
+    jobs = [{"shortCode": f"j{i}"} for i in range(10)] + [{"shortCode": "bad"}, {"shortCode": "j10"}]
+    unsent = SqsQueue("q", client).send_many(jobs)
+    assert unsent == [{"shortCode": "bad"}]
+    assert len(client.sent) == 11
+
+
+if __name__ == "__main__":
+    test_local_queue_processes_jobs()
+    test_local_queue_survives_worker_errors()
+    test_sqs_send_many_collects_unsent_jobs()
+    print("All tests passed.")
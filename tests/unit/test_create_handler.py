@@ -0,0 +1,214 @@
+"""
+로컬 유닛 테스트 - create 핸들러 / 분류 워커 (메모리 저장소 + Bedrock 대역)
+"""
+
+import json
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+import conftest  # noqa: F401  (핸들러 import 전 공통 환경 설정)
+
+from common.base62 import encode
+from common.classify_queue import PENDING_CATEGORY
+from create import app
+
+
+def _failing_model(prompt, max_tokens):
+    raise RuntimeError("ThrottlingException")
+
+
+def test_classify_worker_reports_bedrock_failure(monkeypatch):
+    """워커의 Bedrock 오류는 batchItemFailures로 보고하고 매핑을 기본값으로 덮어쓰지 않음"""
+    app.STORAGE.put_mapping({"shortCode": "cw1", "originalUrl": "https://example.com/cw1",
+                             "category": PENDING_CATEGORY, "summary": "s"})
+    monkeypatch.setattr(app, "_invoke_model", _failing_model)
+
+    event = {"Records": [{"messageId": "m1", "body": json.dumps({"shortCode": "cw1", "url": "https://example.com/cw1"})}]}
+    assert app.classify_handler(event, None) == {"batchItemFailures": [{"itemIdentifier": "m1"}]}
+    assert app.STORAGE.get_mapping("cw1")["category"] == PENDING_CATEGORY
+
+
+def test_classify_worker_updates_category():
+    """분류 성공 시 매핑의 category/summary 갱신"""
+    app.STORAGE.put_mapping({"shortCode": "cw2", "originalUrl": "https://example.com/cw2",
+                             "category": PENDING_CATEGORY, "summary": "s"})
+    event = {"Records": [{"messageId": "m2", "body": json.dumps({"shortCode": "cw2", "url": "https://example.com/cw2"})}]}
+    assert app.classify_handler(event, None) == {"batchItemFailures": []}
+    assert app.STORAGE.get_mapping("cw2")["category"] != PENDING_CATEGORY
+
+
+def test_sync_create_falls_back_on_bedrock_failure(monkeypatch):
+    """동기 생성은 Bedrock 오류여도 기본 분류로 201 응답"""
+    monkeypatch.setattr(app, "_invoke_model", _failing_model)
+    resp = app.handler({"body": json.dumps({"url": "https://fallback.example.net/x"}), "headers": {}}, None)
+    assert resp["statusCode"] == 201
+    assert json.loads(resp["body"])["summary"] == "AI 분석 실패"
+
+
+def _create(url: str) -> tuple:
+    resp = app.handler({"body": json.dumps({"url": url}), "headers": {"Host": "localhost"}}, None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+
+def test_id_and_ai_stages_overlap(monkeypatch):
+    """ID 할당과 AI 분류가 동시에 실행(둘 다 시작한 뒤에 끝남)되고 단계별 Server-Timing 헤더 포함"""
+    real_next_id = app._get_next_id
+    # 두 단계가 순차 실행되면 먼저 들어온 쪽이 상대를 기다리다 BrokenBarrierError로 실패
+    both_started = threading.Barrier(2, timeout=5)
+    calls = []
+
+    def slow_next_id():
+        calls.append("id:start")
+        both_started.wait()
+        time.sleep(0.05)
+        calls.append("id:end")
+        return real_next_id()
+
+    def slow_classify(url):
+        calls.append("ai:start")
+        both_started.wait()
+        time.sleep(0.05)
+        calls.append("ai:end")
+        return {"category": "IT", "summary": "s"}, False
+
+    monkeypatch.setattr(app, "_get_next_id", slow_next_id)
+    monkeypatch.setattr(app, "_classify_for_create", slow_classify)
+    resp = app.handler({"body": json.dumps({"url": "https://example.com/overlap"}), "headers": {}}, None)
+
+    assert resp["statusCode"] == 201
+    assert {calls[0], calls[1]} == {"id:start", "ai:start"}
+    stages = dict(part.split(";dur=") for part in resp["headers"]["Server-Timing"].split(", "))
+    assert {"id", "ai", "save"} <= set(stages)
+    assert float(stages["id"]) >= 50 and float(stages["ai"]) >= 50
+
+
+def test_dedup_hit_and_miss(monkeypatch):
+    """dedup 모드: 같은 URL은 기존 코드(200, deduplicated), 다른 URL은 새 코드(201)"""
+    monkeypatch.setattr(app, "DEDUP_ENABLED", True)
+    status, first = _create("https://example.com/dd1")
+    assert status == 201
+
+    status, again = _create("https://example.com/dd1")
+    assert status == 200
+    assert again["shortCode"] == first["shortCode"] and again["deduplicated"] is True
+
+    status, other = _create("https://example.com/dd2")
+    assert status == 201 and other["shortCode"] != first["shortCode"]
+
+
+def test_dedup_ignores_index_pointing_to_other_url(monkeypatch):
+    """인덱스가 가리키는 매핑의 원본 URL이 다르면(해시 충돌 / 덮어쓴 매핑) 새 코드 발급"""
+    monkeypatch.setattr(app, "DEDUP_ENABLED", True)
+    app.STORAGE.put_mapping({"shortCode": "ddx", "originalUrl": "https://example.com/elsewhere"})
+    app.STORAGE.put_url_index(app._url_hash("https://example.com/dd3"), "ddx", "t")
+
+    status, body = _create("https://example.com/dd3")
+    assert status == 201 and body["shortCode"] != "ddx"
+
+
+def _batch(body) -> dict:
+    resp = app.batch_handler({"body": json.dumps(body), "headers": {"Host": "localhost"}}, None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+
+def test_batch_rejects_non_object_body():
+    """body가 객체가 아니면(JSON 배열 / 스칼라) 500이 아니라 400"""
+    for body in (["https://a.com"], "https://a.com", 3):
+        assert _batch(body)[0] == 400
+    assert _batch({"urls": []})[0] == 400
+
+
+def test_batch_dedup_shares_codes(monkeypatch):
+    """dedup 모드: 같은 요청 안의 동일 URL은 코드 공유, 다음 요청은 기존 코드 재사용"""
+    monkeypatch.setattr(app, "DEDUP_ENABLED", True)
+    urls = ["https://example.com/bd1", "https://example.com/bd1", "https://example.com/bd2"]
+    status, body = _batch({"urls": urls})
+    assert status == 200 and body["succeeded"] == 3
+    codes = [r["shortCode"] for r in body["results"]]
+    assert codes[0] == codes[1] != codes[2]
+
+    status, body = _batch({"urls": ["https://example.com/bd2"]})
+    assert body["results"][0]["shortCode"] == codes[2]
+    assert body["results"][0]["deduplicated"] is True
+
+
+def test_batch_reissues_conflicting_code():
+    """예약한 코드에 이미 다른 링크가 있으면 덮어쓰지 않고 새 코드로 저장"""
+    taken = encode(app.STORAGE.read_counter() + 1)
+    app.STORAGE.put_mapping({"shortCode": taken, "originalUrl": "https://example.com/existing"})
+
+    status, body = _batch({"urls": ["https://example.com/bc1", "https://example.com/bc2"]})
+    assert status == 200 and body["failed"] == 0
+    codes = [r["shortCode"] for r in body["results"]]
+    assert taken not in codes and len(set(codes)) == 2
+    assert app.STORAGE.get_mapping(taken)["originalUrl"] == "https://example.com/existing"
+    for code, result in zip(codes, body["results"]):
+        assert app.STORAGE.get_mapping(code)["originalUrl"] == result["originalUrl"]
+
+
+def test_batch_ambiguous_failure_keeps_saved_codes(monkeypatch):
+    """일괄 저장이 실제로는 커밋됐는데 실패로 보고돼도(타임아웃) 같은 URL에 두 번째 코드를 만들지 않음"""
+    real_put_mappings = app.STORAGE.put_mappings
+
+    def committed_but_timed_out(items):
+        real_put_mappings(items)
+        return list(items)
+
+    monkeypatch.setattr(app.STORAGE, "put_mappings", committed_but_timed_out)
+    before = app.STORAGE.read_counter()
+    status, body = _batch({"urls": ["https://example.com/ba1", "https://example.com/ba2"]})
+    assert status == 200 and body["failed"] == 0
+    assert app.STORAGE.read_counter() == before + 2
+    for result in body["results"]:
+        assert app.STORAGE.get_mapping(result["shortCode"])["originalUrl"] == result["originalUrl"]
+
+
+def test_batch_partial_failure(monkeypatch):
+    """빈 URL / 저장 실패 항목만 오류로 보고하고 나머지는 성공"""
+    real_save = app._save_mapping
+
+    def flaky_save(short_code, original_url, ai_result):
+        if original_url.endswith("/bp-fail"):
+            raise RuntimeError("ProvisionedThroughputExceeded")
+        real_save(short_code, original_url, ai_result)
+
+    monkeypatch.setattr(app.STORAGE, "put_mappings", lambda items: list(items))
+    monkeypatch.setattr(app, "_save_mapping", flaky_save)
+    status, body = _batch({"urls": ["https://example.com/bp-ok", "  ", "https://example.com/bp-fail"]})
+    assert status == 200
+    assert (body["succeeded"], body["failed"]) == (1, 2)
+    ok, empty, failed = body["results"]
+    assert app.STORAGE.get_mapping(ok["shortCode"])["originalUrl"] == "https://example.com/bp-ok"
+    assert "error" in empty and failed["error"] == "저장 실패"
+
+
+class _BrokenQueue:
+    def send_many(self, jobs):
+        raise ConnectionError("SQS endpoint timeout")
+
+
+def test_async_create_classifies_inline_when_queue_fails(monkeypatch):
+    """매핑 저장 후 큐 전송이 실패해도 201, 직접 분류해 분석중 상태로 남기지 않음"""
+    monkeypatch.setattr(app, "CLASSIFY_MODE", "async")
+    monkeypatch.setattr(app, "_CLASSIFY_QUEUE", _BrokenQueue())
+    resp = app.handler({"body": json.dumps({"url": "https://queue-down.example.org/a"}), "headers": {}}, None)
+    assert resp["statusCode"] == 201
+    body = json.loads(resp["body"])
+    assert body["category"] != PENDING_CATEGORY
+    assert app.STORAGE.get_mapping(body["shortCode"])["category"] == body["category"]
+
+    status, batch = _batch({"urls": ["https://queue-down.example.org/b"]})
+    assert status == 200 and batch["succeeded"] == 1
+    code = batch["results"][0]["shortCode"]
+    assert batch["results"][0]["category"] != PENDING_CATEGORY
+    assert app.STORAGE.get_mapping(code)["category"] != PENDING_CATEGORY
+
+
+if __name__ == "__main__":
+    test_classify_worker_updates_category()
+    test_batch_rejects_non_object_body()
+    test_batch_reissues_conflicting_code()
+    print("All tests passed.")
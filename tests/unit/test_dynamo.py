@@ -0,0 +1,124 @@
+"""
+로컬 유닛 테스트 - 저수준 DynamoDB 접근 계층(속성 인코딩/디코딩, resource 호환 응답) 검증
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common import dynamo as dynamo_module
+from common.dynamo import Dynamo, decode_item, encode_item
+
+
+class FakeClient:
+    """저수준 클라이언트 대역 (요청 기록 + 타입 표기 응답)"""
+    def __init__(self):
+        self.calls = []
+
+    def get_item(self, **params):
+        self.calls.append(("get_item", params))
+        return {"Item": {"shortCode": {"S": "abc"}, "originalUrl": {"S": "https://a.com"}}}
+
+    def query(self, **params):
+        self.calls.append(("query", params))
+        return {
+            "Items": [{"timestamp": {"S": "t1"}, "clicks": {"N": "3"}}],
+            "Count": 1,
+            "LastEvaluatedKey": {"shortCode": {"S": "abc"}, "timestamp": {"S": "t1"}},
+        }
+
+    def batch_get_item(self, **params):
+        self.calls.append(("batch_get_item", params))
+        (name, spec), = params["RequestItems"].items()
+        return {
+            "Responses": {name: [{"k": {"S": "a"}, "v": {"N": "1.5"}}]},
+            "UnprocessedKeys": {name: {"Keys": spec["Keys"][1:]}},
+        }
+
+
+def test_attribute_round_trip():
+    """지원 타입이 인코딩 -> 디코딩 후 같은 값으로 복원되는지 검증"""
+    item = {
+        "s": "한글", "i": 42, "f": 1.5, "b": b"\x00\x01", "t": True, "n": None,
+        "m": {"x": [1, "y"]}, "ss": {"a", "b"},
+    }
+    encoded = encode_item(item)
+    assert encoded["i"] == {"N": "42"} and encoded["t"] == {"BOOL": True}
+    assert decode_item(encoded) == item
+
+
+def test_table_matches_resource_shapes():
+    """Table 호출이 키/값을 인코딩하고 응답을 일반 Python 값으로 돌려주는지 검증"""
+    client = FakeClient()
+    db = Dynamo(client)
+    table = db.Table("T")
+    assert db.Table("T") is table
+
+    item = table.get_item(Key={"shortCode": "abc"}, ProjectionExpression="originalUrl").get("Item")
+    assert item == {"shortCode": "abc", "originalUrl": "https://a.com"}
+    assert client.calls[-1][1] == {
+        "TableName": "T", "Key": {"shortCode": {"S": "abc"}}, "ProjectionExpression": "originalUrl",
+    }
+
+    page = table.query(
+        KeyConditionExpression="shortCode = :c",
+        ExpressionAttributeValues={":c": "abc"},
+        ExclusiveStartKey={"shortCode": "abc", "timestamp": "t0"},
+    )
+    assert page["Items"] == [{"timestamp": "t1", "clicks": 3}]
+    assert page["LastEvaluatedKey"] == {"shortCode": "abc", "timestamp": "t1"}
+    sent = client.calls[-1][1]
+    assert sent["ExpressionAttributeValues"] == {":c": {"S": "abc"}}
+    assert sent["ExclusiveStartKey"]["timestamp"] == {"S": "t0"}
+
+
+def test_batch_get_decodes_unprocessed_keys():
+    """UnprocessedKeys가 그대로 다음 요청에 쓸 수 있는 형태(일반 값)로 반환되는지 검증"""
+    db = Dynamo(FakeClient())
+    resp = db.batch_get_item(RequestItems={"T": {"Keys": [{"k": "a"}, {"k": "b"}]}})
+    assert resp["Responses"]["T"] == [{"k": "a", "v": 1.5}]
+    assert resp["UnprocessedKeys"] == {"T": {"Keys": [{"k": "b"}]}}
+
+
+def test_client_created_on_first_request():
+    """Table 핸들을 만드는 것만으로는 클라이언트를 생성하지 않고, 첫 요청 시 한 번만 생성되는지 검증"""
+    built = []
+    db = Dynamo()
+    table = db.Table("T")
+    assert db._client is None
+
+    def fake_client(service, **options):
+        built.append(service)
+        return FakeClient()
+
+    original = dynamo_module.clients.client
+    dynamo_module.clients.client = fake_client
+    try:
+        table.get_item(Key={"shortCode": "abc"})
+        table.get_item(Key={"shortCode": "abc"})
+    finally:
+        dynamo_module.clients.client = original
+    assert built == ["dynamodb"]
+
+
+def test_resource_builds_client_at_init_for_dynamo_backend(monkeypatch):
+    """배포 백엔드(dynamo)는 resource() 호출 시점(init)에 클라이언트 생성, 로컬 백엔드는 지연 생성"""
+    built = []
+    monkeypatch.setattr(dynamo_module.clients, "client", lambda service, **options: built.append(service) or FakeClient())
+
+    monkeypatch.setitem(dynamo_module._shared, "resource", None)
+    monkeypatch.setenv("STORAGE_BACKEND", "memory")
+    assert dynamo_module.resource()._client is None
+
+    monkeypatch.setitem(dynamo_module._shared, "resource", None)
+    monkeypatch.setenv("STORAGE_BACKEND", "dynamo")
+    assert dynamo_module.resource()._client is not None
+    assert built == ["dynamodb"]
+
+
+if __name__ == "__main__":
+    test_attribute_round_trip()
+    test_table_matches_resource_shapes()
+    test_batch_get_decodes_unprocessed_keys()
+    test_client_created_on_first_request()
+    print("All tests passed.")
@@ -0,0 +1,73 @@
+"""
+로컬 유닛 테스트 - 블록 임대 ID 할당기 검증
+"""
+
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.id_allocator import BlockIdAllocator
+
+
+class FakeCounter:
+    """DynamoDB Atomic Counter 대역"""
+    def __init__(self):
+        self.last_id = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, count):
+        with self._lock:
+            self.calls += 1
+            self.last_id += count
+            return self.last_id
+
+
+def test_one_counter_call_per_block():
+    """블록 하나당 카운터 호출이 1회인지 검증"""
+    counter = FakeCounter()
+    alloc = BlockIdAllocator(counter.reserve, block_size=10)
+    ids = [alloc.next_id() for _ in range(25)]
+    assert ids == list(range(1, 26))
+    assert counter.calls == 3
+    assert alloc.remaining() == 5
+
+
+def test_containers_never_collide():
+    """여러 컨테이너(할당기)가 같은 카운터를 공유해도 ID가 겹치지 않는지 검증"""
+    counter = FakeCounter()
+    allocators = [BlockIdAllocator(counter.reserve, block_size=7) for _ in range(8)]
+    results = []
+    lock = threading.Lock()
+
+    def worker(alloc):
+        ids = [alloc.next_id() for _ in range(500)]
+        with lock:
+            results.extend(ids)
+
+    threads = [threading.Thread(target=worker, args=(a,)) for a in allocators for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == len(set(results)) == 8000
+    assert max(results) <= counter.last_id
+
+
+def test_expired_lease_abandons_leftovers():
+    """임대 만료 시 잔여 ID는 결번 처리되고 새 블록을 예약하는지 검증"""
+    now = [0.0]
+    counter = FakeCounter()
+    alloc = BlockIdAllocator(counter.reserve, block_size=10, lease_ttl=60, clock=lambda: now[0])
+    assert alloc.next_id() == 1
+    now[0] = 61
+    assert alloc.next_id() == 11
+    assert alloc.ids_abandoned == 9
+
+
+if __name__ == "__main__":
+    test_one_counter_call_per_block()
+    test_containers_never_collide()
+    test_expired_lease_abandons_leftovers()
+    print("All tests passed.")
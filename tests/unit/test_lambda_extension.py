@@ -0,0 +1,80 @@
+"""
+로컬 유닛 테스트 - Lambda internal extension(응답 후 후처리) 검증 (가짜 Extensions API 서버)
+"""
+
+import json
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.lambda_extension import PostResponseHook
+
+
+class FakeExtensionsApi(BaseHTTPRequestHandler):
+    """register -> INVOKE 1회 -> (다음 요청은 release 후) SHUTDOWN"""
+    calls = []
+    callbacks_at_next = []
+    release = threading.Event()
+    callbacks = None
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body: dict, headers: dict = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):  # noqa: N802
+        self.calls.append(("register", self.headers["Lambda-Extension-Name"]))
+        self._reply({}, {"Lambda-Extension-Identifier": "ext-1"})
+
+    def do_GET(self):  # noqa: N802
+        self.calls.append(("next", self.headers["Lambda-Extension-Identifier"]))
+        self.callbacks_at_next.append(len(self.callbacks))
+        if len(self.callbacks_at_next) == 1:
+            self._reply({"eventType": "INVOKE"})
+            return
+        self.release.wait(5)
+        self._reply({"eventType": "SHUTDOWN"})
+
+
+def test_callback_runs_after_invocation_before_next_event():
+    """INVOKE 수신 후 핸들러 종료 신호를 받으면 callback을 실행하고 나서야 다음 이벤트를 요청"""
+    FakeExtensionsApi.callbacks = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeExtensionsApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        hook = PostResponseHook(lambda: FakeExtensionsApi.callbacks.append("flush"),
+                                runtime_api=f"127.0.0.1:{server.server_port}")
+        assert hook.start()
+        assert FakeExtensionsApi.calls[0] == ("register", "surl-post-response")
+
+        hook.invocation_done()
+        for _ in range(100):
+            if len(FakeExtensionsApi.callbacks_at_next) == 2:
+                break
+            threading.Event().wait(0.02)
+        assert FakeExtensionsApi.callbacks == ["flush"]
+        assert FakeExtensionsApi.callbacks_at_next == [0, 1]
+        assert FakeExtensionsApi.calls[1:] == [("next", "ext-1"), ("next", "ext-1")]
+    finally:
+        FakeExtensionsApi.release.set()
+        server.shutdown()
+
+
+def test_start_outside_lambda_is_noop():
+    """AWS_LAMBDA_RUNTIME_API가 없으면 등록하지 않음 (로컬은 flush 스레드 사용)"""
+    assert PostResponseHook(lambda: None, runtime_api="").start() is False
+
+
+if __name__ == "__main__":
+    test_callback_runs_after_invocation_before_next_event()
+    test_start_outside_lambda_is_noop()
+    print("All tests passed.")
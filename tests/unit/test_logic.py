@@ -7,7 +7,9 @@ import os
 
 # src/common 경로 추가
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-from common.base62 import encode, decode
+import pytest
+
+from common.base62 import Base62Error, decode, decode_many, encode, encode_many, is_valid
 
 
 def test_encode_decode_roundtrip():
@@ -32,8 +34,37 @@ def test_decode_specific_values():
     assert decode("10") == 62
 
 
+def test_invalid_codes_rejected():
+    """잘못된 문자/빈 문자열/비정규형 코드를 Base62Error(ValueError)로 거부하는지 검증"""
+    for bad in ["", "ab-", "한글", "a b"]:
+        with pytest.raises(Base62Error):
+            decode(bad)
+    with pytest.raises(ValueError):
+        decode("01", strict=True)
+    with pytest.raises(Base62Error):
+        encode(-1)
+    assert decode("01") == 1
+    assert is_valid("1a") and not is_valid("01")
+
+
+def test_batch_matches_single():
+    """encode_many/decode_many가 단건 함수와 같은 결과인지 검증 (NumPy 경로 포함)"""
+    nums = [0, 1, 61, 62, 3843, 2 ** 40, 2 ** 63 - 1] + list(range(1000, 3000))
+    expected = [encode(n) for n in nums]
+    assert encode_many(nums, vectorize=False) == expected
+    assert decode_many(expected, vectorize=False) == nums
+    pytest.importorskip("numpy")
+    assert encode_many(nums, vectorize=True) == expected
+    short = [c for c in expected if len(c) <= 10]
+    assert decode_many(short, vectorize=True) == [decode(c) for c in short]
+    with pytest.raises(Base62Error):
+        decode_many(short + ["ab-"], vectorize=True)
+
+
 if __name__ == "__main__":
     test_encode_decode_roundtrip()
     test_encode_specific_values()
     test_decode_specific_values()
+    test_invalid_codes_rejected()
+    test_batch_matches_single()
     print("All tests passed.")
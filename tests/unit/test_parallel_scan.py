@@ -0,0 +1,63 @@
+"""
+로컬 유닛 테스트 - 병렬 세그먼트 Scan 검증
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.parallel_scan import parallel_scan, scan_pages
+
+
+class FakeTable:
+    """Segment/TotalSegments와 페이지네이션을 흉내내는 Scan 대역"""
+    def __init__(self, items, page_size=3):
+        self.items = items
+        self.page_size = page_size
+        self.calls = []
+
+    def scan(self, **params):
+        self.calls.append(params)
+        segment, total = params.get("Segment", 0), params.get("TotalSegments", 1)
+        mine = [it for n, it in enumerate(self.items) if n % total == segment]
+        start = params.get("ExclusiveStartKey", 0)
+        resp = {"Items": mine[start:start + self.page_size]}
+        if start + self.page_size < len(mine):
+            resp["LastEvaluatedKey"] = start + self.page_size
+        return resp
+
+
+def test_scan_pages_follows_pagination():
+    """LastEvaluatedKey를 따라 모든 페이지를 순회하는지 검증"""
+    table = FakeTable(list(range(10)))
+    pages = list(scan_pages(table, {"FilterExpression": "x"}))
+    assert [len(p) for p in pages] == [3, 3, 3, 1]
+    assert all(call["FilterExpression"] == "x" for call in table.calls)
+
+
+def test_parallel_scan_covers_every_item_once():
+    """세그먼트별 집계를 병합하면 전체 항목이 정확히 한 번씩 포함되는지 검증"""
+    items = [{"category": "IT" if n % 3 else "Food"} for n in range(100)]
+    table = FakeTable(items)
+
+    def aggregate(pages):
+        stats = {}
+        for page in pages:
+            for item in page:
+                stats[item["category"]] = stats.get(item["category"], 0) + 1
+        return stats
+
+    results = parallel_scan(lambda: table, 4, {}, aggregate)
+    assert len(results) == 4
+    merged = {}
+    for stats in results:
+        for cat, n in stats.items():
+            merged[cat] = merged.get(cat, 0) + n
+    assert merged == {"Food": 34, "IT": 66}
+    assert {call["TotalSegments"] for call in table.calls} == {4}
+
+
+if __name__ == "__main__":
+    test_scan_pages_follows_pagination()
+    test_parallel_scan_covers_every_item_once()
+    print("All tests passed.")
@@ -0,0 +1,120 @@
+"""
+로컬 유닛 테스트 - redirect 핸들러 (메모리 저장소, 방금 생성한 링크 / 발급되지 않은 코드 처리)
+"""
+
+import json
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+import conftest  # noqa: F401  (핸들러 import 전 공통 환경 설정)
+
+from common.base62 import encode
+from create import app as create_app
+from redirect import app as redirect_app
+
+
+def _create(url: str) -> str:
+    resp = create_app.handler({"body": json.dumps({"url": url}), "headers": {"Host": "localhost"}}, None)
+    assert resp["statusCode"] == 201
+    return json.loads(resp["body"])["shortCode"]
+
+
+def _redirect(code: str) -> dict:
+    return redirect_app.handler({
+        "pathParameters": {"shortCode": code},
+        "requestContext": {"identity": {"sourceIp": "127.0.0.1"}},
+    }, None)
+
+
+def test_redirect_right_after_create():
+    """high-water mark가 캐시된 상태(갱신 주기 내)에서도 방금 생성한 링크는 바로 302"""
+    _create("https://example.com/redirect-warmup")
+    # 현재 최대값 이후의 코드를 조회해 HWM 캐시와 재조회 시각을 채움
+    assert _redirect(encode(redirect_app._current_hwm() + 1000))["statusCode"] == 404
+
+    url = "https://example.com/redirect-fresh"
+    code = _create(url)
+    resp = _redirect(code)
+    assert resp["statusCode"] == 302
+    assert resp["headers"]["Location"] == url
+
+
+def test_unissued_code_rejected_after_refresh(monkeypatch):
+    """재조회한 최대값보다 큰 코드는 저장소 조회 없이 404"""
+    monkeypatch.setattr(redirect_app, "_HWM_REFRESH_SECONDS", 0)
+    calls = []
+    monkeypatch.setattr(redirect_app._STORAGE, "get_mapping", lambda *a, **k: calls.append(a))
+
+    code = encode(redirect_app._current_hwm() + 10**6)
+    assert _redirect(code)["statusCode"] == 404
+    assert calls == []
+
+
+def test_probed_next_code_is_not_negative_cached():
+    """다음 코드를 미리 조회(404)해도 부정 캐시하지 않아 곧 생성된 링크가 바로 302"""
+    _create("https://example.com/redirect-probe-warmup")
+    next_code = encode(create_app.STORAGE.read_counter() + 1)
+    assert _redirect(next_code)["statusCode"] == 404
+    assert next_code not in redirect_app._NEGATIVE_CACHE
+
+    code = _create("https://example.com/redirect-probed")
+    assert code == next_code
+    assert _redirect(code)["statusCode"] == 302
+
+
+def test_settled_missing_code_is_negative_cached(monkeypatch):
+    """확정된 high-water mark 이하인데 없는 코드(임대 후 쓰이지 않은 ID)는 부정 캐시"""
+    monkeypatch.setattr(redirect_app, "_BLOOM_BUILD_DELAY", 0)
+    monkeypatch.setattr(redirect_app, "_HWM_REFRESH_SECONDS", 0)
+    unused = encode(create_app.STORAGE.reserve_ids(1))
+    redirect_app._refresh_hwm()
+
+    assert _redirect(unused)["statusCode"] == 404
+    assert unused in redirect_app._NEGATIVE_CACHE
+
+
+def _rebuild_bloom() -> None:
+    redirect_app._ensure_bloom()
+    for thread in threading.enumerate():
+        if thread.name == "bloom-builder":
+            thread.join()
+
+
+def test_bloom_filter_is_rebuilt_periodically(monkeypatch):
+    """재구성 주기가 지나면 필터를 다시 만들어 이후 생성된 코드까지 포함"""
+    monkeypatch.setattr(redirect_app, "_BLOOM_BUILD_DELAY", 0)
+    monkeypatch.setattr(redirect_app, "_BLOOM_REBUILD_SECONDS", 0)
+    first = _create("https://example.com/bloom-first")
+    _rebuild_bloom()
+    assert first in redirect_app._bloom["filter"]
+
+    second = _create("https://example.com/bloom-second")
+    _rebuild_bloom()
+    assert second in redirect_app._bloom["filter"]
+    assert redirect_app._bloom["coverage"] >= redirect_app.decode(second)
+
+
+def test_mapping_cache_metrics_emitted_every_n_requests(monkeypatch):
+    """N번째 요청마다 직전 출력 이후의 캐시 hit/miss 증분을 지표로 출력"""
+    code = _create("https://example.com/redirect-metrics")
+    emitted = []
+    monkeypatch.setattr(redirect_app.metrics, "emit", lambda values, *a, **k: emitted.append(values))
+    monkeypatch.setattr(redirect_app, "_CACHE_METRICS_EVERY", 3)
+    monkeypatch.setitem(redirect_app._cache_metrics, "requests", 0)
+    monkeypatch.setitem(redirect_app._cache_metrics, "last", redirect_app._MAPPING_CACHE.stats())
+
+    for _ in range(3):
+        _redirect(code)
+    assert len(emitted) == 1
+    assert emitted[0]["MappingCacheMisses"] == 1 and emitted[0]["MappingCacheHits"] == 2
+
+    _redirect(code)
+    assert len(emitted) == 1
+
+
+if __name__ == "__main__":
+    test_redirect_right_after_create()
+    test_probed_next_code_is_not_negative_cached()
+    print("All tests passed.")
@@ -0,0 +1,60 @@
+"""
+로컬 유닛 테스트 - 트렌드 분석 캐시(분포 지문/변동 허용) 검증
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.report_cache import TrendReportCache, distribution_shift, fingerprint, shares
+
+
+class FakeDynamo:
+    """batch_get_item / batch_write_item 대역"""
+    def __init__(self):
+        self.items = {}
+
+    def batch_get_item(self, RequestItems):
+        (table, req), = RequestItems.items()
+        found = [self.items[k["reportKey"]] for k in req["Keys"] if k["reportKey"] in self.items]
+        return {"Responses": {table: found}}
+
+    def batch_write_item(self, RequestItems):
+        (table, reqs), = RequestItems.items()
+        for r in reqs:
+            item = r["PutRequest"]["Item"]
+            self.items[item["reportKey"]] = item
+        return {"UnprocessedItems": {}}
+
+
+def test_fingerprint_ignores_small_changes():
+    """비율 변화가 양자화 단위보다 작으면 같은 지문인지 검증"""
+    assert fingerprint({"IT": 600, "뉴스": 400}) == fingerprint({"IT": 1201, "뉴스": 799})
+    assert fingerprint({"IT": 600, "뉴스": 400}) != fingerprint({"IT": 300, "뉴스": 700})
+    assert distribution_shift(shares({"IT": 1}), shares({"뉴스": 1})) == 1.0
+
+
+def test_near_distribution_reuses_last_report():
+    """지문이 달라도 분포 변동이 임계값 이하면 윈도우별 마지막 분석을 재사용하는지 검증"""
+    cache = TrendReportCache(max_shift=0.1)
+    cache.put(60, {"IT": 50, "뉴스": 50}, "분석 A")
+    assert cache.get(60, {"IT": 50, "뉴스": 50}) == ("분석 A", "memory_exact")
+    assert cache.get(60, {"IT": 57, "뉴스": 43}) == ("분석 A", "memory_near")
+    assert cache.get(60, {"IT": 90, "뉴스": 10}) == (None, "miss")
+    assert cache.get(1440, {"IT": 50, "뉴스": 50}) == (None, "miss")
+
+
+def test_dynamo_tier_survives_cold_start():
+    """새 컨테이너(빈 메모리)에서도 DynamoDB 계층에서 적중하는지 검증"""
+    dynamo = FakeDynamo()
+    TrendReportCache(dynamo=dynamo, table_name="t").put(60, {"IT": 3}, "분석 B")
+    cold = TrendReportCache(dynamo=dynamo, table_name="t")
+    assert cold.get(60, {"IT": 30}) == ("분석 B", "dynamo_exact")
+    assert cold.get(60, {"IT": 30}) == ("분석 B", "memory_exact")
+
+
+if __name__ == "__main__":
+    test_fingerprint_ignores_small_changes()
+    test_near_distribution_reuses_last_report()
+    test_dynamo_tier_survives_cold_start()
+    print("All tests passed.")
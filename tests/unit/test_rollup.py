@@ -0,0 +1,155 @@
+"""
+로컬 유닛 테스트 - 분 단위 카테고리 rollup 검증
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+import conftest  # noqa: F401  (핸들러 import 전 공통 환경 설정)
+
+from common.rollup import DynamoRollupStore, MemoryRollupStore, MemorySketchStore, accumulate, window_days
+from common.storage.dynamo import DynamoStorage
+from rollup import app as rollup_app
+
+
+class FakeRollupTable:
+    """day 파티션 Query만 흉내내는 테이블 (호출 수 기록)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def query(self, **params):
+        self.queries += 1
+        values = params["ExpressionAttributeValues"]
+        items = [
+            {"slot": slot, "clicks": clicks}
+            for (day, slot), clicks in sorted(self.rows.items())
+            if day == values[":d"] and slot >= values.get(":from", "")
+        ]
+        return {"Items": items}
+
+
+def test_accumulate_groups_by_minute_and_category():
+    """같은 분/카테고리 클릭이 한 행으로 합쳐지는지 검증"""
+    clicks = [
+        {"timestamp": "2026-10-17T05:12:01+00:00", "category": "IT"},
+        {"timestamp": "2026-10-17T05:12:59+00:00", "category": "IT"},
+        {"timestamp": "2026-10-17T05:13:00+00:00", "category": "IT"},
+        {"timestamp": "2026-10-17T05:12:30+00:00"},
+    ]
+    assert accumulate(clicks) == {
+        ("2026-10-17", "05:12#IT"): 2,
+        ("2026-10-17", "05:13#IT"): 1,
+        ("2026-10-17", "05:12#기타"): 1,
+    }
+
+
+def test_window_queries_one_partition_per_day():
+    """7일 윈도우가 day 파티션 Query 8회 이내로 끝나는지 검증"""
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(minutes=10080)
+    table = FakeRollupTable({})
+    list(DynamoRollupStore(table).iter_window(since))
+    assert table.queries == len(window_days(since)) <= 8
+
+
+def test_window_excludes_minutes_before_since():
+    """시작 분 이전 행은 합산에서 빠지는지 검증 (DynamoDB/메모리 저장소 동일)"""
+    since = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(minutes=5)
+    old = since - timedelta(minutes=1)
+    increments = accumulate([
+        {"timestamp": since.isoformat(), "category": "IT"},
+        {"timestamp": old.isoformat(), "category": "IT"},
+    ])
+    memory = MemoryRollupStore()
+    memory.apply(increments)
+    table = FakeRollupTable(increments)
+    for store in (memory, DynamoRollupStore(table)):
+        assert [row[2:] for row in store.iter_window(since)] == [("IT", 1)]
+
+
+class ThrottlingError(Exception):
+    response = {"Error": {"Code": "ProvisionedThroughputExceededException"}}
+
+
+class ConditionalError(Exception):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+
+
+class FakeUpdateTable:
+    """ADD clicks / batches 조건부 update_item 대역 (fail_at번째 호출 1회는 스로틀링으로 실패)"""
+
+    def __init__(self, fail_at: int = None):
+        self.rows = {}
+        self.calls = 0
+        self.fail_at = fail_at
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ConditionExpression=None):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise ThrottlingError()
+        row = self.rows.setdefault((Key["day"], Key["slot"]), {"clicks": 0, "batches": set()})
+        values = ExpressionAttributeValues
+        if ConditionExpression and values[":id"] in row["batches"]:
+            raise ConditionalError()
+        row["clicks"] += values[":n"]
+        row["batches"] |= values.get(":t", set())
+
+
+class FakeDynamo:
+    def __init__(self, table):
+        self.table = table
+
+    def Table(self, name):  # noqa: N802
+        return self.table
+
+
+def test_rollup_retry_skips_rows_already_applied():
+    """같은 token으로 다시 반영하면 중간 실패 전에 반영된 행은 건너뛰고 나머지만 ADD"""
+    increments = {("2026-10-17", f"05:1{i}#IT"): i + 1 for i in range(3)}
+    table = FakeUpdateTable(fail_at=2)
+    store = DynamoRollupStore(table)
+    with pytest.raises(ThrottlingError):
+        store.apply(increments, token="b1")
+    store.apply(increments, token="b1")
+    assert {key: row["clicks"] for key, row in table.rows.items()} == increments
+
+    store.apply(increments, token="b2")
+    assert [row["clicks"] for row in table.rows.values()] == [2, 4, 6]
+
+
+def test_stream_retry_does_not_double_count():
+    """rollup 쓰기가 중간에 실패해 같은 배치가 재시도돼도 rollup / 인기 링크 클릭 수는 한 번만 반영"""
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    records = [
+        {"eventName": "INSERT", "dynamodb": {"SequenceNumber": str(100 + i), "NewImage": {
+            "timestamp": {"S": (now + timedelta(seconds=i)).isoformat()},
+            "category": {"S": "IT" if i % 2 else "뉴스"}, "ip": {"S": "1.1.1.1"}, "shortCode": {"S": "a"},
+        }}}
+        for i in range(4)
+    ]
+    table = FakeUpdateTable(fail_at=2)
+    rollup_app._STORAGE = DynamoStorage(FakeDynamo(table), "m", "c", "u", "logs", "r")
+    rollup_app._SKETCH_STORE = MemorySketchStore()
+
+    with pytest.raises(ThrottlingError):
+        rollup_app.handler({"Records": records}, None)
+    assert rollup_app.handler({"Records": records}, None)["clicks"] == 4
+
+    assert sorted(row["clicks"] for row in table.rows.values()) == [2, 2]
+    hour = now.strftime("%Y-%m-%dT%H")
+    assert rollup_app._SKETCH_STORE.read([hour]).summary()["topLinks"] == [{"shortCode": "a", "clicks": 4}]
+
+
+if __name__ == "__main__":
+    test_accumulate_groups_by_minute_and_category()
+    test_window_queries_one_partition_per_day()
+    test_window_excludes_minutes_before_since()
+    test_rollup_retry_skips_rows_already_applied()
+    test_stream_retry_does_not_double_count()
+    print("All tests passed.")
@@ -0,0 +1,128 @@
+"""
+로컬 유닛 테스트 - 근사 집계 스케치(HyperLogLog, Count-Min, 인기 링크) 검증
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.rollup import DynamoSketchStore, sketch_clicks
+from common.sketch import OVERFLOW_CATEGORY, ClickSketch, HeavyHitters, HyperLogLog, UniqueCounter
+
+
+class ConflictError(Exception):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+
+
+class FakeSketchTable:
+    """get_item / 조건부 put_item 대역 (첫 put은 동시 쓰기 충돌로 실패)"""
+    def __init__(self):
+        self.items = {}
+        self.conflicts = 1
+
+    def get_item(self, Key, ConsistentRead=False):
+        item = self.items.get(Key["hour"])
+        return {"Item": item} if item else {}
+
+    def put_item(self, Item, **params):
+        if self.conflicts:
+            self.conflicts -= 1
+            raise ConflictError()
+        self.items[Item["hour"]] = Item
+
+
+def test_hyperloglog_estimate_and_merge():
+    """고유 원소 수 추정 오차와 병합(합집합) 결과 검증"""
+    a, b = HyperLogLog(), HyperLogLog()
+    for i in range(20000):
+        a.add(f"10.0.{i}")
+    for i in range(10000, 30000):
+        b.add(f"10.0.{i}")
+    assert abs(a.count() - 20000) / 20000 < 0.1
+    a.merge(b)
+    assert abs(a.count() - 30000) / 30000 < 0.1
+    assert HyperLogLog.from_bytes(a.to_bytes()).count() == a.count()
+
+
+def test_heavy_hitters_find_hot_links():
+    """드물게 나오는 다수 링크 사이에서 인기 링크를 상위로 찾는지 검증"""
+    left, right = HeavyHitters(k=5), HeavyHitters(k=5)
+    for i in range(5000):
+        left.add(f"cold{i}")
+        right.add(f"cold{i + 5000}")
+    for _ in range(300):
+        left.add("hot")
+        right.add("hot")
+        right.add("warm")
+    left.merge(right)
+    top = left.top(2)
+    assert [code for code, _ in top] == ["hot", "warm"]
+    assert top[0][1] >= 600
+
+
+def test_sketch_store_retries_on_version_conflict():
+    """동시 병합 충돌 시 다시 읽고 병합해 저장하는지, 항목 직렬화가 유지되는지 검증"""
+    clicks = [
+        {"timestamp": "2026-10-17T05:00:01+00:00", "ip": f"1.1.1.{i % 50}", "category": "IT", "shortCode": "a"}
+        for i in range(200)
+    ]
+    (hour, sketch), = sketch_clicks(clicks).items()
+    table = FakeSketchTable()
+    DynamoSketchStore(table).merge(hour, sketch)
+    stored = table.items["2026-10-17T05"]
+    assert stored["version"] == 1
+    summary = ClickSketch.from_item(stored).summary()
+    assert abs(summary["uniqueVisitors"] - 50) <= 2
+    assert summary["topLinks"] == [{"shortCode": "a", "clicks": 200}]
+
+
+def test_sketch_store_skips_batch_already_merged():
+    """같은 배치 token은 한 번만 병합 (Count-Min 덧셈이 재시도로 두 번 더해지지 않음)"""
+    clicks = [{"timestamp": "2026-10-17T06:00:01+00:00", "ip": "1.1.1.1", "category": "IT", "shortCode": "a"}] * 5
+    (hour, sketch), = sketch_clicks(clicks).items()
+    table = FakeSketchTable()
+    table.conflicts = 0
+    store = DynamoSketchStore(table)
+    store.merge(hour, sketch, token="b1")
+    store.merge(hour, sketch, token="b1")
+    assert ClickSketch.from_item(table.items[hour]).summary()["topLinks"] == [{"shortCode": "a", "clicks": 5}]
+    store.merge(hour, sketch, token="b2")
+    assert table.items[hour]["batches"] == ["b1", "b2"]
+    assert ClickSketch.from_item(table.items[hour]).summary()["topLinks"][0]["clicks"] == 10
+
+
+def test_unique_counter_switches_to_hll():
+    """임계값까지는 정확히 세고, 넘으면 HyperLogLog 근사로 전환하는지 검증"""
+    counter = UniqueCounter(threshold=100)
+    for i in range(250):
+        counter.add(f"ip{i % 80}")
+    assert counter.exact and counter.count() == 80
+    for i in range(5000):
+        counter.add(f"ip{i}")
+    assert not counter.exact
+    assert abs(counter.count() - 5000) / 5000 < 0.1
+
+
+def test_category_hlls_are_capped():
+    """자유 형식 카테고리가 많아도 HLL 수는 상한 + 1개, 넘친 카테고리는 OVERFLOW_CATEGORY에 합산"""
+    sketch = ClickSketch(max_categories=4)
+    for i in range(10):
+        sketch.add(f"10.0.0.{i}", f"cat{i}", "a")
+    assert len(sketch.category_visitors) == 5
+    assert sketch.summary()["uniqueVisitorsByCategory"][OVERFLOW_CATEGORY] == 6
+
+    other = ClickSketch(max_categories=4)
+    other.add("10.0.1.1", "new", "b")
+    sketch.merge(other)
+    restored = ClickSketch.from_item(sketch.to_item())
+    assert len(sketch.category_visitors) == 5 and len(restored.category_visitors) == 5
+
+
+if __name__ == "__main__":
+    test_hyperloglog_estimate_and_merge()
+    test_heavy_hitters_find_hot_links()
+    test_sketch_store_retries_on_version_conflict()
+    test_sketch_store_skips_batch_already_merged()
+    test_unique_counter_switches_to_hll()
+    test_category_hlls_are_capped()
+    print("All tests passed.")
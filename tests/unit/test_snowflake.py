@@ -0,0 +1,86 @@
+"""
+로컬 유닛 테스트 - Snowflake ID 생성기 충돌 안전성 검증
+"""
+
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+import conftest  # noqa: F401  (핸들러 import 전 공통 환경 설정)
+
+from common.base62 import encode
+from common.snowflake import SnowflakeGenerator, MAX_SEQUENCE, max_id_at, parse
+from create import app as create_app
+
+
+def test_many_concurrent_generators_never_collide():
+    """worker id가 다른 다수 생성기를 여러 스레드에서 동시에 돌려도 코드가 겹치지 않는지 검증"""
+    generators = [SnowflakeGenerator(worker_id=w) for w in range(32)]
+    codes = []
+    lock = threading.Lock()
+
+    def worker(gen):
+        local = [encode(gen.next_id()) for _ in range(2000)]
+        with lock:
+            codes.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(g,)) for g in generators for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(codes) == len(set(codes)) == 32 * 2 * 2000
+
+
+def test_sequence_overflow_waits_for_next_ms():
+    """같은 밀리초에 4096개를 넘기면 다음 밀리초로 넘어가는지 검증"""
+    ticks = iter([1_800_000_000_000] * (MAX_SEQUENCE + 3) + [1_800_000_000_001] * 10)
+    gen = SnowflakeGenerator(worker_id=1, clock=lambda: next(ticks))
+    ids = [gen.next_id() for _ in range(MAX_SEQUENCE + 2)]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+    assert parse(ids[-1])["timestamp_ms"] == 1_800_000_000_001
+
+
+def test_clock_rollback_keeps_monotonic():
+    """시계가 뒤로 가도 ID가 단조 증가하는지 검증"""
+    ticks = iter([1_800_000_000_010, 1_800_000_000_005, 1_800_000_000_011])
+    gen = SnowflakeGenerator(worker_id=7, clock=lambda: next(ticks))
+    a, b, c = gen.next_id(), gen.next_id(), gen.next_id()
+    assert a < b < c
+
+
+def test_parse_and_upper_bound():
+    """구성 요소 복원 및 시각별 상한 검증"""
+    gen = SnowflakeGenerator(worker_id=5, clock=lambda: 1_800_000_000_000)
+    value = gen.next_id()
+    assert parse(value) == {"timestamp_ms": 1_800_000_000_000, "worker_id": 5, "sequence": 0}
+    assert value <= max_id_at(1_800_000_000_000) < max_id_at(1_800_000_000_001)
+
+
+def test_shared_worker_id_collision_reissues_code(monkeypatch):
+    """두 컨테이너가 같은 worker id를 뽑아 같은 밀리초에 같은 코드를 만들면 조건부 저장 후 새 코드로 재발급"""
+    clock = lambda: 1_800_000_000_000  # noqa: E731
+    container_a = SnowflakeGenerator(worker_id=42, clock=clock)
+    container_b = SnowflakeGenerator(worker_id=42, clock=clock)
+    code_a = encode(container_a.next_id())
+    code_b = encode(container_b.next_id())
+    assert code_a == code_b
+
+    monkeypatch.setattr(create_app, "_SNOWFLAKE", container_a)
+    assert create_app._save_with_retry(code_a, "https://example.com/sf-a", {"category": "IT"}) == code_a
+
+    monkeypatch.setattr(create_app, "_SNOWFLAKE", container_b)
+    saved_b = create_app._save_with_retry(code_b, "https://example.com/sf-b", {"category": "IT"})
+    assert saved_b != code_a
+    assert create_app.STORAGE.get_mapping(code_a)["originalUrl"] == "https://example.com/sf-a"
+    assert create_app.STORAGE.get_mapping(saved_b)["originalUrl"] == "https://example.com/sf-b"
+
+
+if __name__ == "__main__":
+    test_many_concurrent_generators_never_collide()
+    test_sequence_overflow_waits_for_next_ms()
+    test_clock_rollback_keeps_monotonic()
+    test_parse_and_upper_bound()
+    print("All tests passed.")
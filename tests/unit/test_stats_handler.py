@@ -0,0 +1,119 @@
+"""
+로컬 유닛 테스트 - stats 핸들러 (링크 파티션 Query 페이지 순회 / 응답 TTL 캐시)
+"""
+
+import json
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+import conftest  # noqa: F401  (핸들러 import 전 공통 환경 설정)
+
+from common.cache import TTLCache
+from common.storage.dynamo import DynamoStorage
+from stats import app
+
+
+class FakeLogTable:
+    """shortCode 파티션 Query를 page_size개씩 LastEvaluatedKey로 나눠 돌려주는 가짜 테이블"""
+    name = "logs"
+
+    def __init__(self, items, page_size=2):
+        self.items = items
+        self.page_size = page_size
+        self.calls = []
+
+    def query(self, **params):
+        self.calls.append(params)
+        values = params["ExpressionAttributeValues"]
+        rows = [
+            item for item in self.items
+            if item["shortCode"] == values[":c"] and values[":since"] <= item["timestamp"] <= values[":until"]
+        ]
+        start = params.get("ExclusiveStartKey", 0)
+        resp = {"Items": [{"timestamp": r["timestamp"], "ip": r["ip"]} for r in rows[start:start + self.page_size]]}
+        if start + self.page_size < len(rows):
+            resp["LastEvaluatedKey"] = start + self.page_size
+        return resp
+
+
+class FakeDynamo:
+    def __init__(self, table):
+        self.table = table
+
+    def Table(self, name):  # noqa: N802
+        return self.table
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _setup(items):
+    """가짜 DynamoDB 저장소 + 조작 가능한 시계를 쓰는 캐시로 교체"""
+    table = FakeLogTable(items)
+    clock = FakeClock()
+    app._STORAGE = DynamoStorage(FakeDynamo(table), "m", "c", "u", "logs", "r")
+    app._STATS_CACHE = TTLCache(maxsize=100, ttl=30, clock=clock)
+    return table, clock
+
+
+def _get(code: str, query: dict) -> tuple:
+    resp = app.handler({"pathParameters": {"shortCode": code}, "queryStringParameters": query}, None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+
+def _clicks(code: str, minutes_ago: list, ips: list) -> list:
+    now = datetime.now(timezone.utc)
+    return [
+        {"shortCode": code, "timestamp": (now - timedelta(minutes=m)).isoformat(), "ip": ip}
+        for m, ip in zip(minutes_ago, ips)
+    ]
+
+
+def test_stats_follow_query_pages():
+    """여러 페이지(LastEvaluatedKey)에 걸친 클릭을 모두 버킷 / 고유 IP로 집계"""
+    items = _clicks("s1", [5, 15, 25, 35, 45], ["1.1.1.1", "2.2.2.2", "1.1.1.1", "3.3.3.3", "2.2.2.2"])
+    items += _clicks("other", [5], ["9.9.9.9"]) + _clicks("s1", [120], ["8.8.8.8"])
+    table, _ = _setup(items)
+
+    status, body = _get("s1", {"minutes": "60", "bucket": "30"})
+    assert status == 200
+    assert body["count"] == 5 and body["uniqueVisitors"] == 3 and body["uniqueExact"] is True
+    assert [b["count"] for b in body["series"]] == [2, 3]
+    assert len(table.calls) == 3
+    assert [c.get("ExclusiveStartKey") for c in table.calls] == [None, 2, 4]
+
+
+def test_stats_response_cache():
+    """같은 링크 / 구간은 TTL 동안 캐시 응답, 다른 파라미터나 만료 후에는 다시 조회"""
+    table, clock = _setup(_clicks("s2", [1], ["1.1.1.1"]))
+
+    _get("s2", {"minutes": "60"})
+    _get("s2", {"minutes": "60"})
+    assert len(table.calls) == 1
+
+    _get("s2", {"minutes": "120"})
+    assert len(table.calls) == 2
+
+    clock.now += 31
+    _get("s2", {"minutes": "60"})
+    assert len(table.calls) == 3
+
+
+def test_stats_rejects_bad_parameters():
+    _setup([])
+    assert _get("s3", {"minutes": "abc"})[0] == 400
+    assert _get("", {})[0] == 400
+
+
+if __name__ == "__main__":
+    test_stats_follow_query_pages()
+    test_stats_response_cache()
+    test_stats_rejects_bad_parameters()
+    print("All tests passed.")
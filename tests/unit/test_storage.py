@@ -0,0 +1,191 @@
+"""
+로컬 유닛 테스트 - 저장소 백엔드(메모리 / SQLite)가 같은 동작을 하는지, DynamoDB 조건부 쓰기 충돌 변환 검증
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.storage import Conflict
+from common.storage.base import Storage
+from common.storage.dynamo import DynamoStorage
+from common.storage.memory import MemoryStorage
+from common.storage.sqlite import SqliteStorage
+
+
+def _backends():
+    return [MemoryStorage(), SqliteStorage(":memory:")]
+
+
+def _click(code: str, ts: datetime, category: str = "IT", ip: str = "1.1.1.1") -> dict:
+    return {"shortCode": code, "timestamp": ts.isoformat(), "category": category, "ip": ip}
+
+
+def test_mapping_and_counter_contract():
+    """매핑 조건부 저장 / 갱신 / 일괄 조회와 카운터 예약이 백엔드마다 같은지 검증"""
+    for store in _backends():
+        assert store.reserve_ids(1) == 1
+        assert store.reserve_ids(10) == 11
+        assert store.read_counter() == 11
+
+        item = {"shortCode": "a", "originalUrl": "https://a.com", "category": "IT", "summary": "s", "createdAt": "t"}
+        store.put_mapping(item)
+        with pytest.raises(Conflict):
+            store.put_mapping(item)
+        store.update_mapping("a", {"category": "Food"})
+        with pytest.raises(Conflict):
+            store.update_mapping("missing", {"category": "Food"})
+        assert store.get_mapping("a", attributes=("originalUrl", "category")) == {
+            "originalUrl": "https://a.com", "category": "Food",
+        }
+        assert store.get_mapping("missing") is None
+
+        assert store.put_mappings([{"shortCode": "b", "originalUrl": "https://b.com"}]) == []
+        # 일괄 저장도 이미 있는 코드는 덮어쓰지 않고 실패 항목으로 반환
+        taken = {"shortCode": "a", "originalUrl": "https://other.com"}
+        assert store.put_mappings([taken, {"shortCode": "d", "originalUrl": "https://d.com"}]) == [taken]
+        assert store.get_mapping("a")["originalUrl"] == "https://a.com"
+        store.update_mapping("d", {"category": "IT"})
+        assert set(store.get_mappings(["a", "b", "c"])) == {"a", "b"}
+        assert sorted(store.iter_short_codes()) == ["a", "b", "d"]
+
+        assert store.put_url_index("h1", "a", "t") is True
+        assert store.put_url_index("h1", "b", "t") is False
+        assert store.put_url_indexes([
+            {"urlHash": "h1", "shortCode": "c", "createdAt": "t"},
+            {"urlHash": "h2", "shortCode": "b", "createdAt": "t"},
+        ]) == []
+        # 일괄 저장도 이미 있는 인덱스는 먼저 저장된 코드를 유지
+        assert store.get_url_codes(["h1", "h2", "h3"]) == {"h1": "a", "h2": "b"}
+
+
+def test_click_log_pages_and_rollup():
+    """클릭 로그 구간 조회 / 링크별 조회 / 저장 시 rollup 반영이 백엔드마다 같은지 검증"""
+    now = datetime.now(timezone.utc).replace(second=30, microsecond=0)
+    clicks = [
+        _click("a", now - timedelta(minutes=90)),
+        _click("a", now - timedelta(minutes=5), ip="2.2.2.2"),
+        _click("b", now - timedelta(minutes=5), category="Food"),
+        _click("a", now - timedelta(minutes=1)),
+    ]
+    for store in _backends():
+        assert store.put_clicks(clicks) == []
+        # 같은 키 재저장은 덮어쓰기만 하고 rollup에 다시 더하지 않음
+        store.put_click(clicks[-1])
+
+        since = now - timedelta(minutes=60)
+        rows = [item for page in store.iter_click_pages(since) for item in page]
+        assert sorted(item["category"] for item in rows) == ["Food", "IT", "IT"]
+
+        pages = store.iter_link_click_pages("a", since.isoformat(), now.isoformat())
+        assert sorted(item["ip"] for page in pages for item in page) == ["1.1.1.1", "2.2.2.2"]
+
+        rollup = {(minute, cat): n for _, minute, cat, n in store.iter_rollup(since)}
+        five_ago = (now - timedelta(minutes=5)).strftime("%H:%M")
+        assert rollup[(five_ago, "IT")] == 1 and rollup[(five_ago, "Food")] == 1
+        assert sum(rollup.values()) == 3
+
+
+class _ConflictError(Exception):
+    """botocore ClientError와 같은 response 속성을 가진 예외 (ALL_OLD로 돌려받은 기존 항목 포함)"""
+    response = {
+        "Error": {"Code": "ConditionalCheckFailedException"},
+        "Item": {"shortCode": {"S": "a"}, "originalUrl": {"S": "https://old.com"}},
+    }
+
+
+class _ConflictTable:
+    name = "T"
+
+    def put_item(self, **params):
+        raise _ConflictError()
+
+
+class _CanceledError(Exception):
+    """TransactionCanceledException 응답 (항목별 취소 사유 포함)"""
+    def __init__(self, codes):
+        self.response = {
+            "Error": {"Code": "TransactionCanceledException"},
+            "CancellationReasons": [{"Code": code} for code in codes],
+        }
+
+
+class _FakeDynamo:
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.saved = []
+
+    def Table(self, name):  # noqa: N802
+        return _ConflictTable()
+
+    def transact_write_items(self, TransactItems):  # noqa: N803
+        items = [entry["Put"]["Item"] for entry in TransactItems]
+        # 조건식 attribute_not_exists(<키>)의 키 값이 existing에 있으면 충돌
+        keys = [entry["Put"]["ConditionExpression"][len("attribute_not_exists("):-1] for entry in TransactItems]
+        codes = ["ConditionalCheckFailed" if item[key] in self.existing else "None" for item, key in zip(items, keys)]
+        if "ConditionalCheckFailed" in codes:
+            raise _CanceledError(codes)
+        self.saved.extend(items)
+        return {}
+
+
+def test_dynamo_conditional_failure_becomes_conflict():
+    """ConditionalCheckFailed가 매핑 저장에서는 Conflict, URL 인덱스에서는 False로 변환되는지 검증"""
+    store = DynamoStorage(_FakeDynamo(), "m", "c", "u", "l", "r")
+    with pytest.raises(Conflict) as raised:
+        store.put_mapping({"shortCode": "a", "originalUrl": "https://a.com"})
+    assert raised.value.existing == {"shortCode": "a", "originalUrl": "https://old.com"}
+    assert store.put_url_index("h", "a", "t") is False
+
+
+def test_conflict_carries_existing_mapping():
+    """이미 있는 shortCode 저장 시 Conflict에 기존 항목이 담기는지 검증 (메모리 / SQLite)"""
+    for store in _backends():
+        store.put_mapping({"shortCode": "x", "originalUrl": "https://first.com"})
+        with pytest.raises(Conflict) as raised:
+            store.put_mapping({"shortCode": "x", "originalUrl": "https://second.com"})
+        assert raised.value.existing["originalUrl"] == "https://first.com"
+
+
+def test_dynamo_put_mappings_is_conditional():
+    """트랜잭션 취소 시 충돌 항목만 실패로 반환하고 나머지는 다시 저장"""
+    dynamo = _FakeDynamo(existing={"b"})
+    store = DynamoStorage(dynamo, "m", "c", "u", "l", "r")
+    items = [{"shortCode": code, "originalUrl": f"https://{code}.com"} for code in "abc"]
+    assert store.put_mappings(items) == [items[1]]
+    assert [item["shortCode"] for item in dynamo.saved] == ["a", "c"]
+
+
+def test_dynamo_put_url_indexes_keeps_first_entry():
+    """이미 있는 urlHash는 덮어쓰지 않고 실패로도 반환하지 않음"""
+    dynamo = _FakeDynamo(existing={"h2"})
+    store = DynamoStorage(dynamo, "m", "c", "u", "l", "r")
+    items = [{"urlHash": h, "shortCode": code, "createdAt": "t"} for h, code in (("h1", "a"), ("h2", "b"))]
+    assert store.put_url_indexes(items) == []
+    assert dynamo.saved == [items[0]]
+
+
+def test_incomplete_backend_cannot_be_instantiated():
+    """인터페이스 메서드를 빠뜨린 백엔드는 호출 시점이 아니라 생성 시점에 TypeError"""
+    class Partial(Storage):
+        def get_mapping(self, short_code, attributes=None):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+    for store in _backends():
+        assert isinstance(store, Storage)
+
+
+if __name__ == "__main__":
+    test_mapping_and_counter_contract()
+    test_click_log_pages_and_rollup()
+    test_dynamo_conditional_failure_becomes_conflict()
+    test_conflict_carries_existing_mapping()
+    test_dynamo_put_mappings_is_conditional()
+    test_dynamo_put_url_indexes_keeps_first_entry()
+    test_incomplete_backend_cannot_be_instantiated()
+    print("All tests passed.")
@@ -0,0 +1,46 @@
+"""
+로컬 유닛 테스트 - 시계열/시간대 히트맵 집계 검증 (NumPy 경로는 설치된 경우만)
+"""
+
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.timeseries import analyze_numpy, analyze_python
+
+# 2026-10-17T00:00:00Z
+_SINCE = 1792195200
+_ROWS = [
+    ("2026-10-17T00:05:00.123456+00:00", "IT", 1),
+    ("2026-10-17T00:14:59+00:00", "IT", 1),
+    ("2026-10-17T00:15:00+00:00", "뉴스", 1),
+    ("2026-10-17T00:50", "IT", 3),
+    ("2026-10-16T23:59:59+00:00", "뉴스", 1),
+]
+
+
+def test_python_buckets_and_heatmap():
+    """버킷 경계, 윈도우 밖 행 제외, 가중치(rollup 합계 행), 시간대 보정 검증"""
+    report = analyze_python(_ROWS, _SINCE, _SINCE + 3600, 15 * 60, tz_offset_hours=9)
+    assert report["stats"] == {"IT": 5, "뉴스": 1} and report["count"] == 6
+    assert [b["counts"] for b in report["series"]] == [{"IT": 2}, {"뉴스": 1}, {}, {"IT": 3}]
+    assert report["series"][1]["start"] == "2026-10-17T00:15:00+00:00"
+    assert report["heatmap"]["IT"][9] == 5 and sum(report["heatmap"]["뉴스"]) == 1
+
+
+def test_numpy_matches_python():
+    """NumPy 벡터화 결과가 순수 Python 결과와 같은지 검증"""
+    pytest.importorskip("numpy")
+    expected = analyze_python(_ROWS, _SINCE, _SINCE + 3600, 600)
+    actual = analyze_numpy(_ROWS, _SINCE, _SINCE + 3600, 600)
+    assert actual["engine"] == "numpy"
+    assert {k: v for k, v in actual.items() if k != "engine"} == {k: v for k, v in expected.items() if k != "engine"}
+    assert analyze_numpy([], _SINCE, _SINCE + 3600, 600)["count"] == 0
+
+
+if __name__ == "__main__":
+    test_python_buckets_and_heatmap()
+    test_numpy_matches_python()
+    print("All tests passed.")
@@ -0,0 +1,189 @@
+"""
+로컬 유닛 테스트 - trend 핸들러 (메모리 저장소 + Bedrock 대역)
+"""
+
+import json
+import sys
+import os
+import weakref
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+import conftest  # noqa: F401  (핸들러 import 전 공통 환경 설정)
+
+from common.storage.dynamo import DynamoStorage
+from common.storage.memory import MemoryStorage
+from trend import app
+
+
+def _get(query: dict) -> tuple:
+    resp = app.handler({"queryStringParameters": query}, None)
+    return resp["statusCode"], json.loads(resp["body"])
+
+
+def _fresh_storage() -> MemoryStorage:
+    """테스트마다 빈 클릭 로그로 시작 (trend 모듈만 쓰는 참조를 교체)"""
+    app._STORAGE = MemoryStorage()
+    return app._STORAGE
+
+
+def test_series_includes_click_at_now():
+    """방금(현재 초) 기록된 클릭도 시계열 마지막 버킷에 포함"""
+    store = _fresh_storage()
+    store.put_click({"shortCode": "a", "timestamp": datetime.now(timezone.utc).isoformat(), "category": "IT"})
+
+    status, body = _get({"minutes": "60", "bucket": "10"})
+    assert status == 200
+    assert body["count"] == 1
+    assert body["series"][-1]["counts"] == {"IT": 1}
+
+
+
+def test_scheduled_event_precomputes_standard_windows():
+    """스케줄 핸들러는 표준 윈도우를 미리 계산해 저장, 이후 요청은 저장된 리포트로 응답"""
+    store = _fresh_storage()
+    app._LOCAL_LATEST.clear()
+    now = datetime.now(timezone.utc)
+    store.put_clicks([
+        {"shortCode": "p1", "timestamp": (now - timedelta(minutes=10)).isoformat(), "category": "IT"},
+        {"shortCode": "p2", "timestamp": (now - timedelta(minutes=120)).isoformat(), "category": "Food"},
+    ])
+
+    result = app.precompute_handler({"source": "aws.events", "detail-type": "Scheduled Event"}, None)
+    assert result == {"windows": {60: 1, 360: 2, 1440: 2, 10080: 2}}
+
+    status, body = _get({"minutes": "360"})
+    assert status == 200 and body["precomputed"] is True
+    assert body["stats"] == {"IT": 1, "Food": 1} and "generatedAt" in body
+
+
+def test_fresh_or_stale_report_is_recomputed():
+    """fresh=true이거나 저장된 리포트가 오래되면 요청 시점에 새로 계산"""
+    store = _fresh_storage()
+    app._LOCAL_LATEST.clear()
+    app.precompute_handler({}, None)
+    store.put_click({"shortCode": "f1", "timestamp": datetime.now(timezone.utc).isoformat(), "category": "IT"})
+
+    status, body = _get({"minutes": "60"})
+    assert body["precomputed"] is True and body["stats"] == {}
+
+    status, body = _get({"minutes": "60", "fresh": "true"})
+    assert "precomputed" not in body and body["stats"] == {"IT": 1}
+
+    app._LOCAL_LATEST[1440]["generatedAt"] = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    status, body = _get({"minutes": "1440"})
+    assert "precomputed" not in body and body["count"] == 1
+
+
+def test_multi_window_report_from_one_fetch():
+    """?windows=60,1440 은 가장 큰 윈도우를 한 번만 조회해 윈도우별 집계 + AI 분석 1회"""
+    store = _fresh_storage()
+    now = datetime.now(timezone.utc)
+    store.put_clicks([
+        {"shortCode": "w1", "timestamp": (now - timedelta(minutes=10)).isoformat(), "category": "IT"},
+        {"shortCode": "w2", "timestamp": (now - timedelta(minutes=30)).isoformat(), "category": "IT"},
+        {"shortCode": "w3", "timestamp": (now - timedelta(minutes=300)).isoformat(), "category": "Food"},
+        {"shortCode": "w4", "timestamp": (now - timedelta(days=2)).isoformat(), "category": "Food"},
+    ])
+    fetches, prompts = [], []
+    real_iter = store.iter_click_pages
+    store.iter_click_pages = lambda since, mode="query": fetches.append(since) or real_iter(since, mode)
+    real_model = app._invoke_trend_model
+    app._invoke_trend_model = lambda prompt: prompts.append(prompt) or real_model(prompt)
+    try:
+        status, body = _get({"windows": "1440,60,60"})
+    finally:
+        app._invoke_trend_model = real_model
+
+    assert status == 200
+    assert body["windows"] == {
+        "60": {"stats": {"IT": 2}, "count": 2},
+        "1440": {"stats": {"IT": 2, "Food": 1}, "count": 3},
+    }
+    assert body["count"] == 3
+    assert len(fetches) == 1 and len(prompts) == 1
+    assert body["ai_analysis"].startswith("[분야]")
+
+
+class _Page(list):
+    """약한 참조로 생존 여부를 추적할 수 있는 페이지"""
+
+
+class _PagedStorage(MemoryStorage):
+    """클릭 로그를 페이지 단위로 하나씩 만들어 돌려주고, 새 페이지를 줄 때 살아 있는 이전 페이지 수를 기록"""
+
+    def __init__(self, pages: list):
+        super().__init__()
+        self._pages = pages
+        self.live_before_yield = []
+
+    def iter_click_pages(self, since, mode="query"):
+        refs = []
+        for rows in self._pages:
+            self.live_before_yield.append(sum(1 for ref in refs if ref() is not None))
+            page = _Page(rows)
+            refs.append(weakref.ref(page))
+            yield page
+            del page
+
+
+def test_stats_stream_pages_without_holding_them():
+    """집계는 페이지를 하나씩 소비 (이전 페이지는 다음 페이지를 받기 전에 버려짐), 윈도우 밖 로그 제외"""
+    now = datetime.now(timezone.utc)
+    recent = (now - timedelta(minutes=5)).isoformat()
+    old = (now - timedelta(minutes=90)).isoformat()
+    pages = [[{"timestamp": recent, "category": "IT"}] * 3 for _ in range(4)]
+    pages.append([{"timestamp": recent, "category": "Food"}, {"timestamp": old, "category": "Food"}])
+    store = _PagedStorage(pages)
+    app._STORAGE = store
+
+    stats, count = app._collect_stats(60)
+    assert stats == {"IT": 12, "Food": 1} and count == 13
+    # 새 페이지를 받을 때 살아 있는 이전 페이지는 반복 변수가 아직 가리키는 직전 페이지 1개뿐
+    assert max(store.live_before_yield) <= 1
+
+
+class _RecordingTable:
+    name = "logs"
+
+    def __init__(self):
+        self.params = []
+
+    def query(self, **params):
+        self.params.append(params)
+        return {"Items": []}
+
+    def scan(self, **params):
+        self.params.append(params)
+        return {"Items": []}
+
+
+class _RecordingDynamo:
+    def __init__(self):
+        self.table = _RecordingTable()
+
+    def Table(self, name):  # noqa: N802
+        return self.table
+
+
+def test_click_pages_request_only_needed_attributes():
+    """DynamoDB 조회는 timestamp / category 속성만 요청 (query / scan 모두)"""
+    dynamo = _RecordingDynamo()
+    store = DynamoStorage(dynamo, "m", "c", "u", "logs", "r")
+    since = datetime.now(timezone.utc) - timedelta(minutes=30)
+    for mode in ("query", "scan"):
+        list(store.iter_click_pages(since, mode))
+    assert dynamo.table.params
+    for params in dynamo.table.params:
+        names = params["ExpressionAttributeNames"]
+        assert sorted(names[n.strip()] for n in params["ProjectionExpression"].split(",")) == ["category", "timestamp"]
+
+
+if __name__ == "__main__":
+    test_series_includes_click_at_now()
+    test_scheduled_event_precomputes_standard_windows()
+    test_fresh_or_stale_report_is_recomputed()
+    test_multi_window_report_from_one_fetch()
+    test_stats_stream_pages_without_holding_them()
+    test_click_pages_request_only_needed_attributes()
+    print("All tests passed.")
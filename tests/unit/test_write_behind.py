@@ -0,0 +1,105 @@
+"""
+로컬 유닛 테스트 - write-behind 버퍼 및 batch_put 재시도 검증
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+from common.write_behind import WriteBehindBuffer, batch_put
+
+
+class FakeDynamo:
+    """첫 호출에서 마지막 요청 1건을 UnprocessedItems로 돌려주는 가짜 리소스"""
+    def __init__(self, unprocessed_first=True):
+        self.calls = []
+        self.saved = []
+        self.unprocessed_first = unprocessed_first
+
+    def batch_write_item(self, RequestItems):
+        (table, requests), = RequestItems.items()
+        self.calls.append(len(requests))
+        if self.unprocessed_first and len(self.calls) == 1:
+            self.saved.extend(r["PutRequest"]["Item"] for r in requests[:-1])
+            return {"UnprocessedItems": {table: requests[-1:]}}
+        self.saved.extend(r["PutRequest"]["Item"] for r in requests)
+        return {"UnprocessedItems": {}}
+
+
+def test_batch_put_chunks_and_retries():
+    """25건 단위 분할 및 UnprocessedItems 재시도 검증"""
+    dynamo = FakeDynamo()
+    items = [{"shortCode": "a", "timestamp": str(i)} for i in range(30)]
+    failed = batch_put(dynamo, "logs", items, base_delay=0)
+    assert failed == []
+    assert dynamo.calls == [25, 1, 5]
+    assert len(dynamo.saved) == 30
+
+
+def test_batch_put_dedupes_keys():
+    """같은 키의 중복 항목은 마지막 값만 저장되는지 검증"""
+    dynamo = FakeDynamo(unprocessed_first=False)
+    items = [
+        {"shortCode": "a", "timestamp": "t", "ip": "1"},
+        {"shortCode": "a", "timestamp": "t", "ip": "2"},
+    ]
+    batch_put(dynamo, "logs", items, key_fields=("shortCode", "timestamp"))
+    assert dynamo.saved == [{"shortCode": "a", "timestamp": "t", "ip": "2"}]
+
+
+def test_buffer_flushes_on_size():
+    """max_items 도달 시 flush 되는지 검증"""
+    flushed = []
+    buf = WriteBehindBuffer(lambda items: flushed.extend(items), max_items=3, max_age=60)
+    buf.add(1)
+    buf.add(2)
+    assert flushed == []
+    buf.add(3)
+    assert flushed == [1, 2, 3]
+    assert len(buf) == 0
+
+
+def test_buffer_flushes_on_age():
+    """max_age 경과 후 다음 적재 시 flush 되는지 검증"""
+    now = [0.0]
+    flushed = []
+    buf = WriteBehindBuffer(lambda items: flushed.extend(items), max_items=100,
+                            max_age=1.0, clock=lambda: now[0])
+    buf.add(1)
+    now[0] = 1.5
+    buf.add(2)
+    assert flushed == [1, 2]
+
+
+def test_flush_if_due_only_when_due():
+    """백그라운드 스레드 모드에서도 flush_if_due는 기한이 된 경우에만 호출 스레드에서 바로 저장"""
+    now = [0.0]
+    flushed = []
+    buf = WriteBehindBuffer(lambda items: flushed.extend(items), max_items=3,
+                            max_age=1.0, interval=60, clock=lambda: now[0])
+    buf.add(1)
+    assert buf.flush_if_due() == 0 and flushed == []
+    now[0] = 1.5
+    assert buf.flush_if_due() == 1 and flushed == [1]
+    for i in range(3):
+        buf.add(i)
+    assert buf.flush_if_due() == 3
+
+
+def test_buffer_requeues_failed_items():
+    """저장 실패 항목이 버퍼에 다시 적재되는지 검증"""
+    buf = WriteBehindBuffer(lambda items: items[:1], max_items=100, max_age=60)
+    buf.add("x")
+    buf.add("y")
+    assert buf.flush() == 1
+    assert len(buf) == 1
+
+
+if __name__ == "__main__":
+    test_batch_put_chunks_and_retries()
+    test_batch_put_dedupes_keys()
+    test_buffer_flushes_on_size()
+    test_buffer_flushes_on_age()
+    test_flush_if_due_only_when_due()
+    test_buffer_requeues_failed_items()
+    print("All tests passed.")